@@ -14,6 +14,13 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 
 from app.core.config import settings
 from app.db.base import Base
+from app.models.active_disruption import ActiveDisruptionModel
+from app.models.assessment import RiskAssessmentModel
+from app.models.assessment_shipment import AssessmentShipmentModel
+from app.models.extraction_cache import ExtractionCacheEntryModel
+from app.models.job import AssessmentJobModel
+from app.models.port import PortModel
+from app.models.port_risk_rollup import PortRiskRollupModel
 from app.models.shipment import ShipmentModel
 
 config = context.config
@@ -0,0 +1,97 @@
+"""Move affected shipment ids into the assessment_shipments association table
+
+Databases so far were built by Base.metadata.create_all at startup, which
+never alters existing tables. This revision brings such a database up to
+the current models: it adds the columns and indexes that create_all would
+have skipped, creates assessment_shipments, backfills it from the JSON
+id lists and drops risk_assessments.affected_shipment_ids.
+
+Revision ID: 3f2a1c9d7b10
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a1c9d7b10'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns(inspector: sa.Inspector, table: str) -> set:
+    return {c["name"] for c in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    if "shipments" in tables:
+        indexes = {i["name"] for i in inspector.get_indexes("shipments")}
+        if "ix_shipments_destination_port_id" not in indexes:
+            op.create_index("ix_shipments_destination_port_id", "shipments", ["destination_port", "id"])
+        # Superseded by the composite index above
+        if "ix_shipments_destination_port" in indexes:
+            op.drop_index("ix_shipments_destination_port", table_name="shipments")
+
+    if "risk_assessments" in tables and "duplicate_similarity" not in _columns(inspector, "risk_assessments"):
+        op.add_column("risk_assessments", sa.Column("duplicate_similarity", sa.Float(), nullable=True))
+
+    if "assessment_shipments" not in tables:
+        op.create_table(
+            "assessment_shipments",
+            sa.Column("assessment_id", sa.Uuid(), nullable=False),
+            sa.Column("shipment_id", sa.TEXT(), nullable=False),
+            sa.ForeignKeyConstraint(["assessment_id"], ["risk_assessments.assessment_id"], ondelete="CASCADE"),
+            sa.ForeignKeyConstraint(["shipment_id"], ["shipments.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("assessment_id", "shipment_id"),
+        )
+        op.create_index(
+            "ix_assessment_shipments_shipment_id", "assessment_shipments", ["shipment_id", "assessment_id"]
+        )
+
+    if "risk_assessments" not in tables or "affected_shipment_ids" not in _columns(inspector, "risk_assessments"):
+        return
+
+    # Unnest the JSON lists on the database side; ids of shipments that no longer exist are dropped
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            "INSERT INTO assessment_shipments (assessment_id, shipment_id) "
+            "SELECT r.assessment_id, j.shipment_id FROM risk_assessments r "
+            "CROSS JOIN LATERAL json_array_elements_text(r.affected_shipment_ids::json) AS j(shipment_id) "
+            "JOIN shipments s ON s.id = j.shipment_id "
+            "ON CONFLICT DO NOTHING"
+        )
+    else:
+        op.execute(
+            "INSERT OR IGNORE INTO assessment_shipments (assessment_id, shipment_id) "
+            "SELECT r.assessment_id, j.value FROM risk_assessments r, json_each(r.affected_shipment_ids) j "
+            "JOIN shipments s ON s.id = j.value"
+        )
+
+    with op.batch_alter_table("risk_assessments") as batch_op:
+        batch_op.drop_column("affected_shipment_ids")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("risk_assessments") as batch_op:
+        batch_op.add_column(sa.Column("affected_shipment_ids", sa.JSON(), nullable=True))
+
+    aggregate = "json_agg(l.shipment_id)" if op.get_bind().dialect.name == "postgresql" else "json_group_array(l.shipment_id)"
+    op.execute(
+        f"UPDATE risk_assessments SET affected_shipment_ids = COALESCE(("
+        f"SELECT {aggregate} FROM assessment_shipments l "
+        f"WHERE l.assessment_id = risk_assessments.assessment_id), '[]')"
+    )
+
+    op.drop_index("ix_assessment_shipments_shipment_id", table_name="assessment_shipments")
+    op.drop_table("assessment_shipments")
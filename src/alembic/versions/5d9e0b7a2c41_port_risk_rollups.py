@@ -0,0 +1,99 @@
+"""Hourly per-port risk rollups and a created_at index on risk_assessments
+
+Creates port_risk_rollups and fills it from the existing assessments, unless
+it already holds rows. Buckets are keyed by canonical port, as the app writes them. Startup's create_all may have created the table empty
+before this revision ran, so the check is for rows, not for the table.
+
+Revision ID: 5d9e0b7a2c41
+Revises: 8c41d2e5a6f3
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d9e0b7a2c41'
+down_revision: Union[str, Sequence[str], None] = '8c41d2e5a6f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Untyped columns pass the backfill's bucket values through as the database returned them
+ROLLUPS = sa.table(
+    "port_risk_rollups",
+    sa.column("port"),
+    sa.column("bucket_start"),
+    sa.column("assessments"),
+    sa.column("disruptions"),
+    sa.column("shipments_at_risk"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if "ix_risk_assessments_created_at" not in {i["name"] for i in inspector.get_indexes("risk_assessments")}:
+        op.create_index("ix_risk_assessments_created_at", "risk_assessments", ["created_at"])
+
+    if "port_risk_rollups" not in set(inspector.get_table_names()):
+        op.create_table(
+            "port_risk_rollups",
+            sa.Column("port", sa.String(length=255), nullable=False),
+            sa.Column("bucket_start", sa.DateTime(), nullable=False),
+            sa.Column("assessments", sa.Integer(), nullable=False),
+            sa.Column("disruptions", sa.Integer(), nullable=False),
+            sa.Column("shipments_at_risk", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("port", "bucket_start"),
+        )
+
+    if bind.execute(sa.text("SELECT 1 FROM port_risk_rollups LIMIT 1")).first() is not None:
+        return
+
+    # src is on sys.path once env.py has run
+    from app.repositories.port_index import normalize_port_name
+
+    # Aggregate on the database side, one pass over the assessments and their link counts,
+    # then merge the raw port spellings onto canonical keys here
+    if bind.dialect.name == "postgresql":
+        port = "r.detected_event->>'target_port'"
+        disruptive = "(r.detected_event->>'is_disruption')::boolean"
+        bucket = "date_trunc('hour', r.created_at)"
+    else:
+        port = "json_extract(r.detected_event, '$.target_port')"
+        disruptive = "json_extract(r.detected_event, '$.is_disruption') = 1"
+        # SQLAlchemy's SQLite DateTime storage format
+        bucket = "strftime('%Y-%m-%d %H:00:00.000000', r.created_at)"
+    result = bind.execute(sa.text(
+        f"SELECT {port}, {bucket}, COUNT(*), "
+        f"SUM(CASE WHEN {disruptive} THEN 1 ELSE 0 END), "
+        f"SUM(CASE WHEN {disruptive} THEN COALESCE(l.n, 0) ELSE 0 END) "
+        "FROM risk_assessments r "
+        "LEFT JOIN (SELECT assessment_id, COUNT(*) AS n FROM assessment_shipments GROUP BY assessment_id) l "
+        "ON l.assessment_id = r.assessment_id "
+        f"WHERE {port} IS NOT NULL "
+        f"GROUP BY {port}, {bucket}"
+    ))
+    merged = {}
+    for raw_port, bucket_start, *counts in result:
+        key = normalize_port_name(raw_port)
+        if not key:
+            continue
+        totals = merged.setdefault((key, bucket_start), [0, 0, 0])
+        for i, count in enumerate(counts):
+            totals[i] += count or 0
+    if merged:
+        op.bulk_insert(ROLLUPS, [
+            {"port": key, "bucket_start": bucket_start, "assessments": a, "disruptions": d, "shipments_at_risk": s}
+            for (key, bucket_start), (a, d, s) in sorted(merged.items())
+        ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("port_risk_rollups")
+    op.drop_index("ix_risk_assessments_created_at", table_name="risk_assessments")
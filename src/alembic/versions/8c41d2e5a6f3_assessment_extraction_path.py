@@ -0,0 +1,32 @@
+"""Record which extraction layer produced each assessment
+
+Revision ID: 8c41d2e5a6f3
+Revises: 3f2a1c9d7b10
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41d2e5a6f3'
+down_revision: Union[str, Sequence[str], None] = '3f2a1c9d7b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # create_all may already have built the column on a fresh database
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("risk_assessments")}
+    if "extraction_path" not in columns:
+        op.add_column("risk_assessments", sa.Column("extraction_path", sa.String(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("risk_assessments") as batch_op:
+        batch_op.drop_column("extraction_path")
@@ -0,0 +1,48 @@
+"""Active disruptions that new and updated shipments are matched against
+
+Assessments written before this revision do not open disruptions; only new
+disruptive assessments are tracked.
+
+Revision ID: a7e3c5f19b62
+Revises: 5d9e0b7a2c41
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7e3c5f19b62'
+down_revision: Union[str, Sequence[str], None] = '5d9e0b7a2c41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if "active_disruptions" in set(inspector.get_table_names()):
+        return
+
+    op.create_table(
+        "active_disruptions",
+        sa.Column("assessment_id", sa.Uuid(), nullable=False),
+        sa.Column("port", sa.String(length=255), nullable=False),
+        sa.Column("port_key", sa.String(length=255), nullable=False),
+        sa.Column("opened_at", sa.DateTime(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["assessment_id"], ["risk_assessments.assessment_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("assessment_id"),
+    )
+    op.create_index("ix_active_disruptions_port_key", "active_disruptions", ["port_key"])
+    op.create_index("ix_active_disruptions_expires_at", "active_disruptions", ["expires_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_active_disruptions_expires_at", table_name="active_disruptions")
+    op.drop_index("ix_active_disruptions_port_key", table_name="active_disruptions")
+    op.drop_table("active_disruptions")
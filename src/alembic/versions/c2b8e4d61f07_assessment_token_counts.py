@@ -0,0 +1,34 @@
+"""Record estimated snippet tokens before and after condensation on each assessment
+
+Revision ID: c2b8e4d61f07
+Revises: a7e3c5f19b62
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2b8e4d61f07'
+down_revision: Union[str, Sequence[str], None] = 'a7e3c5f19b62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # create_all may already have built the columns on a fresh database
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("risk_assessments")}
+    for name in ("source_tokens", "condensed_tokens"):
+        if name not in columns:
+            op.add_column("risk_assessments", sa.Column(name, sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("risk_assessments") as batch_op:
+        batch_op.drop_column("condensed_tokens")
+        batch_op.drop_column("source_tokens")
@@ -0,0 +1,44 @@
+"""Add the port reference catalogue and an impact radius on open disruptions
+
+Revision ID: e5a1d3c07b28
+Revises: c2b8e4d61f07
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a1d3c07b28'
+down_revision: Union[str, Sequence[str], None] = 'c2b8e4d61f07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # create_all may already have built these on a fresh database; the app seeds an empty catalogue at startup
+    inspector = sa.inspect(op.get_bind())
+    if "ports" not in set(inspector.get_table_names()):
+        op.create_table(
+            "ports",
+            sa.Column("name", sa.String(length=255), nullable=False),
+            sa.Column("latitude", sa.Float(), nullable=False),
+            sa.Column("longitude", sa.Float(), nullable=False),
+            sa.PrimaryKeyConstraint("name"),
+        )
+    if "radius_km" not in {c["name"] for c in inspector.get_columns("active_disruptions")}:
+        op.add_column(
+            "active_disruptions",
+            sa.Column("radius_km", sa.Float(), nullable=False, server_default=sa.text("0")),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("active_disruptions") as batch_op:
+        batch_op.drop_column("radius_km")
+    op.drop_table("ports")
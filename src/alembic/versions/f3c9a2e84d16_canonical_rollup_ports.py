@@ -0,0 +1,69 @@
+"""Re-key port risk rollups on the canonical port key
+
+Rollups used to be keyed on the port string as extracted, so "Port of
+Rotterdam", "ROTTERDAM" and "Rotterdam" were separate series. Rows are
+merged onto normalize_port_name keys; already canonical rows are untouched.
+
+Revision ID: f3c9a2e84d16
+Revises: e5a1d3c07b28
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c9a2e84d16'
+down_revision: Union[str, Sequence[str], None] = 'e5a1d3c07b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COUNTERS = ("assessments", "disruptions", "shipments_at_risk")
+ROLLUPS = sa.table(
+    "port_risk_rollups",
+    sa.column("port"),
+    sa.column("bucket_start"),
+    *(sa.column(c) for c in _COUNTERS),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # src is on sys.path once env.py has run
+    from app.repositories.port_index import normalize_port_name
+
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(ROLLUPS)).all()
+    stale = [row for row in rows if normalize_port_name(row.port) != row.port]
+    if not stale:
+        return
+
+    # Each stale row folds into its canonical bucket, which may already exist
+    merged = {}
+    for row in rows:
+        key = normalize_port_name(row.port)
+        if row.port == key or not key:
+            continue
+        totals = merged.setdefault((key, row.bucket_start), [0, 0, 0])
+        for i, column in enumerate(_COUNTERS):
+            totals[i] += getattr(row, column)
+    for row in stale:
+        op.execute(ROLLUPS.delete().where(ROLLUPS.c.port == row.port, ROLLUPS.c.bucket_start == row.bucket_start))
+    for (key, bucket_start), totals in sorted(merged.items()):
+        increments = dict(zip(_COUNTERS, totals))
+        updated = bind.execute(
+            ROLLUPS.update()
+            .where(ROLLUPS.c.port == key, ROLLUPS.c.bucket_start == bucket_start)
+            .values({c: ROLLUPS.c[c] + increments[c] for c in _COUNTERS})
+        )
+        if not updated.rowcount:
+            op.execute(ROLLUPS.insert().values(port=key, bucket_start=bucket_start, **increments))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The raw spellings are not recoverable; canonical keys remain valid rollup ports
+    pass
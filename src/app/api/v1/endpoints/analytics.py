@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, Dict, List, Literal, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.core.config import settings
+from app.deps import get_rollup_repo
+from app.repositories.rollup_repo import RiskRollupRepository, RollupIncrement, hour_bucket
+from app.schemas.analytics import PortRiskBucket, PortRiskTotal
+
+router = APIRouter()
+
+def _time_range(start: Optional[datetime], end: Optional[datetime]) -> Tuple[datetime, datetime]:
+    """Hour-aligned [start, end) in UTC; defaults to the last ANALYTICS_DEFAULT_RANGE_HOURS."""
+    end = hour_bucket(end) if end is not None else hour_bucket(datetime.now(timezone.utc)) + timedelta(hours=1)
+    start = hour_bucket(start) if start is not None else end - timedelta(hours=settings.ANALYTICS_DEFAULT_RANGE_HOURS)
+    if start >= end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end")
+    if end - start > timedelta(days=settings.ANALYTICS_MAX_RANGE_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range exceeds {settings.ANALYTICS_MAX_RANGE_DAYS} days"
+        )
+    return start, end
+
+@router.get("/disruptions", response_model=List[PortRiskBucket])
+async def disruptions_over_time(
+    rollups: Annotated[RiskRollupRepository, Depends(get_rollup_repo)],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    port: Optional[str] = None,
+    bucket: Literal["hour", "day"] = "hour",
+):
+    """Assessments, disruptions and shipments at risk per port per hour or day, read from the rollups."""
+    buckets = await rollups.get_buckets(*_time_range(start, end), port=port)
+    if bucket == "day":
+        days: Dict[Tuple[datetime, str], List[int]] = {}
+        for b in buckets:
+            totals = days.setdefault((b.bucket_start.replace(hour=0), b.port), [0, 0, 0])
+            totals[0] += b.assessments
+            totals[1] += b.disruptions
+            totals[2] += b.shipments_at_risk
+        buckets = [RollupIncrement(port, day, *totals) for (day, port), totals in days.items()]
+    return buckets
+
+@router.get("/shipments-at-risk", response_model=List[PortRiskTotal])
+async def shipments_at_risk_by_port(
+    rollups: Annotated[RiskRollupRepository, Depends(get_rollup_repo)],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 50,
+):
+    """Ports ranked by shipments at risk over the range."""
+    return await rollups.get_port_totals(*_time_range(start, end), limit=limit)
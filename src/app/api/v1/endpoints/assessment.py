@@ -1,21 +1,164 @@
+import asyncio
 import logging
-from typing import Annotated
-from fastapi import APIRouter, Depends, status, HTTPException
-from app.schemas.assessment import RiskAssessmentRequest, RiskAssessmentResponse
+import math
+from typing import Annotated, Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query, Request, status, HTTPException
+from pydantic import ValidationError
+from pydantic_core import to_json
+from app.api.v1.serialization import assessment_payload, batch_result_payload, json_response, shipment_page_payload
+from app.api.v1.streaming import DuplexStreamingResponse, LineTooLongError, iter_ndjson_lines
+from app.core.config import settings
+from app.core.metrics import record_error
+from app.models.assessment import RiskAssessmentModel
+from app.repositories.pagination import InvalidCursorError, decode_cursor
+from app.schemas.assessment import (
+    BatchAssessmentRequest,
+    BatchAssessmentResponse,
+    RiskAssessmentRequest,
+    RiskAssessmentResponse,
+)
+from app.schemas.shipment import ShipmentPage
+from app.services.extraction_service import ExtractionError, ExtractionTimeout, ExtractionUnavailable
 from app.services.risk_service import RiskAssessmentService
 from app.deps import get_risk_service
 
 router = APIRouter()
 
+def _result_for(index: int, outcome: Union[RiskAssessmentModel, Exception]) -> Dict[str, Any]:
+    """A BatchAssessmentResult payload for one outcome."""
+    if isinstance(outcome, Exception):
+        record_error(outcome)
+    if isinstance(outcome, (ValueError, ExtractionError)):
+        return batch_result_payload(index, error=str(outcome))
+    if isinstance(outcome, Exception):
+        logging.error(f"Assessment failed: {outcome}")
+        return batch_result_payload(index, error="Internal Server Error")
+    return batch_result_payload(index, assessment=outcome)
+
 @router.post("/", response_model=RiskAssessmentResponse, status_code=status.HTTP_201_CREATED)
 async def analyze_risk(
     request: RiskAssessmentRequest,
     service: Annotated[RiskAssessmentService, Depends(get_risk_service)]
 ):
     try:
-        return await service.create_assessment(request.news_text)
+        assessment = await service.create_assessment(request.news_text)
     except ValueError as e:
+        record_error(e)
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except ExtractionUnavailable as e:
+        record_error(e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        )
+    except ExtractionTimeout as e:
+        record_error(e)
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e))
     except Exception as e:
+        record_error(e)
         logging.error(f"Assessment failed: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
+    return json_response(assessment_payload(assessment), status_code=status.HTTP_201_CREATED)
+
+@router.post("/batch", response_model=BatchAssessmentResponse, status_code=status.HTTP_200_OK)
+async def analyze_risk_batch(
+    request: BatchAssessmentRequest,
+    service: Annotated[RiskAssessmentService, Depends(get_risk_service)]
+):
+    if len(request.news_texts) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch exceeds {settings.BATCH_MAX_ITEMS} items"
+        )
+
+    # Validate each snippet on its own so one bad item doesn't reject the batch
+    results: List[Optional[Dict[str, Any]]] = [None] * len(request.news_texts)
+    valid: List[int] = []
+    for index, text in enumerate(request.news_texts):
+        try:
+            RiskAssessmentRequest(news_text=text)
+            valid.append(index)
+        except ValidationError as e:
+            results[index] = batch_result_payload(index, error=e.errors()[0]["msg"])
+
+    try:
+        outcomes = await service.create_assessments_batch([request.news_texts[i] for i in valid])
+    except Exception as e:
+        record_error(e)
+        logging.error(f"Batch assessment failed: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
+
+    for index, outcome in zip(valid, outcomes):
+        results[index] = _result_for(index, outcome)
+
+    return json_response({"results": [r for r in results if r is not None]})
+
+@router.post("/stream", response_class=DuplexStreamingResponse)
+async def analyze_risk_stream(
+    request: Request,
+    service: Annotated[RiskAssessmentService, Depends(get_risk_service)]
+):
+    """Consume NDJSON RiskAssessmentRequest records and stream one NDJSON result per record."""
+    # The bounded queue is the back-pressure point: once it is full the reader
+    # stops pulling the request body until the service catches up.
+    queue: asyncio.Queue[Optional[Tuple[int, Union[bytes, LineTooLongError]]]] = asyncio.Queue(
+        maxsize=settings.STREAM_QUEUE_SIZE
+    )
+
+    async def read_records() -> None:
+        index = 0
+        try:
+            async for line in iter_ndjson_lines(request.stream(), settings.STREAM_MAX_LINE_BYTES):
+                await queue.put((index, line))
+                index += 1
+        finally:
+            # Always wake the writer, even if the client went away mid-body
+            await queue.put(None)
+
+    async def process(index: int, line: Union[bytes, LineTooLongError]) -> Dict[str, Any]:
+        if isinstance(line, LineTooLongError):
+            return batch_result_payload(index, error=str(line))
+        try:
+            record = RiskAssessmentRequest.model_validate_json(line)
+        except ValidationError as e:
+            return batch_result_payload(index, error=e.errors()[0]["msg"])
+        # Records share one DB session, so they are processed one at a time in arrival order
+        try:
+            return _result_for(index, await service.create_assessment(record.news_text))
+        except Exception as e:
+            # Reset the shared session so one failed commit doesn't poison later records
+            await service.db.rollback()
+            return _result_for(index, e)
+
+    # Start reading before the response is returned so the body has a single consumer
+    reader = asyncio.create_task(read_records())
+
+    async def results() -> AsyncIterator[bytes]:
+        try:
+            while (item := await queue.get()) is not None:
+                yield to_json(await process(*item)) + b"\n"
+            await reader
+        finally:
+            reader.cancel()
+
+    return DuplexStreamingResponse(results(), media_type="application/x-ndjson")
+
+@router.get("/{assessment_id}/shipments", response_model=ShipmentPage)
+async def list_affected_shipments(
+    assessment_id: UUID,
+    service: Annotated[RiskAssessmentService, Depends(get_risk_service)],
+    cursor: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=settings.AFFECTED_SHIPMENTS_MAX_PAGE_SIZE)] = settings.AFFECTED_SHIPMENTS_PAGE_SIZE
+):
+    """Page through the shipments an assessment affected, following ``next_cursor``."""
+    try:
+        after = decode_cursor(cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    page = await service.get_affected_shipments(assessment_id, limit, after)
+    if page is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assessment not found")
+    return json_response(shipment_page_payload(*page))
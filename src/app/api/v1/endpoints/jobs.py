@@ -0,0 +1,41 @@
+from typing import Annotated
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.api.v1.serialization import assessment_payload, json_response
+from app.core.config import settings
+from app.schemas.assessment import RiskAssessmentRequest
+from app.schemas.job import AssessmentJobResponse
+from app.repositories.job_repo import AssessmentJobRepository
+from app.services.risk_service import RiskAssessmentService
+from app.deps import get_job_repo, get_risk_service
+
+router = APIRouter()
+
+@router.post("/", response_model=AssessmentJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_assessment_job(
+    request: RiskAssessmentRequest,
+    jobs: Annotated[AssessmentJobRepository, Depends(get_job_repo)]
+):
+    """Queue a snippet for assessment and return immediately with its job id."""
+    return await jobs.enqueue(request.news_text)
+
+@router.get("/{job_id}", response_model=AssessmentJobResponse)
+async def get_assessment_job(
+    job_id: UUID,
+    jobs: Annotated[AssessmentJobRepository, Depends(get_job_repo)],
+    service: Annotated[RiskAssessmentService, Depends(get_risk_service)],
+    wait: Annotated[float, Query(ge=0, description="Seconds to long-poll for completion.")] = 0
+):
+    if wait > 0:
+        job = await jobs.wait_for(job_id, min(wait, settings.JOB_LONG_POLL_MAX_SECONDS), settings.JOB_POLL_INTERVAL_SECONDS)
+    else:
+        job = await jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+
+    payload = AssessmentJobResponse.model_validate(job).model_dump(mode="json")
+    if job.assessment_id is not None:
+        assessment = await service.get_assessment(job.assessment_id)
+        if assessment is not None:
+            payload["assessment"] = assessment_payload(assessment)
+    return json_response(payload)
@@ -0,0 +1,58 @@
+import csv
+import io
+import logging
+import tempfile
+from typing import Annotated, List, Literal, Optional
+import yaml
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from app.core.config import settings
+from app.repositories.assessment_repo import AssessmentRepository
+from app.repositories.shipment_repo import ShipmentRepository
+from app.schemas.assessment import AssessmentSummary
+from app.schemas.shipment import ShipmentImportReport
+from app.services.shipment_import import ShipmentImporter, ShipmentImportError, detect_format
+from app.deps import get_assessment_repo, get_shipment_importer, get_shipment_repo
+
+router = APIRouter()
+
+# Bodies are spooled to disk past this size, so memory stays flat for large manifests
+_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+@router.post("/import", response_model=ShipmentImportReport)
+async def import_shipments(
+    request: Request,
+    importer: Annotated[ShipmentImporter, Depends(get_shipment_importer)],
+    format: Annotated[Optional[Literal["csv", "ndjson", "yaml"]], Query(description="Defaults to the Content-Type")] = None
+):
+    try:
+        fmt = format or detect_format(request.headers.get("content-type", "").split(";")[0].strip())
+    except ShipmentImportError as e:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e))
+
+    with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_BYTES, mode="w+b") as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        stream = io.TextIOWrapper(spool, encoding="utf-8", newline="")  # type: ignore[arg-type]
+        try:
+            return await importer.import_stream(stream, fmt)
+        except (ValueError, csv.Error, yaml.YAMLError) as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Malformed {fmt} input: {e}")
+        except Exception as e:
+            logging.error(f"Shipment import failed: {e}")
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
+        finally:
+            # Leave closing the spool to its context manager
+            stream.detach()
+
+@router.get("/{shipment_id}/assessments", response_model=List[AssessmentSummary])
+async def list_shipment_assessments(
+    shipment_id: str,
+    shipments: Annotated[ShipmentRepository, Depends(get_shipment_repo)],
+    assessments: Annotated[AssessmentRepository, Depends(get_assessment_repo)],
+    limit: Annotated[int, Query(ge=1, le=settings.AFFECTED_SHIPMENTS_MAX_PAGE_SIZE)] = settings.AFFECTED_SHIPMENTS_PAGE_SIZE
+):
+    """Most recent assessments that affected the shipment."""
+    if not await shipments.get_by_ids([shipment_id]):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Shipment not found")
+    return await assessments.get_by_shipment(shipment_id, limit)
@@ -0,0 +1,57 @@
+"""Direct JSON encoding for assessment responses.
+
+Validating ``RiskAssessmentResponse`` from attributes walks every shipment
+field by field and re-validates the stored event and strategy. Everything
+here comes from our own database rows, so these helpers build the response
+payload directly in the schema's field order and encode it in one
+``pydantic_core.to_json`` call. The returned bytes skip FastAPI's
+``jsonable_encoder`` as well. The schemas remain the documented contract,
+and tests check that the output matches them.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import Response
+from pydantic_core import to_json
+
+from app.models.assessment import RiskAssessmentModel
+from app.repositories.shipment_repo import ShipmentRow
+
+class JSONBytesResponse(Response):
+    media_type = "application/json"
+
+def shipments_payload(shipments: Sequence[ShipmentRow]) -> List[Dict[str, str]]:
+    return [
+        {"id": s.id, "destination_port": s.destination_port, "goods_description": s.goods_description}
+        for s in shipments
+    ]
+
+def assessment_payload(assessment: RiskAssessmentModel) -> Dict[str, Any]:
+    return {
+        "assessment_id": assessment.assessment_id,
+        "created_at": assessment.created_at,
+        "detected_event": assessment.detected_event,
+        "affected_shipments": shipments_payload(assessment.affected_shipments),
+        "affected_shipment_count": assessment.affected_shipment_count,
+        "next_cursor": assessment.next_cursor,
+        "mitigation_strategy": assessment.mitigation_strategy,
+        "extraction_path": assessment.extraction_path,
+        "duplicate_similarity": assessment.duplicate_similarity,
+        "source_tokens": assessment.source_tokens,
+        "condensed_tokens": assessment.condensed_tokens,
+    }
+
+def shipment_page_payload(shipments: Sequence[ShipmentRow], next_cursor: Optional[str]) -> Dict[str, Any]:
+    return {"items": shipments_payload(shipments), "next_cursor": next_cursor}
+
+def batch_result_payload(
+    index: int, assessment: Optional[RiskAssessmentModel] = None, error: Optional[str] = None
+) -> Dict[str, Any]:
+    return {
+        "index": index,
+        "status": "error" if assessment is None else "ok",
+        "assessment": None if assessment is None else assessment_payload(assessment),
+        "error": error,
+    }
+
+def json_response(payload: Any, status_code: int = 200) -> JSONBytesResponse:
+    return JSONBytesResponse(to_json(payload), status_code=status_code)
@@ -0,0 +1,49 @@
+from typing import AsyncIterator, Union
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+class LineTooLongError(ValueError):
+    pass
+
+class DuplexStreamingResponse(StreamingResponse):
+    """StreamingResponse for endpoints that keep reading the request body while responding.
+
+    Below ASGI 2.4 Starlette runs a disconnect listener that calls ``receive()``
+    alongside the body iterator and discards ``http.request`` messages, starving
+    any concurrent body reader. Here the body reader is the only consumer of
+    ``receive()``; it sees ``http.disconnect`` itself and ends the stream.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+async def iter_ndjson_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[Union[bytes, LineTooLongError]]:
+    """Split a byte stream into non-blank lines without buffering the whole body.
+
+    A line longer than ``max_line_bytes`` is dropped and reported in its place,
+    so a single oversized record cannot exhaust memory or end the stream.
+    """
+    buffer = bytearray()
+    discarding = False
+    async for chunk in chunks:
+        buffer.extend(chunk)
+        while (newline := buffer.find(b"\n")) != -1:
+            line = bytes(buffer[:newline])
+            del buffer[: newline + 1]
+            if discarding:
+                discarding = False
+                continue
+            if len(line) > max_line_bytes:
+                yield LineTooLongError(f"Line exceeds {max_line_bytes} bytes")
+            elif line.strip():
+                yield line
+        if len(buffer) > max_line_bytes and not discarding:
+            buffer.clear()
+            discarding = True
+            yield LineTooLongError(f"Line exceeds {max_line_bytes} bytes")
+        elif discarding:
+            buffer.clear()
+    if buffer.strip() and not discarding:
+        yield bytes(buffer)
@@ -0,0 +1,124 @@
+"""Compare the schema response path with the direct-encoding path for large impact sets.
+
+Times both stages of answering with N affected shipments. The first stage
+fetches the rows, as ORM instances or as plain tuples, from an in-memory
+SQLite database. The second encodes the response, either via
+RiskAssessmentResponse.model_validate, FastAPI's jsonable_encoder and
+json.dumps, or via the direct payload and a single to_json call. Results
+are reported in milliseconds per 10k shipments.
+
+Usage:
+    PYTHONPATH=src python -m app.cli.benchmark_serialization [--shipments 10000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from pydantic_core import to_json
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.v1.serialization import assessment_payload
+from app.db.base import Base
+from app.models.assessment import RiskAssessmentModel
+from app.models.shipment import ShipmentModel
+from app.repositories.shipment_repo import ShipmentRow
+from app.schemas.assessment import RiskAssessmentResponse
+
+def make_assessment(shipments: List[Any]) -> RiskAssessmentModel:
+    assessment = RiskAssessmentModel(
+        assessment_id=uuid.uuid4(),
+        created_at=datetime.now(timezone.utc),
+        source_snippet="Dock workers at Rotterdam begin an indefinite strike.",
+        detected_event={"target_port": "Rotterdam", "event_type": "Strike", "is_disruption": True, "confidence_score": 0.9},
+        mitigation_strategy={"recommendation_text": "Reroute", "action_required": True},
+        extraction_path="model",
+    )
+    assessment.affected_shipments = shipments
+    assessment.affected_shipment_count = len(shipments)
+    return assessment
+
+def encode_with_schema(assessment: RiskAssessmentModel) -> bytes:
+    # What FastAPI does for a response_model: validate, dump, jsonable_encoder, json.dumps
+    response = RiskAssessmentResponse.model_validate(assessment)
+    return json.dumps(jsonable_encoder(response.model_dump(mode="json"))).encode()
+
+def encode_direct(assessment: RiskAssessmentModel) -> bytes:
+    return to_json(assessment_payload(assessment))
+
+def best_of(repeat: int, fn: Callable[[], Any]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+async def best_of_async(repeat: int, fn: Callable[[], Any]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+async def run(shipments: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(ShipmentModel.__table__.insert(), [
+            {"id": f"SHP-{i:09d}", "destination_port": "Rotterdam", "goods_description": "Electronics"}
+            for i in range(shipments)
+        ])
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def fetch_models() -> List[ShipmentModel]:
+        async with sessionmaker() as session:
+            return list((await session.execute(select(ShipmentModel).order_by(ShipmentModel.id))).scalars().all())
+
+    async def fetch_rows() -> List[ShipmentRow]:
+        columns = (ShipmentModel.id, ShipmentModel.destination_port, ShipmentModel.goods_description)
+        async with sessionmaker() as session:
+            result = await session.execute(select(*columns).order_by(ShipmentModel.id))
+            return [ShipmentRow._make(row) for row in result.tuples()]
+
+    scale = 1000.0 * 10_000 / shipments
+    models = make_assessment(await fetch_models())
+    rows = make_assessment(await fetch_rows())
+    report = {
+        "schema": {
+            "fetch_ms": await best_of_async(repeat, fetch_models) * scale,
+            "encode_ms": best_of(repeat, lambda: encode_with_schema(models)) * scale,
+        },
+        "direct": {
+            "fetch_ms": await best_of_async(repeat, fetch_rows) * scale,
+            "encode_ms": best_of(repeat, lambda: encode_direct(rows)) * scale,
+        },
+    }
+    await engine.dispose()
+    for path in report.values():
+        path["total_ms"] = path["fetch_ms"] + path["encode_ms"]
+    return report
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shipments", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    report = asyncio.run(run(args.shipments, args.repeat))
+    speedup = report["schema"]["total_ms"] / report["direct"]["total_ms"]
+    print(json.dumps({
+        "per_10k_shipments": {p: {k: round(v, 2) for k, v in stages.items()} for p, stages in report.items()},
+        "speedup": round(speedup, 2),
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
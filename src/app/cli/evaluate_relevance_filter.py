@@ -0,0 +1,65 @@
+"""Measure the relevance pre-filter against stored assessments.
+
+Replays every assessment the model produced through the scorer and reports
+precision, recall and the share of model calls the filter would save.
+
+Usage:
+    PYTHONPATH=src python -m app.cli.evaluate_relevance_filter [--threshold 1.0] [--limit 10000]
+"""
+import argparse
+import asyncio
+import json
+from typing import List, Optional
+
+from sqlalchemy import or_, select
+
+from app.core.config import settings
+from app.db.session import db
+from app.models.assessment import RiskAssessmentModel
+from app.repositories.port_index import port_index
+from app.services.extraction_trace import EXTRACTION_PATH_PREFILTER
+from app.services.relevance_filter import FilterEvaluation, relevance_scorer
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threshold", type=float, default=settings.RELEVANCE_FILTER_THRESHOLD)
+    parser.add_argument("--limit", type=int, help="Most recent assessments to replay")
+    return parser.parse_args(argv)
+
+async def run(args: argparse.Namespace) -> None:
+    # Assessments answered by the filter itself carry no model verdict
+    stmt = (
+        select(RiskAssessmentModel.source_snippet, RiskAssessmentModel.detected_event)
+        .where(or_(
+            RiskAssessmentModel.extraction_path.is_(None),
+            RiskAssessmentModel.extraction_path != EXTRACTION_PATH_PREFILTER,
+        ))
+        .order_by(RiskAssessmentModel.created_at.desc())
+        .limit(args.limit)
+        .execution_options(yield_per=1000)
+    )
+    evaluation = FilterEvaluation(threshold=args.threshold)
+    try:
+        async with db.sessionmaker() as session:
+            # Load every port on record into the gazetteer
+            await port_index.refresh(session)
+            async for text, event in await session.stream(stmt):
+                kept = relevance_scorer.score(text) >= args.threshold
+                evaluation.record(kept, bool(event.get("is_disruption")))
+    finally:
+        await db.dispose()
+
+    print(json.dumps({
+        "threshold": evaluation.threshold,
+        "samples": evaluation.samples,
+        "relevant": evaluation.relevant,
+        "precision": round(evaluation.precision, 4),
+        "recall": round(evaluation.recall, 4),
+        "filter_rate": round(evaluation.filter_rate, 4),
+    }, indent=2))
+
+def main(argv: Optional[List[str]] = None) -> None:
+    asyncio.run(run(parse_args(argv)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Generate a synthetic shipment table and news corpus for load tests.
+
+Shipments are spread over the known ports with a Zipf skew, so a few hub
+ports carry most of the volume as in real traffic. The news corpus mixes
+disruption reports, routine shipping news and unrelated headlines. Both
+files are written in a streaming fashion and scale to millions of rows.
+
+Usage:
+    PYTHONPATH=src python -m app.cli.generate_benchmark_data --shipments 1000000 --news 10000 \\
+        --shipments-out shipments.csv --news-out news.ndjson
+"""
+import argparse
+import csv
+import json
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.fake_extraction_service import KNOWN_PORTS
+from app.services.shipment_import import SHIPMENT_COLUMNS
+
+CHUNK_SIZE = 100_000
+
+GOODS = (
+    "Electronics", "Auto parts", "Furniture", "Apparel", "Frozen seafood", "Pharmaceuticals",
+    "Machinery", "Toys", "Solar panels", "Coffee beans", "Steel coils", "Textiles",
+)
+
+DISRUPTION_TEMPLATES = (
+    "Dock workers at {port} begin an indefinite strike over pay, halting container operations.",
+    "Typhoon warning issued for {port}; terminals suspend vessel berthing until further notice.",
+    "Severe congestion at the Port of {port} leaves more than 40 ships waiting at anchor.",
+    "Authorities order the closure of {port} after a chemical spill in the main channel.",
+    "A fire at a container terminal in {port} disrupts loading for a second day.",
+    "Cyberattack knocks out terminal booking systems at {port}.",
+)
+ROUTINE_TEMPLATES = (
+    "{port} posts record container throughput for the third quarter.",
+    "{port} opens a new automated berth to handle larger vessels.",
+    "Shipping line expands its weekly service calling at {port}.",
+)
+UNRELATED_TEMPLATES = (
+    "Local football club wins the national cup after a penalty shootout.",
+    "Central bank holds interest rates steady amid cooling inflation.",
+    "New smartphone model goes on sale with a larger battery.",
+    "City council approves funding for a new public library.",
+)
+
+def zipf_weights(n: int, skew: float) -> np.ndarray:
+    weights = 1.0 / np.arange(1, n + 1) ** skew
+    return weights / weights.sum()
+
+def generate_shipments(
+    count: int, ports: Sequence[str] = KNOWN_PORTS, skew: float = 1.1, seed: int = 0
+) -> Iterator[Dict[str, str]]:
+    rng = np.random.default_rng(seed)
+    weights = zipf_weights(len(ports), skew)
+    for start in range(0, count, CHUNK_SIZE):
+        size = min(CHUNK_SIZE, count - start)
+        port_choices = rng.choice(len(ports), size=size, p=weights)
+        goods_choices = rng.integers(0, len(GOODS), size=size)
+        for offset in range(size):
+            yield {
+                "id": f"SHP-{start + offset:09d}",
+                "destination_port": ports[port_choices[offset]],
+                "goods_description": GOODS[goods_choices[offset]],
+            }
+
+def generate_news(
+    count: int,
+    ports: Sequence[str] = KNOWN_PORTS,
+    disruption_share: float = 0.3,
+    routine_share: float = 0.3,
+    skew: float = 1.1,
+    seed: int = 0,
+) -> Iterator[str]:
+    rng = np.random.default_rng(seed + 1)
+    weights = zipf_weights(len(ports), skew)
+    for _ in range(count):
+        draw = rng.random()
+        port = ports[rng.choice(len(ports), p=weights)]
+        if draw < disruption_share:
+            templates: Sequence[str] = DISRUPTION_TEMPLATES
+        elif draw < disruption_share + routine_share:
+            templates = ROUTINE_TEMPLATES
+        else:
+            templates = UNRELATED_TEMPLATES
+        yield templates[rng.integers(0, len(templates))].format(port=port)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shipments", type=int, default=100_000)
+    parser.add_argument("--news", type=int, default=1_000)
+    parser.add_argument("--shipments-out", default="benchmark_shipments.csv")
+    parser.add_argument("--news-out", default="benchmark_news.ndjson")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of the port distribution")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    with open(args.shipments_out, "w", newline="", encoding="utf-8") as out:
+        writer = csv.DictWriter(out, fieldnames=SHIPMENT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(generate_shipments(args.shipments, skew=args.skew, seed=args.seed))
+    with open(args.news_out, "w", encoding="utf-8") as out:
+        for snippet in generate_news(args.news, skew=args.skew, seed=args.seed):
+            out.write(json.dumps({"news_text": snippet}) + "\n")
+    print(f"Wrote {args.shipments} shipments to {args.shipments_out} and {args.news} snippets to {args.news_out}")
+
+if __name__ == "__main__":
+    main()
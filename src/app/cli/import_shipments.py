@@ -0,0 +1,40 @@
+"""Bulk-load shipments from a YAML, CSV or NDJSON file.
+
+Usage:
+    PYTHONPATH=src python -m app.cli.import_shipments manifests.csv [--format csv] [--chunk-size 5000]
+"""
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+from app.db.base import Base
+from app.db.session import db
+# Registers risk_assessments, which the disruption and link tables reference
+from app.models.assessment import RiskAssessmentModel
+from app.services.shipment_import import FORMATS, ShipmentImporter
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", type=Path, help="File to import")
+    parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, help="Rows per bulk write")
+    return parser.parse_args(argv)
+
+async def run(args: argparse.Namespace) -> None:
+    # Chunks are linked to open disruptions, so create their tables too, as the app does at startup
+    async with db.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        report = await ShipmentImporter(db.engine, chunk_size=args.chunk_size).import_file(args.path, args.format)
+    finally:
+        await db.dispose()
+    print(report.model_dump_json(indent=2))
+
+def main(argv: Optional[List[str]] = None) -> None:
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run(parse_args(argv)))
+
+if __name__ == "__main__":
+    main()
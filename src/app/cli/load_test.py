@@ -0,0 +1,135 @@
+"""Replay a news corpus against the API and report throughput and latency.
+
+Without --url the app runs in-process, through its lifespan, against the
+configured database; set EXTRACTION_BACKEND=fake to keep Gemini out of the
+measurement. In-process runs also report how many statements reached the
+database. With --url the driver targets a running server instead.
+
+Usage:
+    EXTRACTION_BACKEND=fake PYTHONPATH=src python -m app.cli.load_test --corpus benchmark_news.ndjson \\
+        [--shipments benchmark_shipments.csv] [--requests 1000] [--concurrency 32] [--url http://localhost:8000]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from itertools import cycle, islice
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+import numpy as np
+
+from app.db.query_counter import QueryCounter
+
+ASSESSMENTS_PATH = "/api/v1/assessments/"
+
+@dataclass
+class LoadReport:
+    concurrency: int
+    elapsed_seconds: float = 0.0
+    errors: int = 0
+    db_round_trips: Optional[int] = None
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def percentile_ms(self, q: float) -> float:
+        return float(np.percentile(self.latencies, q) * 1000.0) if self.latencies else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "concurrency": self.concurrency,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "throughput_rps": round(self.throughput, 1),
+            "p50_ms": round(self.percentile_ms(50), 1),
+            "p95_ms": round(self.percentile_ms(95), 1),
+            "p99_ms": round(self.percentile_ms(99), 1),
+            "db_round_trips": self.db_round_trips,
+            "db_round_trips_per_request": (
+                round(self.db_round_trips / self.requests, 2) if self.db_round_trips is not None and self.requests else None
+            ),
+        }
+
+async def replay(
+    client: httpx.AsyncClient, snippets: Sequence[str], concurrency: int, path: str = ASSESSMENTS_PATH
+) -> LoadReport:
+    """POST every snippet with at most ``concurrency`` requests in flight."""
+    report = LoadReport(concurrency=concurrency)
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for snippet in snippets:
+        queue.put_nowait(snippet)
+
+    async def worker() -> None:
+        while not queue.empty():
+            snippet = queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                response = await client.post(path, json={"news_text": snippet})
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            report.latencies.append(time.perf_counter() - started)
+            report.errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    report.elapsed_seconds = time.perf_counter() - started
+    return report
+
+def load_corpus(path: Path, requests: Optional[int] = None) -> List[str]:
+    with open(path, encoding="utf-8") as stream:
+        snippets = [json.loads(line)["news_text"] for line in stream if line.strip()]
+    if requests is not None and snippets:
+        # Cycle a short corpus; repeats exercise the caches as real traffic would
+        snippets = list(islice(cycle(snippets), requests))
+    return snippets
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, required=True, help="NDJSON file of {\"news_text\": ...} lines")
+    parser.add_argument("--requests", type=int, help="Total requests; defaults to one per snippet")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--url", help="Target a running server instead of the in-process app")
+    parser.add_argument("--shipments", type=Path, help="Import this shipment file before an in-process run")
+    return parser.parse_args(argv)
+
+async def run(args: argparse.Namespace) -> LoadReport:
+    snippets = load_corpus(args.corpus, args.requests)
+    timeout = httpx.Timeout(60.0)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=timeout) as client:
+            return await replay(client, snippets, args.concurrency)
+
+    from app.db.session import db
+    from app.main import app
+    from app.services.shipment_import import ShipmentImporter
+
+    async with app.router.lifespan_context(app):
+        if args.shipments:
+            await ShipmentImporter(db.engine).import_file(args.shipments)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=timeout) as client:
+            with QueryCounter(*db.engines) as queries:
+                report = await replay(client, snippets, args.concurrency)
+        report.db_round_trips = queries.count
+    return report
+
+def main(argv: Optional[List[str]] = None) -> None:
+    # One INFO line per request would swamp the report
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    report = asyncio.run(run(parse_args(argv)))
+    print(json.dumps(report.as_dict(), indent=2))
+
+if __name__ == "__main__":
+    main()
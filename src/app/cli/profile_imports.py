@@ -0,0 +1,98 @@
+"""Report what importing a module costs, slowest imports first.
+
+Imports the module in a fresh interpreter under ``python -X importtime`` and
+reports the wall time of the import, the slowest modules by cumulative time
+(a module plus everything it imported first) or by self time, and whether
+given heavy modules were loaded at all. Settings are read from the
+environment as usual, so run it with the same variables as the server.
+
+Usage:
+    PYTHONPATH=src python -m app.cli.profile_imports [--module app.main] [--top 20] [--sort cumulative|self]
+        [--check google.genai --check numpy]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence
+
+DEFAULT_CHECKS = ("google.genai", "httpx", "numpy", "yaml")
+
+class ImportTiming(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+@dataclass
+class ImportProfile:
+    module: str
+    wall_seconds: float
+    timings: List[ImportTiming]
+
+    def loaded(self, module: str) -> bool:
+        return any(t.module == module for t in self.timings)
+
+    def slowest(self, top: int, sort: str = "cumulative") -> List[ImportTiming]:
+        key = (lambda t: t.cumulative_us) if sort == "cumulative" else (lambda t: t.self_us)
+        return sorted(self.timings, key=key, reverse=True)[:top]
+
+    def as_dict(self, top: int, sort: str, checks: Sequence[str]) -> Dict[str, object]:
+        return {
+            "module": self.module,
+            "wall_ms": round(self.wall_seconds * 1000, 1),
+            "modules_imported": len(self.timings),
+            "loaded": {name: self.loaded(name) for name in checks},
+            "slowest": [
+                {"module": t.module, "cumulative_ms": round(t.cumulative_us / 1000, 1), "self_ms": round(t.self_us / 1000, 1)}
+                for t in self.slowest(top, sort)
+            ],
+        }
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """Parse ``-X importtime`` lines: "import time: <self us> | <cumulative us> | <indented module>"."""
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            # The header row
+            continue
+        timings.append(ImportTiming(module.strip(), int(self_us), int(cumulative_us)))
+    return timings
+
+def profile_import(module: str, env: Optional[Mapping[str, str]] = None) -> ImportProfile:
+    """Import ``module`` in a fresh interpreter and time it.
+
+    The child sees this interpreter's import path, so it resolves the same code.
+    """
+    env = dict(env if env is not None else os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in sys.path if p)
+    script = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return ImportProfile(module, float(result.stdout.strip().splitlines()[-1]), parse_importtime(result.stderr))
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--sort", choices=("cumulative", "self"), default="cumulative")
+    parser.add_argument("--check", action="append", help="Report whether this module gets imported (repeatable)")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    profile = profile_import(args.module)
+    print(json.dumps(profile.as_dict(args.top, args.sort, args.check or DEFAULT_CHECKS), indent=2))
+
+if __name__ == "__main__":
+    main()
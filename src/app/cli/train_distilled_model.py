@@ -0,0 +1,102 @@
+"""Train the distilled extraction model from stored assessments.
+
+Every assessment the extraction model answered pairs a snippet with its
+event. A deterministic share of them (by snippet hash) is held out; the
+report gives the share of held-out snippets the trained model would answer
+on its own at the confidence threshold, and how often those answers agree
+with the extraction model. Point DISTILLED_MODEL_PATH at the output to serve it.
+
+Usage:
+    PYTHONPATH=src python -m app.cli.train_distilled_model [--output distilled_model.npz] [--limit 100000]
+        [--holdout 0.1] [--min-confidence 0.9] [--epochs 100]
+"""
+import argparse
+import asyncio
+import json
+import time
+import zlib
+from typing import List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import or_, select
+
+from app.core.config import settings
+from app.db.session import db
+from app.models.assessment import RiskAssessmentModel
+from app.repositories.port_index import port_index
+from app.schemas.assessment import DisruptionEvent
+from app.services.distilled_model import DistilledModel, evaluate_model
+from app.services.extraction_trace import EXTRACTION_PATH_COALESCED, EXTRACTION_PATH_MODEL
+from app.services.snippet_condenser import SnippetCondenser
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=settings.DISTILLED_MODEL_PATH or "distilled_model.npz")
+    parser.add_argument("--limit", type=int, help="Most recent assessments to learn from")
+    parser.add_argument("--holdout", type=float, default=0.1, help="Share of snippets kept back for evaluation")
+    parser.add_argument("--min-confidence", type=float, default=settings.DISTILLED_MIN_CONFIDENCE)
+    parser.add_argument("--epochs", type=int, default=100)
+    return parser.parse_args(argv)
+
+def is_held_out(text: str, holdout: float) -> bool:
+    # By content, so a snippet stored twice never lands on both sides
+    return zlib.crc32(text.encode()) % 1000 < holdout * 1000
+
+async def run(args: argparse.Namespace) -> None:
+    # Only the extraction model's own answers are labels: the pre-filter's and this
+    # model's would teach it itself, and reused answers belong to other snippets
+    stmt = (
+        select(RiskAssessmentModel.source_snippet, RiskAssessmentModel.detected_event)
+        .where(or_(
+            RiskAssessmentModel.extraction_path.is_(None),
+            RiskAssessmentModel.extraction_path.in_((EXTRACTION_PATH_MODEL, EXTRACTION_PATH_COALESCED)),
+        ))
+        .order_by(RiskAssessmentModel.created_at.desc())
+        .limit(args.limit)
+        .execution_options(yield_per=1000)
+    )
+    train: List[Tuple[str, DisruptionEvent]] = []
+    held_out: List[Tuple[str, DisruptionEvent]] = []
+    skipped = 0
+    # Learn from the text the served model will see
+    condenser = SnippetCondenser() if settings.SNIPPET_CONDENSER_ENABLED else None
+    try:
+        async with db.sessionmaker() as session:
+            # The condenser ranks sentences by the port gazetteer
+            await port_index.refresh(session)
+            async for text, event in await session.stream(stmt):
+                if condenser is not None:
+                    text = condenser.condense(text).text
+                try:
+                    sample = (text, DisruptionEvent.model_validate(event, strict=False))
+                except ValidationError:
+                    skipped += 1
+                    continue
+                (held_out if is_held_out(text, args.holdout) else train).append(sample)
+    finally:
+        await db.dispose()
+
+    started = time.perf_counter()
+    model = DistilledModel.fit(train, epochs=args.epochs)
+    fit_seconds = time.perf_counter() - started
+    evaluation = evaluate_model(model, args.min_confidence, held_out)
+    model.save(args.output)
+
+    print(json.dumps({
+        "output": args.output,
+        "trained_on": len(train),
+        "held_out": len(held_out),
+        "skipped": skipped,
+        "classes": [f"{event_type} ({'disruption' if is_disruption else 'no disruption'})" for event_type, is_disruption in model.classes],
+        "ports": len(model.tagger.ports),
+        "fit_seconds": round(fit_seconds, 2),
+        "min_confidence": args.min_confidence,
+        "coverage": round(evaluation.coverage, 4),
+        "accuracy": round(evaluation.accuracy, 4),
+    }, indent=2))
+
+def main(argv: Optional[List[str]] = None) -> None:
+    asyncio.run(run(parse_args(argv)))
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,153 @@
+from typing import Dict, List, Literal, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Read replicas for plain SELECTs; writes and locking reads always go to DATABASE_URL
+    DATABASE_REPLICA_URLS: List[str] = []
+    # Connection pool for each server database engine (ignored for SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_STATEMENT_CACHE_SIZE: int = 100
     GOOGLE_CLOUD_PROJECT: str
     GOOGLE_CLOUD_LOCATION: str
+    EXTRACTION_MODEL: str = "gemini-2.5-flash"
     EXTRACTION_PROMPT: str = (
         "Analyze this news snippet and extract supply chain disruption details. "
         "For the 'target_port' field, extract ONLY the city/location name (e.g., use 'Rotterdam' instead of 'Port of Rotterdam'). "
         "Return valid JSON matching the schema.\n\n{text}"
     )
+
+    # Shared extraction client: connection pool and in-flight request limit
+    # "vertex" calls Gemini; "fake" is the deterministic offline stand-in for load tests
+    EXTRACTION_BACKEND: Literal["vertex", "fake"] = "vertex"
+    # Import the backend in the background at startup instead of on the first extraction
+    EXTRACTION_BACKEND_WARMUP: bool = True
+    EXTRACTION_MAX_CONCURRENCY: int = 32
+    EXTRACTION_HTTP_MAX_CONNECTIONS: int = 64
+    EXTRACTION_HTTP_KEEPALIVE_SECONDS: float = 30.0
+
+    # Fake backend behaviour: log-normal latency around the median, and a failure rate
+    FAKE_EXTRACTION_LATENCY_MEDIAN_MS: float = 400.0
+    FAKE_EXTRACTION_LATENCY_SIGMA: float = 0.5
+    FAKE_EXTRACTION_ERROR_RATE: float = 0.0
+    FAKE_EXTRACTION_SEED: int = 0
+    # Concurrent calls beyond this are refused with a 429; 0 for no limit
+    FAKE_EXTRACTION_CAPACITY: int = 0
+
+    # Pack up to EXTRACTION_BATCH_MAX_ITEMS queued snippets into one backend request, waiting at
+    # most EXTRACTION_BATCH_MAX_DELAY_MS for a batch to fill; 1 sends every snippet on its own
+    EXTRACTION_BATCH_MAX_ITEMS: int = 1
+    EXTRACTION_BATCH_MAX_DELAY_MS: float = 10.0
+    EXTRACTION_BATCH_PROMPT: str = (
+        "Analyze each numbered news snippet below and extract supply chain disruption details for each one. "
+        "For the 'target_port' field, extract ONLY the city/location name (e.g., use 'Rotterdam' instead of 'Port of Rotterdam'). "
+        "Return a JSON array with one object per snippet, setting 'snippet_index' to the snippet's number.\n\n{snippets}"
+    )
+
+    # Resilience around the extraction backend: a deadline per call, a hedged duplicate
+    # once a call outlives the given latency percentile (0 disables hedging), an AIMD
+    # concurrency limit between EXTRACTION_CONCURRENCY_MIN and EXTRACTION_MAX_CONCURRENCY,
+    # and a circuit breaker that opens after consecutive backend failures
+    EXTRACTION_RESILIENCE_ENABLED: bool = True
+    EXTRACTION_DEADLINE_SECONDS: float = 30.0
+    EXTRACTION_HEDGE_PERCENTILE: float = 95.0
+    EXTRACTION_HEDGE_MIN_SAMPLES: int = 50
+    EXTRACTION_CONCURRENCY_MIN: int = 1
+    EXTRACTION_CONCURRENCY_BACKOFF: float = 0.7
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_SECONDS: float = 30.0
+
+    # Local model distilled from stored assessments (train it with app.cli.train_distilled_model).
+    # Snippets it is at least DISTILLED_MIN_CONFIDENCE sure about are answered without the backend.
+    DISTILLED_MODEL_PATH: Optional[str] = None
+    DISTILLED_MIN_CONFIDENCE: float = 0.9
+
+    # Scraped articles are stripped of markup and boilerplate and cut to their most relevant
+    # sentences, at most SNIPPET_MAX_TOKENS (estimated), before any extraction layer sees them
+    SNIPPET_CONDENSER_ENABLED: bool = True
+    SNIPPET_MAX_TOKENS: int = 400
+
+    # Extraction cache (in-process LRU tier + optional shared DB tier)
+    EXTRACTION_CACHE_ENABLED: bool = True
+    EXTRACTION_CACHE_MAX_ENTRIES: int = 10_000
+    EXTRACTION_CACHE_TTL_SECONDS: int = 3600
+    EXTRACTION_CACHE_SHARED: bool = False
+
+    # Identical snippets arriving together share one in-flight extraction
+    SINGLE_FLIGHT_ENABLED: bool = True
+
+    # Near-duplicate extraction reuse (MinHash over recent snippets)
+    NEAR_DUPLICATE_ENABLED: bool = True
+    NEAR_DUPLICATE_THRESHOLD: float = 0.7
+    NEAR_DUPLICATE_CAPACITY: int = 4096
+    NEAR_DUPLICATE_TTL_SECONDS: int = 3600
+
+    # Asynchronous assessment jobs
+    ASSESSMENT_WORKERS: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 0.5
+    JOB_LONG_POLL_MAX_SECONDS: float = 30.0
+    JOB_STALE_SECONDS: float = 300.0
+    # Claims a job gets before a worker that keeps dying on it marks it failed, and how often stale claims are swept
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_SWEEP_INTERVAL_SECONDS: float = 60.0
+
+    # Shipment import and startup seeding
+    SHIPMENT_IMPORT_CHUNK_SIZE: int = 5000
+    SEED_DATA_PATH: str = "seed_data.yaml"
+
+    # Port index: full refresh interval, and minimum age before a lookup miss forces one
+    PORT_INDEX_REFRESH_SECONDS: float = 300.0
+    PORT_INDEX_MISS_REFRESH_SECONDS: float = 5.0
+
+    # Disruptive assessments keep claiming shipments booked to their port for this long
+    DISRUPTION_TTL_HOURS: float = 72.0
+    DISRUPTION_REGISTRY_REFRESH_SECONDS: float = 60.0
+
+    # Port reference catalogue (name, latitude, longitude), seeded into an empty ports table.
+    # Defaults to the catalogue bundled with the app.
+    PORT_CATALOGUE_PATH: Optional[str] = None
+    # A disruption also reaches ports this many km away when its event type contains the key
+    # (largest match wins); other event types stay at the reported port
+    EVENT_IMPACT_RADIUS_KM: Dict[str, float] = {
+        "typhoon": 400.0,
+        "hurricane": 400.0,
+        "cyclone": 400.0,
+        "tsunami": 500.0,
+        "earthquake": 300.0,
+        "weather": 250.0,
+        "storm": 250.0,
+        "flood": 150.0,
+    }
+    EVENT_IMPACT_DEFAULT_RADIUS_KM: float = 0.0
+
+    # Keyword/gazetteer pre-filter that skips the model for non-shipping news.
+    # Check its recall with app.cli.evaluate_relevance_filter before enabling.
+    RELEVANCE_FILTER_ENABLED: bool = False
+    RELEVANCE_FILTER_THRESHOLD: float = 1.0
+
+    # Group commit of single assessments across concurrent requests (server databases only)
+    WRITE_COALESCING_ENABLED: bool = True
+    WRITE_COALESCE_MAX_ROWS: int = 256
+    WRITE_COALESCE_MAX_DELAY_MS: float = 5.0
+
+    # Batch assessments
+    BATCH_MAX_ITEMS: int = 500
+    BATCH_EXTRACTION_CONCURRENCY: int = 16
+
+    # Affected shipments are returned a page at a time
+    AFFECTED_SHIPMENTS_PAGE_SIZE: int = 100
+    AFFECTED_SHIPMENTS_MAX_PAGE_SIZE: int = 1000
+
+    # Analytics over the hourly port rollups
+    ANALYTICS_DEFAULT_RANGE_HOURS: int = 24
+    ANALYTICS_MAX_RANGE_DAYS: int = 90
+
+    # Streaming NDJSON ingestion
+    STREAM_QUEUE_SIZE: int = 64
+    STREAM_MAX_LINE_BYTES: int = 1_048_576
     
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
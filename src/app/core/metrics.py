@@ -0,0 +1,259 @@
+import abc
+import bisect
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Prometheus text exposition format 0.0.4
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+class _Metric(abc.ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    @abc.abstractmethod
+    def samples(self) -> Iterable[str]:
+        """Exposition lines for every label set observed so far."""
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}", *self.samples()]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterable[str]:
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram: "Histogram", labels: Dict[str, str]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (last slot is +Inf), sum
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    def time(self, **labels: str) -> _Timer:
+        """Context manager observing the wall time of its block."""
+        return _Timer(self, labels)
+
+    def count(self, **labels: str) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def samples(self) -> Iterable[str]:
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(self._sums[key])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        metric = Gauge(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Optional[Sequence[float]] = None
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets or DEFAULT_BUCKETS)
+        self.register(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+# Process-wide registry served on /metrics
+registry = MetricsRegistry()
+
+ASSESSMENT_STAGE_SECONDS = registry.histogram(
+    "assessment_stage_seconds", "Time spent in each stage of creating assessments.", ["stage"]
+)
+EXTRACTIONS_TOTAL = registry.counter(
+    "extractions_total", "Extractions by the layer that produced them.", ["path"]
+)
+SINGLE_FLIGHT_CALLS_TOTAL = registry.counter(
+    "single_flight_calls_total",
+    "Extraction calls that started an extraction (leader) or joined one in flight (follower).",
+    ["role"],
+)
+EXTRACTION_BACKEND_CALLS_TOTAL = registry.counter(
+    "extraction_backend_calls_total", "Calls to the extraction backend by outcome, hedges included.", ["outcome"]
+)
+EXTRACTION_BACKEND_SECONDS = registry.histogram(
+    "extraction_backend_seconds", "Latency of extraction backend calls that were not cancelled."
+)
+EXTRACTION_HEDGES_TOTAL = registry.counter(
+    "extraction_hedges_total", "Hedged duplicate extraction calls launched, and those that answered first.", ["result"]
+)
+EXTRACTION_CONCURRENCY_LIMIT = registry.gauge(
+    "extraction_concurrency_limit", "Current adaptive limit on concurrent extraction backend calls."
+)
+EXTRACTION_BACKEND_IN_FLIGHT = registry.gauge(
+    "extraction_backend_in_flight", "Extraction backend calls currently in flight, hedges included."
+)
+EXTRACTION_CIRCUIT_STATE = registry.gauge(
+    "extraction_circuit_state", "1 for the extraction circuit breaker's current state, 0 for the others.", ["state"]
+)
+SNIPPET_TOKENS_TOTAL = registry.counter(
+    "snippet_tokens_total", "Estimated snippet tokens as submitted (source) and after condensation (condensed).", ["stage"]
+)
+EXTRACTION_BATCH_ITEMS = registry.histogram(
+    "extraction_batch_items",
+    "Snippets packed into each batched extraction request.",
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+EXTRACTION_BATCH_RETRIES_TOTAL = registry.counter(
+    "extraction_batch_retries_total", "Snippets a batched response left out or garbled, retried on their own."
+)
+EXTRACTION_CACHE_LOOKUPS_TOTAL = registry.counter(
+    "extraction_cache_lookups_total",
+    "In-process extraction cache lookups by result; shared_hit is a miss the shared tier answered.",
+    ["result"],
+)
+EXTRACTION_CACHE_REMOVALS_TOTAL = registry.counter(
+    "extraction_cache_removals_total", "Entries dropped from the in-process extraction cache, by reason.", ["reason"]
+)
+LLM_TOKENS_TOTAL = registry.counter(
+    "llm_tokens_total", "Tokens reported in model response usage metadata.", ["kind"]
+)
+DB_POOL_CHECKOUT_SECONDS = registry.histogram(
+    "db_pool_checkout_seconds", "Time spent waiting for a database connection from the pool."
+)
+ASSESSMENT_WRITE_BATCH_ROWS = registry.histogram(
+    "assessment_write_batch_rows",
+    "Assessments written per group commit.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+HTTP_REQUESTS_IN_FLIGHT = registry.gauge("http_requests_in_flight", "HTTP requests currently being served.")
+HTTP_REQUESTS_TOTAL = registry.counter("http_requests_total", "HTTP requests served.", ["method", "status"])
+ERRORS_TOTAL = registry.counter("errors_total", "Errors turned into failed results, by exception type.", ["type"])
+
+def record_error(error: BaseException) -> None:
+    ERRORS_TOTAL.inc(type=type(error).__name__)
+
+class MetricsMiddleware:
+    """Plain ASGI middleware tracking in-flight and completed HTTP requests.
+
+    Written against raw ASGI rather than BaseHTTPMiddleware so it adds no
+    task or body buffering to streaming responses.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            HTTP_REQUESTS_TOTAL.inc(method=scope["method"], status=str(status_code))
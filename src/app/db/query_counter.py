@@ -0,0 +1,26 @@
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+class QueryCounter:
+    """Counts the statements the engines send to their databases while the block runs.
+
+    An executemany counts once, matching the single round trip it costs.
+    """
+
+    def __init__(self, *engines: AsyncEngine):
+        self.engines = engines
+        self.count = 0
+
+    def _on_execute(self, *args: Any) -> None:
+        self.count += 1
+
+    def __enter__(self) -> "QueryCounter":
+        for engine in self.engines:
+            event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        for engine in self.engines:
+            event.remove(engine.sync_engine, "before_cursor_execute", self._on_execute)
@@ -1,24 +1,100 @@
+import random
+import time
+from sqlalchemy import Select
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
-from typing import AsyncGenerator, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+from typing import Any, AsyncGenerator, Dict, List, Optional, Sequence
 from app.core.config import settings
+from app.core.metrics import DB_POOL_CHECKOUT_SECONDS
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - started)
+
+class RoutingSession(Session):
+    """Sends plain reads to a read replica and everything else to the primary.
+
+    Each session sticks to one replica, so a sequence of reads sees one
+    snapshot of replication. The first write pins the session to the primary
+    for the rest of its life, so it always reads its own writes.
+    """
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kw: Any) -> Engine:
+        replicas: Sequence[Engine] = self.info.get("replicas", ())
+        if replicas and not self.info.get("pinned"):
+            if isinstance(clause, Select) and clause._for_update_arg is None and not self._flushing:
+                if "replica" not in self.info:
+                    self.info["replica"] = random.choice(replicas)
+                return self.info["replica"]
+            self.info["pinned"] = True
+        return super().get_bind(mapper, clause=clause, **kw)
+
+def use_primary(session: AsyncSession) -> None:
+    """Route every statement of this session to the primary, reads included."""
+    session.info["pinned"] = True
+
+def engine_options(url: str) -> Dict[str, Any]:
+    # SQLite keeps its dialect default (a static pool for :memory:); server databases get the tuned, timed pool
+    backend = make_url(url).get_backend_name()
+    if backend == "sqlite":
+        return {}
+    options: Dict[str, Any] = {
+        "poolclass": TimedAsyncAdaptedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+    if backend == "postgresql":
+        # asyncpg's own cache and SQLAlchemy's prepared statement cache; 0 for PgBouncer in transaction mode
+        options["connect_args"] = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+    return options
 
 class Database:
-    def __init__(self) -> None:
+    def __init__(self, url: Optional[str] = None, replica_urls: Optional[Sequence[str]] = None) -> None:
+        self.url = url
+        self.replica_urls = replica_urls
         self._engine: Optional[AsyncEngine] = None
+        self._replicas: List[AsyncEngine] = []
         self._sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None
 
     def init(self) -> None:
-        self._engine = create_async_engine(settings.DATABASE_URL, echo=False)
-        self._sessionmaker = async_sessionmaker(self._engine, expire_on_commit=False, class_=AsyncSession)
+        url = self.url or settings.DATABASE_URL
+        replica_urls = self.replica_urls if self.replica_urls is not None else settings.DATABASE_REPLICA_URLS
+        self._engine = create_async_engine(url, echo=False, **engine_options(url))
+        self._replicas = [create_async_engine(r, echo=False, **engine_options(r)) for r in replica_urls]
+        self._sessionmaker = async_sessionmaker(
+            self._engine,
+            expire_on_commit=False,
+            class_=AsyncSession,
+            sync_session_class=RoutingSession,
+            info={"replicas": [replica.sync_engine for replica in self._replicas]},
+        )
 
     @property
     def engine(self) -> AsyncEngine:
+        """The primary: every write, and every read when no replica is configured."""
         if self._engine is None:
             self.init()
         # MyPy check: init guarantees _engine is not None
         assert self._engine is not None
         return self._engine
 
+    @property
+    def engines(self) -> List[AsyncEngine]:
+        return [self.engine, *self._replicas]
+
     @property
     def sessionmaker(self) -> async_sessionmaker[AsyncSession]:
         if self._sessionmaker is None:
@@ -26,8 +102,12 @@ class Database:
         assert self._sessionmaker is not None
         return self._sessionmaker
 
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
 db = Database()
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with db.sessionmaker() as session:
-        yield session
\ No newline at end of file
+        yield session
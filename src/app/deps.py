@@ -1,10 +1,15 @@
-from typing import Annotated, AsyncGenerator
-from fastapi import Depends
+from typing import Annotated, AsyncGenerator, Optional
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_db
+from app.db.session import db, get_db
+from app.repositories.assessment_repo import AssessmentRepository
+from app.repositories.job_repo import AssessmentJobRepository
+from app.repositories.rollup_repo import RiskRollupRepository
 from app.repositories.shipment_repo import ShipmentRepository
-from app.services.extraction_service import IntelligentExtractionService
+from app.services.assessment_writer import AssessmentWriteCoalescer
+from app.services.extraction_service import EventExtractor
 from app.services.risk_service import RiskAssessmentService
+from app.services.shipment_import import ShipmentImporter
 
 # Type aliases for dependency injection
 DBDep = Annotated[AsyncSession, Depends(get_db)]
@@ -12,12 +17,30 @@ DBDep = Annotated[AsyncSession, Depends(get_db)]
 def get_shipment_repo(db: DBDep) -> ShipmentRepository:
     return ShipmentRepository(db)
 
-def get_extraction_service() -> IntelligentExtractionService:
-    return IntelligentExtractionService()
+def get_assessment_repo(db: DBDep) -> AssessmentRepository:
+    return AssessmentRepository(db)
+
+def get_rollup_repo(db: DBDep) -> RiskRollupRepository:
+    return RiskRollupRepository(db)
+
+def get_shipment_importer() -> ShipmentImporter:
+    return ShipmentImporter(db.engine)
+
+def get_job_repo(db: DBDep) -> AssessmentJobRepository:
+    return AssessmentJobRepository(db)
+
+def get_extraction_service(request: Request) -> EventExtractor:
+    # Built once in the application lifespan and shared by every request
+    return request.app.state.extraction_service
+
+def get_assessment_writer(request: Request) -> Optional[AssessmentWriteCoalescer]:
+    # None when group commit is off; the service then commits each assessment itself
+    return request.app.state.assessment_writer
 
 def get_risk_service(
     db: DBDep,
     repo: Annotated[ShipmentRepository, Depends(get_shipment_repo)],
-    extractor: Annotated[IntelligentExtractionService, Depends(get_extraction_service)]
+    extractor: Annotated[EventExtractor, Depends(get_extraction_service)],
+    writer: Annotated[Optional[AssessmentWriteCoalescer], Depends(get_assessment_writer)],
 ) -> RiskAssessmentService:
-    return RiskAssessmentService(db, extractor, repo)
+    return RiskAssessmentService(db, extractor, repo, writer)
@@ -1,48 +1,114 @@
-import yaml
+import asyncio
 import logging
-from fastapi import FastAPI
+from pathlib import Path
+from fastapi import FastAPI, Response
 from contextlib import asynccontextmanager
 from app.db.session import db
 from app.db.base import Base
-from app.api.v1.endpoints import assessment
-from app.models.shipment import ShipmentModel
-from sqlalchemy import select
+from app.api.v1.endpoints import analytics, assessment, jobs, shipments
+from app.core.config import settings
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, registry
+from app.repositories.disruption_registry import disruption_registry
+from app.repositories.port_index import port_index
+from app.repositories.port_proximity import port_proximity, seed_ports
+from app.services.assessment_writer import AssessmentWriteCoalescer
+from app.services.extraction_cache import DatabaseCacheTier
+from app.services.extraction_pipeline import build_extraction_service
+from app.services.extraction_service import LazyExtractionBackend
+from app.services.job_worker import AssessmentWorkerPool
+from app.services.shipment_import import seed_shipments
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+async def _seed(path: Path) -> None:
+    if not path.exists():
+        logger.warning(f"{path} not found, skipping seeding.")
+        return
+    try:
+        report = await seed_shipments(db.engine, path)
+        if report is not None:
+            logger.info(f"Seeded {report.rows_written} shipments from {path}")
+    except Exception as e:
+        logger.error(f"Failed to seed data: {e}")
+
+async def _warm_up(backend: LazyExtractionBackend) -> None:
+    try:
+        await backend.load()
+        logger.info(f"Loaded extraction backend '{backend.name}'")
+    except Exception as e:
+        logger.error(f"Failed to load extraction backend '{backend.name}': {e}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Create tables on startup
     async with db.engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     
-    # Seed data
-    try:
-        with open("seed_data.yaml", "r") as f:
-            data = yaml.safe_load(f)
-            if data and "shipments" in data:
-                async with db.sessionmaker() as session:
-                    # Check if data already exists to avoid duplicates on reload (though in-memory wipes anyway)
-                    result = await session.execute(select(ShipmentModel).limit(1))
-                    if not result.scalar():
-                        shipments = [ShipmentModel(**item) for item in data["shipments"]]
-                        session.add_all(shipments)
-                        await session.commit()
-                        logger.info(f"Seeded {len(shipments)} shipments from seed_data.yaml")
-    except FileNotFoundError:
-        logger.warning("seed_data.yaml not found, skipping seeding.")
-    except Exception as e:
-        logger.error(f"Failed to seed data: {e}")
+    # Seed data in the background so a large seed file never delays serving
+    seeding = asyncio.create_task(_seed(Path(settings.SEED_DATA_PATH)))
+
+    if settings.EXTRACTION_CACHE_SHARED:
+        pruned = await DatabaseCacheTier(db.sessionmaker).prune()
+        logger.info(f"Pruned {pruned} expired extraction cache entries")
+
+    # Regional disruptions reach the catalogue ports around them, so load those first
+    async with db.sessionmaker() as session:
+        seeded = await seed_ports(session)
+        await port_proximity.refresh(session)
+        # The relevance filter, condenser and distilled model read booked ports from the index
+        # without a session, so it must not wait for the first shipment lookup to load
+        await port_index.refresh(session)
+    logger.info(
+        f"Indexed {len(port_proximity)} catalogue ports ({seeded} seeded) and {len(port_index.keys())} booked port keys"
+    )
+
+    # Shipment writes are matched against the disruptions still open
+    async with db.sessionmaker() as session:
+        expired = await disruption_registry.prune(session)
+        await disruption_registry.refresh(session)
+    logger.info(f"Tracking {len(disruption_registry)} open disruptions ({expired} expired)")
+
+    # One pooled extraction client per process, shared by all requests. Its module is
+    # imported in the background so startup does not wait for the model SDK.
+    backend = LazyExtractionBackend(settings.EXTRACTION_BACKEND)
+    warming = asyncio.create_task(_warm_up(backend)) if settings.EXTRACTION_BACKEND_WARMUP else None
+    app.state.extraction_service = build_extraction_service(backend)
+
+    # SQLite serialises writers on one file lock, so group commit only pays off on server databases
+    writer = None
+    if settings.WRITE_COALESCING_ENABLED and db.engine.dialect.name != "sqlite":
+        writer = AssessmentWriteCoalescer(db.sessionmaker)
+    app.state.assessment_writer = writer
+
+    # Background workers for asynchronous assessment jobs
+    workers = AssessmentWorkerPool(db.sessionmaker, app.state.extraction_service)
+    await workers.start()
 
     yield
-    await db.engine.dispose()
+    seeding.cancel()
+    if warming is not None:
+        warming.cancel()
+    await asyncio.gather(seeding, *([warming] if warming is not None else []), return_exceptions=True)
+    await workers.stop()
+    if writer is not None:
+        await writer.aclose()
+    await backend.aclose()
+    await db.dispose()
 
 app = FastAPI(title="Supply Chain Risk Monolith", lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
 
+app.include_router(jobs.router, prefix="/api/v1/assessments/jobs", tags=["Assessment Jobs"])
 app.include_router(assessment.router, prefix="/api/v1/assessments", tags=["Assessments"])
+app.include_router(shipments.router, prefix="/api/v1/shipments", tags=["Shipments"])
+app.include_router(analytics.router, prefix="/api/v1/analytics", tags=["Analytics"])
 
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(registry.render(), media_type=CONTENT_TYPE)
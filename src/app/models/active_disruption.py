@@ -0,0 +1,20 @@
+from datetime import datetime
+import uuid
+from sqlalchemy import Float, ForeignKey, String, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+class ActiveDisruptionModel(Base):
+    """A disruptive assessment whose impact set still grows as shipments are booked to its port."""
+    __tablename__ = "active_disruptions"
+
+    assessment_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True), ForeignKey("risk_assessments.assessment_id", ondelete="CASCADE"), primary_key=True
+    )
+    # Port as extracted, which is also the rollup port, and its canonical key for matching
+    port: Mapped[str] = mapped_column(String(255), nullable=False)
+    port_key: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    opened_at: Mapped[datetime] = mapped_column(nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(nullable=False, index=True)
+    # Shipments bound for catalogue ports this close to the port are affected too
+    radius_km: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
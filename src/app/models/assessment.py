@@ -1,15 +1,19 @@
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import JSON, Text, Uuid
+from sqlalchemy import JSON, Float, Index, Integer, String, Text, Uuid
 from datetime import datetime, timezone
 import uuid
-from typing import Any, List, TYPE_CHECKING
+from typing import Any, List, Optional, TYPE_CHECKING
 from app.db.base import Base
 
 if TYPE_CHECKING:
-    from app.models.shipment import ShipmentModel
+    from app.repositories.shipment_repo import ShipmentRow
 
 class RiskAssessmentModel(Base):
     __tablename__ = "risk_assessments"
+    # Time-range scans for rebuilding rollups and for recent-first listings
+    __table_args__ = (Index("ix_risk_assessments_created_at", "created_at"),)
+    # Lets the plain-annotated transient fields below sit beside the mapped columns
+    __allow_unmapped__ = True
 
     assessment_id: Mapped[uuid.UUID] = mapped_column(
         Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -21,7 +25,19 @@ class RiskAssessmentModel(Base):
     detected_event: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
     mitigation_strategy: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
 
-    affected_shipment_ids: Mapped[List[str]] = mapped_column(JSON, default=list)
+    # Layer that produced detected_event: model, cache, shared_cache, near_duplicate, prefilter, coalesced or distilled
+    extraction_path: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
 
-    # Transient field for Pydantic serialization (not persisted)
-    affected_shipments: List["ShipmentModel"] = []
+    # Estimated similarity to the earlier snippet whose extraction was reused; None if extracted afresh
+    duplicate_similarity: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
+    # Estimated tokens of source_snippet, and of the condensed text extraction saw; None if not condensed
+    source_tokens: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    condensed_tokens: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    # Transient fields for Pydantic serialization (not persisted): the first page
+    # of affected shipments, the total, and the cursor for the next page.
+    # The full set lives in assessment_shipments.
+    affected_shipments: List["ShipmentRow"] = []
+    affected_shipment_count: int = 0
+    next_cursor: Optional[str] = None
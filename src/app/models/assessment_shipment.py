@@ -0,0 +1,18 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import TEXT, ForeignKey, Index, Uuid
+import uuid
+from app.db.base import Base
+
+class AssessmentShipmentModel(Base):
+    """Association between an assessment and each shipment it affected."""
+    __tablename__ = "assessment_shipments"
+    # The primary key serves assessment -> shipments (and keyset pages by shipment id);
+    # this index serves the reverse lookup
+    __table_args__ = (Index("ix_assessment_shipments_shipment_id", "shipment_id", "assessment_id"),)
+
+    assessment_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True), ForeignKey("risk_assessments.assessment_id", ondelete="CASCADE"), primary_key=True
+    )
+    shipment_id: Mapped[str] = mapped_column(
+        TEXT, ForeignKey("shipments.id", ondelete="CASCADE"), primary_key=True
+    )
@@ -0,0 +1,14 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import JSON, String
+from datetime import datetime, timezone
+from typing import Any
+from app.db.base import Base
+
+class ExtractionCacheEntryModel(Base):
+    """Shared tier of the extraction cache, keyed by content hash."""
+    __tablename__ = "extraction_cache"
+
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    event: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
+    expires_at: Mapped[datetime] = mapped_column(index=True, nullable=False)
@@ -0,0 +1,36 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Index, Integer, String, Text, Uuid
+from datetime import datetime, timezone
+from typing import Optional
+import uuid
+from app.db.base import Base
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+class AssessmentJobModel(Base):
+    """Durable queue entry for an assessment processed outside the HTTP request."""
+    __tablename__ = "assessment_jobs"
+    __table_args__ = (
+        # Workers claim the oldest queued job first
+        Index("ix_assessment_jobs_status_created_at", "status", "created_at"),
+    )
+
+    job_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default=JOB_QUEUED)
+    news_text: Mapped[str] = mapped_column(Text, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    assessment_id: Mapped[Optional[uuid.UUID]] = mapped_column(Uuid(as_uuid=True), nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
+    claimed_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
+
+    def is_finished(self) -> bool:
+        return self.status in (JOB_SUCCEEDED, JOB_FAILED)
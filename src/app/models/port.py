@@ -0,0 +1,12 @@
+from sqlalchemy import Float, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+class PortModel(Base):
+    """A port in the reference catalogue, located so disruptions can reach its neighbours."""
+    __tablename__ = "ports"
+
+    name: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # WGS84 degrees
+    latitude: Mapped[float] = mapped_column(Float, nullable=False)
+    longitude: Mapped[float] = mapped_column(Float, nullable=False)
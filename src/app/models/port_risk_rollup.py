@@ -0,0 +1,18 @@
+from datetime import datetime
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+class PortRiskRollupModel(Base):
+    """Hourly per-port totals of assessments, kept up to date as assessments are written."""
+    __tablename__ = "port_risk_rollups"
+
+    # Canonical port key (normalize_port_name); primary key order serves per-port time ranges
+    port: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # UTC hour the assessments were created in
+    bucket_start: Mapped[datetime] = mapped_column(primary_key=True)
+
+    assessments: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    disruptions: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Sum of affected shipments over the bucket's disruptive assessments
+    shipments_at_risk: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
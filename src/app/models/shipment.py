@@ -1,10 +1,12 @@
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import TEXT
+from sqlalchemy import TEXT, Index
 from app.db.base import Base
 
 class ShipmentModel(Base):
     __tablename__ = "shipments"
+    # Serves both port lookups and keyset pagination by id within a port
+    __table_args__ = (Index("ix_shipments_destination_port_id", "destination_port", "id"),)
 
     id: Mapped[str] = mapped_column(TEXT, primary_key=True)
-    destination_port: Mapped[str] = mapped_column(TEXT, index=True, nullable=False)
+    destination_port: Mapped[str] = mapped_column(TEXT, nullable=False)
     goods_description: Mapped[str] = mapped_column(TEXT, nullable=False)
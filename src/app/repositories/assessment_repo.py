@@ -0,0 +1,20 @@
+from typing import Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.models.assessment import RiskAssessmentModel
+from app.models.assessment_shipment import AssessmentShipmentModel
+
+class AssessmentRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_by_shipment(self, shipment_id: str, limit: int) -> Sequence[RiskAssessmentModel]:
+        """Most recent assessments that affected the shipment, via the reverse index."""
+        stmt = (
+            select(RiskAssessmentModel)
+            .join(AssessmentShipmentModel, AssessmentShipmentModel.assessment_id == RiskAssessmentModel.assessment_id)
+            .where(AssessmentShipmentModel.shipment_id == shipment_id)
+            .order_by(RiskAssessmentModel.created_at.desc())
+            .limit(limit)
+        )
+        return (await self.session.execute(stmt)).scalars().all()
@@ -0,0 +1,166 @@
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+from sqlalchemy import Select, delete, event, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.active_disruption import ActiveDisruptionModel
+from app.repositories.port_index import normalize_port_name, port_name_keys
+from app.repositories.port_proximity import PortProximityIndex, port_proximity
+
+# Session.info key for disruptions staged in the current transaction
+_STAGED = "staged_disruptions"
+
+class OpenDisruption(NamedTuple):
+    assessment_id: uuid.UUID
+    port: str
+    opened_at: datetime
+    expires_at: datetime
+    # Catalogue ports this close to the port are affected too
+    radius_km: float = 0.0
+
+def _as_utc(moment: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything written here is UTC
+    return moment if moment.tzinfo is not None else moment.replace(tzinfo=timezone.utc)
+
+def disruption_row(disruption: OpenDisruption) -> Dict[str, Any]:
+    return {**disruption._asdict(), "port_key": normalize_port_name(disruption.port)}
+
+class DisruptionRegistry:
+    """Open disruptions keyed by canonical port, so a new shipment is checked with a dict lookup.
+
+    A disruption with an impact radius is filed under every catalogue port
+    within it, so matching stays a lookup per key of the shipment's port.
+
+    The active_disruptions table is the source of truth. Disruptions opened in
+    this process are applied as soon as their transaction commits; the table is
+    reloaded every ``max_age_seconds`` to pick up other workers' and to drop
+    expired entries. Ports that match nothing are re-checked against the table
+    with ``recheck``, so a disruption another worker opened since the last
+    reload is not missed in between.
+    """
+
+    def __init__(
+        self,
+        ttl_hours: Optional[float] = None,
+        max_age_seconds: Optional[float] = None,
+        proximity: Optional[PortProximityIndex] = None,
+    ):
+        self.ttl = timedelta(hours=ttl_hours if ttl_hours is not None else settings.DISRUPTION_TTL_HOURS)
+        self.max_age_seconds = (
+            max_age_seconds if max_age_seconds is not None else settings.DISRUPTION_REGISTRY_REFRESH_SECONDS
+        )
+        self.proximity = proximity if proximity is not None else port_proximity
+        self._by_key: Dict[str, Dict[uuid.UUID, OpenDisruption]] = {}
+        self._refreshed_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def opening(
+        self, assessment_id: uuid.UUID, port: str, opened_at: datetime, radius_km: float = 0.0
+    ) -> OpenDisruption:
+        """The disruption an assessment opens, expiring ``ttl_hours`` after it was created."""
+        return OpenDisruption(assessment_id, port, opened_at, opened_at + self.ttl, radius_km)
+
+    def add(self, disruption: OpenDisruption) -> None:
+        self._file(self._by_key, disruption)
+
+    def _file(self, by_key: Dict[str, Dict[uuid.UUID, OpenDisruption]], disruption: OpenDisruption) -> None:
+        for key in self.proximity.keys_within(disruption.port, disruption.radius_km):
+            by_key.setdefault(key, {})[disruption.assessment_id] = disruption
+
+    def stage(self, session: AsyncSession, disruption: OpenDisruption) -> None:
+        """Persist the disruption with the caller's transaction and register it once that commits."""
+        session.add(ActiveDisruptionModel(**disruption_row(disruption)))
+        session.info.setdefault(_STAGED, []).append((self, disruption))
+
+    def match(self, destination_port: str, now: Optional[datetime] = None) -> List[OpenDisruption]:
+        """Unexpired disruptions at any port the destination answers to."""
+        now = now or datetime.now(timezone.utc)
+        # A compound destination may reach one disruption through several keys
+        matches: Dict[uuid.UUID, OpenDisruption] = {}
+        for key in port_name_keys(destination_port):
+            open_here = self._by_key.get(key)
+            if not open_here:
+                continue
+            for assessment_id, disruption in list(open_here.items()):
+                if disruption.expires_at <= now:
+                    del open_here[assessment_id]
+                else:
+                    matches[assessment_id] = disruption
+        return list(matches.values())
+
+    def __len__(self) -> int:
+        return len({assessment_id for open_here in self._by_key.values() for assessment_id in open_here})
+
+    def clear(self) -> None:
+        self._by_key = {}
+        self._refreshed_at = None
+
+    def _is_stale(self) -> bool:
+        return self._refreshed_at is None or time.monotonic() - self._refreshed_at >= self.max_age_seconds
+
+    def _open_rows(self) -> Select:
+        return select(
+            ActiveDisruptionModel.assessment_id,
+            ActiveDisruptionModel.port,
+            ActiveDisruptionModel.opened_at,
+            ActiveDisruptionModel.expires_at,
+            ActiveDisruptionModel.radius_km,
+        ).where(ActiveDisruptionModel.expires_at > datetime.now(timezone.utc))
+
+    async def refresh(self, session: AsyncSession) -> None:
+        # Processes without the app's startup, such as the import CLI, load the catalogue here
+        # so radius disruptions are filed under their neighbouring ports
+        if not self.proximity.loaded:
+            await self.proximity.refresh(session)
+        by_key: Dict[str, Dict[uuid.UUID, OpenDisruption]] = {}
+        for assessment_id, port, opened_at, expires_at, radius_km in (await session.execute(self._open_rows())).tuples():
+            self._file(by_key, OpenDisruption(assessment_id, port, _as_utc(opened_at), _as_utc(expires_at), radius_km))
+        self._by_key = by_key
+        self._refreshed_at = time.monotonic()
+
+    async def recheck(self, session: AsyncSession, destination_ports: Iterable[str]) -> None:
+        """File open disruptions at these ports that the last reload predates.
+
+        Rows are looked up by the ports' canonical keys; disruptions with a
+        radius are few and are all read back, since which ports they reach
+        depends on the catalogue.
+        """
+        keys = {key for destination_port in destination_ports for key in port_name_keys(destination_port)}
+        if not keys:
+            return
+        stmt = self._open_rows().where(
+            or_(ActiveDisruptionModel.port_key.in_(keys), ActiveDisruptionModel.radius_km > 0)
+        )
+        for assessment_id, port, opened_at, expires_at, radius_km in (await session.execute(stmt)).tuples():
+            self.add(OpenDisruption(assessment_id, port, _as_utc(opened_at), _as_utc(expires_at), radius_km))
+
+    async def ensure_fresh(self, session: AsyncSession) -> None:
+        if not self._is_stale():
+            return
+        async with self._lock:
+            if self._is_stale():
+                await self.refresh(session)
+
+    async def prune(self, session: AsyncSession) -> int:
+        """Delete expired rows; they no longer match anything."""
+        result = await session.execute(
+            delete(ActiveDisruptionModel).where(ActiveDisruptionModel.expires_at <= datetime.now(timezone.utc))
+        )
+        await session.commit()
+        return result.rowcount or 0
+
+# Process-wide registry shared by the assessment and shipment write paths
+disruption_registry = DisruptionRegistry()
+
+@event.listens_for(Session, "after_commit")
+def _register_staged(session: Session) -> None:
+    for registry, disruption in session.info.pop(_STAGED, ()):
+        registry.add(disruption)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_staged(session: Session) -> None:
+    session.info.pop(_STAGED, None)
@@ -0,0 +1,144 @@
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from app.db.session import use_primary
+from app.models.job import (
+    AssessmentJobModel,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+)
+
+class StaleJobs(NamedTuple):
+    requeued: int
+    failed: int
+
+class AssessmentJobRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        # The queue is claimed with read-then-update; a lagging replica would hand out taken jobs
+        use_primary(session)
+
+    async def enqueue(self, news_text: str) -> AssessmentJobModel:
+        job = AssessmentJobModel(
+            job_id=uuid.uuid4(),
+            status=JOB_QUEUED,
+            news_text=news_text,
+            attempts=0,
+            created_at=datetime.now(timezone.utc),
+        )
+        self.session.add(job)
+        await self.session.commit()
+        return job
+
+    async def get(self, job_id: uuid.UUID) -> Optional[AssessmentJobModel]:
+        return await self.session.get(AssessmentJobModel, job_id, populate_existing=True)
+
+    async def wait_for(self, job_id: uuid.UUID, timeout: float, poll_interval: float) -> Optional[AssessmentJobModel]:
+        """Long-poll until the job finishes or ``timeout`` seconds pass."""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = await self.get(job_id)
+            if job is None or job.is_finished() or time.monotonic() >= deadline:
+                return job
+            # End the read transaction so the next poll sees commits made by workers.
+            # Nothing is pending, so commit does that without the rollback's side effect
+            # of expiring every instance the caller already holds.
+            await self.session.commit()
+            await asyncio.sleep(min(poll_interval, max(deadline - time.monotonic(), 0)))
+
+    async def claim_next(self) -> Optional[AssessmentJobModel]:
+        """Atomically move the oldest queued job to running and return it."""
+        if self.session.get_bind().dialect.name == "postgresql":
+            return await self._claim_skip_locked()
+        return await self._claim_optimistic()
+
+    async def _claim_skip_locked(self) -> Optional[AssessmentJobModel]:
+        # Concurrent workers skip rows another worker has locked instead of waiting on them
+        stmt = (
+            select(AssessmentJobModel)
+            .where(AssessmentJobModel.status == JOB_QUEUED)
+            .order_by(AssessmentJobModel.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        job = (await self.session.execute(stmt)).scalar_one_or_none()
+        if job is None:
+            await self.session.rollback()
+            return None
+        job.status = JOB_RUNNING
+        job.attempts += 1
+        job.claimed_at = datetime.now(timezone.utc)
+        await self.session.commit()
+        return job
+
+    async def _claim_optimistic(self, max_attempts: int = 5) -> Optional[AssessmentJobModel]:
+        # SQLite has no row locks: pick a candidate, then claim it with a guarded UPDATE.
+        # If another worker got there first the UPDATE touches no rows and we try the next one.
+        for _ in range(max_attempts):
+            stmt = (
+                select(AssessmentJobModel.job_id)
+                .where(AssessmentJobModel.status == JOB_QUEUED)
+                .order_by(AssessmentJobModel.created_at)
+                .limit(1)
+            )
+            job_id = (await self.session.execute(stmt)).scalar_one_or_none()
+            if job_id is None:
+                await self.session.rollback()
+                return None
+            result = await self.session.execute(
+                update(AssessmentJobModel)
+                .where(AssessmentJobModel.job_id == job_id, AssessmentJobModel.status == JOB_QUEUED)
+                .values(
+                    status=JOB_RUNNING,
+                    attempts=AssessmentJobModel.attempts + 1,
+                    claimed_at=datetime.now(timezone.utc),
+                )
+            )
+            await self.session.commit()
+            if result.rowcount == 1:
+                return await self.get(job_id)
+        return None
+
+    async def complete(self, job: AssessmentJobModel, assessment_id: uuid.UUID) -> None:
+        job.status = JOB_SUCCEEDED
+        job.assessment_id = assessment_id
+        job.finished_at = datetime.now(timezone.utc)
+        await self.session.commit()
+
+    async def fail(self, job: AssessmentJobModel, error: str) -> None:
+        job.status = JOB_FAILED
+        job.error = error
+        job.finished_at = datetime.now(timezone.utc)
+        await self.session.commit()
+
+    async def requeue_stale(self, older_than_seconds: float, max_attempts: int) -> StaleJobs:
+        """Return jobs whose worker died mid-flight to the queue.
+
+        A job already claimed ``max_attempts`` times is marked failed instead,
+        so a snippet that kills its worker is not retried forever.
+        """
+        now = datetime.now(timezone.utc)
+        stale = (
+            AssessmentJobModel.status == JOB_RUNNING,
+            AssessmentJobModel.claimed_at < now - timedelta(seconds=older_than_seconds),
+        )
+        failed = await self.session.execute(
+            update(AssessmentJobModel)
+            .where(*stale, AssessmentJobModel.attempts >= max_attempts)
+            .values(
+                status=JOB_FAILED,
+                error=f"Abandoned after {max_attempts} attempts without finishing",
+                finished_at=now,
+            )
+        )
+        requeued = await self.session.execute(
+            update(AssessmentJobModel).where(*stale).values(status=JOB_QUEUED, claimed_at=None)
+        )
+        await self.session.commit()
+        return StaleJobs(requeued.rowcount or 0, failed.rowcount or 0)
@@ -0,0 +1,19 @@
+import base64
+import binascii
+from typing import Optional
+
+class InvalidCursorError(ValueError):
+    pass
+
+def encode_cursor(last_id: str) -> str:
+    """Opaque keyset cursor pointing just past ``last_id``."""
+    return base64.urlsafe_b64encode(last_id.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: Optional[str]) -> Optional[str]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded, altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise InvalidCursorError("Invalid cursor")
@@ -0,0 +1,154 @@
+import asyncio
+import re
+import time
+import unicodedata
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Set
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.shipment import ShipmentModel
+
+# Alternative spellings that should resolve to the same canonical port key.
+PORT_ALIASES: Dict[str, str] = {
+    "la": "los angeles",
+    "l a": "los angeles",
+    "lax": "los angeles",
+    "lb": "long beach",
+    "ny": "new york",
+    "nyc": "new york",
+    "new york city": "new york",
+    "ny nj": "new york",
+    "new york new jersey": "new york",
+    "hk": "hong kong",
+    "sg": "singapore",
+    "klang": "port klang",
+    "antwerp bruges": "antwerp",
+    "antwerpen": "antwerp",
+    "hamburg harbour": "hamburg",
+    "rotterdam europoort": "rotterdam",
+    "ho chi minh": "ho chi minh city",
+    "saigon": "ho chi minh city",
+    "bombay": "mumbai",
+    "nhava sheva": "mumbai",
+    "jawaharlal nehru": "mumbai",
+}
+
+_PREFIXES = ("the port of ", "port of ", "harbour of ", "harbor of ")
+_SUFFIXES = (" port", " harbour", " harbor", " seaport")
+_PUNCTUATION = re.compile(r"[^\w\s]")
+# Separators in compound names such as "Ningbo-Zhoushan" or "New York/New Jersey"
+_COMPOUND_SEPARATORS = re.compile(r"\s*[-/&,]\s*")
+
+def normalize_port_name(name: str) -> str:
+    """Canonical port key: no diacritics, case-folded, prefixes and aliases resolved."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    key = "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+    key = " ".join(_PUNCTUATION.sub(" ", key).split())
+    for prefix in _PREFIXES:
+        if key.startswith(prefix):
+            key = key[len(prefix):]
+            break
+    for suffix in _SUFFIXES:
+        if key.endswith(suffix) and len(key) > len(suffix):
+            key = key[: -len(suffix)]
+            break
+    return PORT_ALIASES.get(key, key)
+
+def port_name_keys(name: str) -> Set[str]:
+    """Every canonical key a stored destination answers to: the whole name and each compound part."""
+    keys = {normalize_port_name(name)}
+    parts = _COMPOUND_SEPARATORS.split(name)
+    if len(parts) > 1:
+        keys.update(normalize_port_name(part) for part in parts if part.strip())
+    keys.discard("")
+    return keys
+
+class PortIndex:
+    """Maps canonical port keys to the raw destination_port values stored on shipments.
+
+    Lookups are a dict access; the resulting names feed an equality/IN query
+    that can use the b-tree index on shipments.destination_port. The index is
+    rebuilt from a SELECT DISTINCT every ``max_age_seconds``, and sooner when a
+    lookup misses, so writes from other workers or outside the ORM show up
+    without a restart. ORM writes in this process are tracked immediately.
+    """
+
+    def __init__(self, max_age_seconds: Optional[float] = None, miss_max_age_seconds: Optional[float] = None) -> None:
+        self.max_age_seconds = max_age_seconds if max_age_seconds is not None else settings.PORT_INDEX_REFRESH_SECONDS
+        self.miss_max_age_seconds = (
+            miss_max_age_seconds if miss_max_age_seconds is not None else settings.PORT_INDEX_MISS_REFRESH_SECONDS
+        )
+        self._names: Dict[str, Set[str]] = {}
+        self._refreshed_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._version = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._refreshed_at is not None
+
+    @property
+    def version(self) -> int:
+        """Bumped whenever the set of keys may have changed, for consumers that cache derived data."""
+        return self._version
+
+    def add(self, destination_port: str) -> None:
+        for key in port_name_keys(destination_port):
+            if key not in self._names:
+                self._version += 1
+            self._names.setdefault(key, set()).add(destination_port)
+
+    def add_many(self, destination_ports: Iterable[str]) -> None:
+        for destination_port in destination_ports:
+            self.add(destination_port)
+
+    def resolve(self, port_name: str) -> FrozenSet[str]:
+        return frozenset(self._names.get(normalize_port_name(port_name), ()))
+
+    def keys(self) -> FrozenSet[str]:
+        return frozenset(self._names)
+
+    def clear(self) -> None:
+        self._names = {}
+        self._refreshed_at = None
+        self._version += 1
+
+    def _is_stale(self, max_age: float) -> bool:
+        return self._refreshed_at is None or time.monotonic() - self._refreshed_at >= max_age
+
+    async def refresh(self, session: AsyncSession) -> None:
+        result = await session.execute(select(ShipmentModel.destination_port).distinct())
+        names: Dict[str, Set[str]] = {}
+        for destination_port in result.scalars().all():
+            for key in port_name_keys(destination_port):
+                names.setdefault(key, set()).add(destination_port)
+        # Swap in the rebuilt map so ports with no shipments left drop out too
+        self._names = names
+        self._refreshed_at = time.monotonic()
+        self._version += 1
+
+    async def ensure_fresh(self, session: AsyncSession, max_age: Optional[float] = None) -> None:
+        max_age = self.max_age_seconds if max_age is None else max_age
+        if not self._is_stale(max_age):
+            return
+        async with self._lock:
+            if self._is_stale(max_age):
+                await self.refresh(session)
+
+    async def lookup(self, session: AsyncSession, port_name: str) -> FrozenSet[str]:
+        await self.ensure_fresh(session)
+        names = self.resolve(port_name)
+        if not names:
+            # Another worker or a Core insert may have introduced this port since the last refresh
+            await self.ensure_fresh(session, self.miss_max_age_seconds)
+            names = self.resolve(port_name)
+        return names
+
+# Process-wide index shared by all repositories
+port_index = PortIndex()
+
+@event.listens_for(ShipmentModel, "after_insert")
+@event.listens_for(ShipmentModel, "after_update")
+def _track_destination_port(mapper: Any, connection: Any, target: ShipmentModel) -> None:
+    # Keep the index current for every ORM write, whichever session made it
+    port_index.add(target.destination_port)
@@ -0,0 +1,184 @@
+import csv
+import math
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.port import PortModel
+from app.repositories.port_index import normalize_port_name, port_name_keys
+
+EARTH_RADIUS_KM = 6371.0
+# Catalogue bundled with the app, used when PORT_CATALOGUE_PATH is unset
+DEFAULT_CATALOGUE_PATH = Path(__file__).resolve().parent.parent / "data" / "ports.csv"
+# Points per leaf, below which a linear scan beats further splitting
+_LEAF_SIZE = 16
+
+def unit_vectors(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Points on the unit sphere, where straight-line distance is monotonic in great-circle distance."""
+    lat, lon = np.radians(latitudes), np.radians(longitudes)
+    return np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+
+def great_circle_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    """Haversine distance between two (latitude, longitude) pairs."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (*a, *b))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+def chord_length(radius_km: float) -> float:
+    """Straight-line distance on the unit sphere spanning ``radius_km`` along the surface."""
+    angle = min(radius_km / EARTH_RADIUS_KM, math.pi)
+    return 2 * math.sin(angle / 2)
+
+class KDTree:
+    """A static k-d tree over the rows of ``points``, answering radius queries.
+
+    Each node splits its points at the median of their widest dimension, so
+    the tree is balanced and a query touches O(log n) nodes plus the leaves
+    its ball overlaps. Leaves are scanned with one vectorised distance.
+    """
+
+    def __init__(self, points: np.ndarray, leaf_size: int = _LEAF_SIZE):
+        self.points = np.asarray(points, dtype=float)
+        self.order = np.arange(len(self.points))
+        self._start: List[int] = []
+        self._end: List[int] = []
+        self._dim: List[int] = []
+        self._split: List[float] = []
+        self._left: List[int] = []
+        self._right: List[int] = []
+        if len(self.points):
+            self._build(leaf_size)
+
+    def _node(self, start: int, end: int) -> int:
+        # A leaf until _build splits it
+        self._start.append(start)
+        self._end.append(end)
+        self._dim.append(-1)
+        self._split.append(0.0)
+        self._left.append(-1)
+        self._right.append(-1)
+        return len(self._start) - 1
+
+    def _build(self, leaf_size: int) -> None:
+        pending = [self._node(0, len(self.points))]
+        while pending:
+            node = pending.pop()
+            start, end = self._start[node], self._end[node]
+            if end - start <= leaf_size:
+                continue
+            members = self.order[start:end]
+            block = self.points[members]
+            dim = int(np.argmax(block.max(axis=0) - block.min(axis=0)))
+            self.order[start:end] = members[np.argsort(block[:, dim], kind="stable")]
+            middle = (start + end) // 2
+            # Left holds coordinates <= split, right >= split
+            self._dim[node] = dim
+            self._split[node] = float(self.points[self.order[middle], dim])
+            self._left[node] = self._node(start, middle)
+            self._right[node] = self._node(middle, end)
+            pending += [self._left[node], self._right[node]]
+
+    def query_radius(self, center: np.ndarray, radius: float) -> List[int]:
+        """Row numbers of the points within ``radius`` of ``center``."""
+        if not self._start:
+            return []
+        found: List[int] = []
+        pending = [0]
+        while pending:
+            node = pending.pop()
+            if self._left[node] < 0:
+                members = self.order[self._start[node]:self._end[node]]
+                distances = np.linalg.norm(self.points[members] - center, axis=1)
+                found.extend(members[distances <= radius].tolist())
+                continue
+            offset = center[self._dim[node]] - self._split[node]
+            if offset <= radius:
+                pending.append(self._left[node])
+            if offset >= -radius:
+                pending.append(self._right[node])
+        return found
+
+class PortProximityIndex:
+    """Catalogue ports in a k-d tree, answering "which ports lie within R km of this one".
+
+    Ports answer to the same canonical keys as the port index, compound names
+    under each part too, so the keys returned here resolve straight to stored
+    destination_port values. A port missing from the catalogue, or a zero
+    radius, reaches only the port itself.
+    """
+
+    def __init__(self) -> None:
+        self._names: List[str] = []
+        self._row_by_key: Dict[str, int] = {}
+        self._tree: Optional[KDTree] = None
+
+    def load(self, ports: Iterable[Tuple[str, float, float]]) -> None:
+        names: List[str] = []
+        latitudes: List[float] = []
+        longitudes: List[float] = []
+        row_by_key: Dict[str, int] = {}
+        for name, latitude, longitude in ports:
+            for key in port_name_keys(name):
+                row_by_key.setdefault(key, len(names))
+            names.append(name)
+            latitudes.append(latitude)
+            longitudes.append(longitude)
+        # Swap in whole so concurrent readers see one catalogue or the other
+        self._tree = KDTree(unit_vectors(np.array(latitudes), np.array(longitudes)))
+        self._names, self._row_by_key = names, row_by_key
+
+    @property
+    def loaded(self) -> bool:
+        return self._tree is not None
+
+    async def refresh(self, session: AsyncSession) -> None:
+        result = await session.execute(select(PortModel.name, PortModel.latitude, PortModel.longitude))
+        self.load(result.tuples().all())
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def keys_within(self, port_name: str, radius_km: float) -> FrozenSet[str]:
+        """Canonical keys of the port and every catalogue port within ``radius_km`` of it."""
+        key = normalize_port_name(port_name)
+        row = self._row_by_key.get(key)
+        if not key or row is None or radius_km <= 0 or self._tree is None:
+            return frozenset({key} - {""})
+        keys = {key}
+        for found in self._tree.query_radius(self._tree.points[row], chord_length(radius_km)):
+            keys |= port_name_keys(self._names[found])
+        return frozenset(keys)
+
+def impact_radius_km(
+    event_type: Optional[str],
+    radii: Optional[Mapping[str, float]] = None,
+    default: Optional[float] = None,
+) -> float:
+    """How far from the reported port an event of this type reaches, by the largest matching entry."""
+    radii = radii if radii is not None else settings.EVENT_IMPACT_RADIUS_KM
+    default = default if default is not None else settings.EVENT_IMPACT_DEFAULT_RADIUS_KM
+    lowered = (event_type or "").casefold()
+    return max((radius for name, radius in radii.items() if name in lowered), default=default)
+
+def read_catalogue(path: Union[str, Path]) -> List[Dict[str, object]]:
+    with open(path, newline="", encoding="utf-8") as f:
+        return [
+            {"name": row["name"].strip(), "latitude": float(row["latitude"]), "longitude": float(row["longitude"])}
+            for row in csv.DictReader(f)
+        ]
+
+async def seed_ports(session: AsyncSession, path: Optional[Union[str, Path]] = None) -> int:
+    """Load the catalogue into an empty ports table; a populated table is left as it is."""
+    if (await session.execute(select(func.count()).select_from(PortModel))).scalar_one():
+        return 0
+    rows = read_catalogue(path or settings.PORT_CATALOGUE_PATH or DEFAULT_CATALOGUE_PATH)
+    if rows:
+        await session.execute(insert(PortModel), rows)
+        await session.commit()
+    return len(rows)
+
+# Process-wide index shared by the shipment repository and the disruption registry
+port_proximity = PortProximityIndex()
@@ -0,0 +1,124 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.port_risk_rollup import PortRiskRollupModel
+from app.repositories.port_index import normalize_port_name
+
+_COUNTERS = ("assessments", "disruptions", "shipments_at_risk")
+
+class RollupIncrement(NamedTuple):
+    port: str
+    bucket_start: datetime
+    assessments: int
+    disruptions: int
+    shipments_at_risk: int
+
+class PortTotals(NamedTuple):
+    port: str
+    assessments: int
+    disruptions: int
+    shipments_at_risk: int
+
+def hour_bucket(moment: datetime) -> datetime:
+    """The UTC hour containing ``moment``; naive values are taken as UTC."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+def rollup_increment(
+    detected_event: Mapping[str, Any], created_at: datetime, shipment_count: int
+) -> Optional[RollupIncrement]:
+    """What one assessment adds to the rollups; None when no port was identified."""
+    # Keyed by canonical port, so "Port of Rotterdam" and "ROTTERDAM" share one series
+    port = normalize_port_name(detected_event.get("target_port") or "")
+    if not port:
+        return None
+    disruptive = bool(detected_event.get("is_disruption"))
+    return RollupIncrement(
+        port=port,
+        bucket_start=hour_bucket(created_at),
+        assessments=1,
+        disruptions=int(disruptive),
+        shipments_at_risk=shipment_count if disruptive else 0,
+    )
+
+class RiskRollupRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def record(self, increments: Iterable[Optional[RollupIncrement]]) -> None:
+        """Add the increments to their hourly buckets inside the caller's transaction."""
+        merged: Dict[Tuple[str, datetime], List[int]] = {}
+        for increment in increments:
+            if increment is None:
+                continue
+            # Increments built from a raw port name (late shipment links) land on the canonical key too
+            totals = merged.setdefault((normalize_port_name(increment.port), increment.bucket_start), [0, 0, 0])
+            for i, column in enumerate(_COUNTERS):
+                totals[i] += getattr(increment, column)
+        if not merged:
+            return
+
+        # A fixed row order keeps concurrent transactions from deadlocking on hot buckets
+        rows = [
+            {"port": port, "bucket_start": bucket, **dict(zip(_COUNTERS, totals))}
+            for (port, bucket), totals in sorted(merged.items())
+        ]
+        table = PortRiskRollupModel.__table__
+        dialect = self.session.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            insert = pg_insert if dialect == "postgresql" else sqlite_insert
+            stmt = insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["port", "bucket_start"],
+                set_={column: table.c[column] + stmt.excluded[column] for column in _COUNTERS},
+            )
+            await self.session.execute(stmt, rows)
+            return
+
+        for row in rows:
+            result = await self.session.execute(
+                update(table)
+                .where(table.c.port == row["port"], table.c.bucket_start == row["bucket_start"])
+                .values({column: table.c[column] + row[column] for column in _COUNTERS})
+            )
+            if not result.rowcount:
+                await self.session.execute(table.insert().values(row))
+
+    async def get_buckets(
+        self, start: datetime, end: datetime, port: Optional[str] = None
+    ) -> List[RollupIncrement]:
+        """Hourly buckets starting in [start, end), oldest first; ``port`` may be any spelling of the port."""
+        stmt = select(
+            PortRiskRollupModel.port,
+            PortRiskRollupModel.bucket_start,
+            *(PortRiskRollupModel.__table__.c[column] for column in _COUNTERS),
+        ).where(PortRiskRollupModel.bucket_start >= start, PortRiskRollupModel.bucket_start < end)
+        if port is not None:
+            stmt = stmt.where(PortRiskRollupModel.port == normalize_port_name(port))
+        stmt = stmt.order_by(PortRiskRollupModel.bucket_start, PortRiskRollupModel.port)
+        result = await self.session.execute(stmt)
+        return [
+            RollupIncrement(port, hour_bucket(bucket), *counters)
+            for port, bucket, *counters in result.tuples()
+        ]
+
+    async def get_port_totals(self, start: datetime, end: datetime, limit: int) -> List[PortTotals]:
+        """Per-port totals over [start, end), most shipments at risk first."""
+        at_risk = func.sum(PortRiskRollupModel.shipments_at_risk)
+        stmt = (
+            select(
+                PortRiskRollupModel.port,
+                func.sum(PortRiskRollupModel.assessments),
+                func.sum(PortRiskRollupModel.disruptions),
+                at_risk,
+            )
+            .where(PortRiskRollupModel.bucket_start >= start, PortRiskRollupModel.bucket_start < end)
+            .group_by(PortRiskRollupModel.port)
+            .order_by(at_risk.desc(), PortRiskRollupModel.port)
+            .limit(limit)
+        )
+        return [PortTotals._make(row) for row in (await self.session.execute(stmt)).tuples()]
@@ -1,39 +1,271 @@
-from typing import Sequence
+import heapq
+import uuid
+from itertools import islice
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Set, Tuple
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, func, insert, literal, select
+from app.models.assessment_shipment import AssessmentShipmentModel
 from app.models.shipment import ShipmentModel
+from app.repositories.disruption_registry import DisruptionRegistry, OpenDisruption, disruption_registry
+from app.repositories.port_index import PortIndex, port_index
+from app.repositories.port_proximity import PortProximityIndex, port_proximity
+from app.repositories.rollup_repo import RiskRollupRepository, RollupIncrement, hour_bucket
+
+class ShipmentRow(NamedTuple):
+    """A shipment read as a plain row: no identity map, no attribute instrumentation."""
+    id: str
+    destination_port: str
+    goods_description: str
+
+# Columns selected for ShipmentRow, in field order
+_ROW_COLUMNS = (ShipmentModel.id, ShipmentModel.destination_port, ShipmentModel.goods_description)
+
+def upsert_statement(dialect: str) -> Any:
+    """INSERT into shipments where the last write for an id wins; a plain INSERT where upserts are unsupported."""
+    table = ShipmentModel.__table__
+    if dialect not in ("postgresql", "sqlite"):
+        return table.insert()
+    stmt = (pg_insert if dialect == "postgresql" else sqlite_insert)(table)
+    return stmt.on_conflict_do_update(
+        index_elements=["id"],
+        set_={"destination_port": stmt.excluded.destination_port, "goods_description": stmt.excluded.goods_description},
+    )
+
+def last_per_id(rows: Iterable[Mapping[str, str]]) -> List[Mapping[str, str]]:
+    """One row per shipment id, the last given winning.
+
+    PostgreSQL rejects an INSERT ... ON CONFLICT DO UPDATE that touches the
+    same row twice, so a batch must not repeat an id.
+    """
+    return list({row["id"]: row for row in rows}.values())
+
+class RegionImpact(NamedTuple):
+    """Shipments within one region: the stored destination names it covers, their total and the first page."""
+    names: FrozenSet[str]
+    count: int
+    first_page: List[ShipmentRow]
 
 class ShipmentRepository:
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        index: Optional[PortIndex] = None,
+        disruptions: Optional[DisruptionRegistry] = None,
+        proximity: Optional[PortProximityIndex] = None,
+    ):
         self.session = session
+        self.port_index = index or port_index
+        self.disruptions = disruptions if disruptions is not None else disruption_registry
+        self.proximity = proximity if proximity is not None else port_proximity
+
+    async def resolve_destination(self, port_name: str, radius_km: float = 0.0) -> FrozenSet[str]:
+        # "Port of Rotterdam", "ROTTERDAM" and "Rotterdam" all resolve to the same
+        # canonical key, which maps to the exact destination_port values on record.
+        names = await self.port_index.lookup(self.session, port_name)
+        if radius_km <= 0:
+            return names
+        # Neighbouring catalogue ports come from the k-d tree, then resolve like the port itself
+        nearby = set(names)
+        for key in self.proximity.keys_within(port_name, radius_km):
+            nearby |= self.port_index.resolve(key)
+        return frozenset(nearby)
 
     async def get_by_destination(self, port_name: str) -> Sequence[ShipmentModel]:
-        # Use ILIKE for case-insensitive partial matching
-        # If port_name is "Port of Rotterdam", we want to match "Rotterdam"
-        # If port_name is "Rotterdam", we want to match "Rotterdam"
-        # A simple approach is to check if the DB value is contained in the input OR input contained in DB value.
-        # But standard SQL ILIKE is usually pattern matching. 
-        # Let's try matching if the DB column appears in the provided name (e.g. 'Rotterdam' in 'Port of Rotterdam')
-        # OR if the provided name appears in the DB column (e.g. 'Shanghai' in 'Port of Shanghai')
-        # For simplicity and the specific "Port of X" issue, checking if the DB port is IN the extracted string is robust.
-        
-        # However, SQLAlchemy 'in_' expects a list. 
-        # Let's just stick to a simple ILIKE with wildcards around the input for now, 
-        # but actually, if the AI returns "Port of Rotterdam" and DB has "Rotterdam", 
-        # "Rotterdam" LIKE "%Port of Rotterdam%" is FALSE.
-        # "Port of Rotterdam" LIKE "%Rotterdam%" is TRUE.
-        
-        # So we actually want: match if ShipmentModel.destination_port is a substring of port_name
-        # OR match if port_name is a substring of ShipmentModel.destination_port
-        
-        # For this specific demo, let's relax it to:
-        stmt = select(ShipmentModel).where(ShipmentModel.destination_port.ilike(f"%{port_name}%") | (ShipmentModel.destination_port.in_([port_name.replace("Port of ", "")])) )
-        
-        # Actually, simpler logic:
-        # If the extracted text is "Port of Rotterdam", and we have "Rotterdam", strict equality fails.
-        # We can strip "Port of " from the input `port_name` before querying.
-        clean_port = port_name.replace("Port of ", "").strip()
-        stmt = select(ShipmentModel).where(ShipmentModel.destination_port.ilike(f"%{clean_port}%"))
+        names = await self.resolve_destination(port_name)
+        if not names:
+            return []
 
+        # Exact matches let the database use the index on destination_port
+        stmt = select(ShipmentModel).where(ShipmentModel.destination_port.in_(names))
         result = await self.session.execute(stmt)
         return result.scalars().all()
+
+    async def count_by_destination(self, port_name: str, radius_km: float = 0.0) -> int:
+        names = await self.resolve_destination(port_name, radius_km)
+        if not names:
+            return 0
+        stmt = select(func.count()).select_from(ShipmentModel).where(ShipmentModel.destination_port.in_(names))
+        return (await self.session.execute(stmt)).scalar_one()
+
+    async def get_page_by_destination(
+        self, port_name: str, limit: int, after: Optional[str] = None, radius_km: float = 0.0
+    ) -> List[ShipmentRow]:
+        """Up to ``limit`` shipments ordered by id, starting after the ``after`` id."""
+        names = await self.resolve_destination(port_name, radius_km)
+        if not names:
+            return []
+        # Keyset pagination: cost stays flat however deep the page, unlike OFFSET
+        stmt = select(*_ROW_COLUMNS).where(ShipmentModel.destination_port.in_(names))
+        if after is not None:
+            stmt = stmt.where(ShipmentModel.id > after)
+        result = await self.session.execute(stmt.order_by(ShipmentModel.id).limit(limit))
+        return [ShipmentRow._make(row) for row in result.tuples()]
+
+    async def get_impact_by_regions(
+        self, regions: Iterable[Tuple[str, float]], page_size: int
+    ) -> Dict[Tuple[str, float], RegionImpact]:
+        """Count and first page of the shipments within each (port, radius_km) region, two queries for all.
+
+        Only per-name counts and at most ``page_size`` rows per stored name are
+        read, however many shipments a hub port has.
+        """
+        names_by_region: Dict[Tuple[str, float], FrozenSet[str]] = {}
+        for port_name, radius_km in set(regions):
+            names_by_region[(port_name, radius_km)] = await self.resolve_destination(port_name, radius_km)
+        names: Set[str] = set().union(*names_by_region.values())
+
+        counts: Dict[str, int] = {}
+        if names:
+            stmt = (
+                select(ShipmentModel.destination_port, func.count())
+                .where(ShipmentModel.destination_port.in_(names))
+                .group_by(ShipmentModel.destination_port)
+            )
+            counts = dict((await self.session.execute(stmt)).tuples().all())
+
+        pages: Dict[str, List[ShipmentRow]] = {}
+        if counts:
+            # The first page_size ids of each stored name, which covers the first page of any region
+            position = func.row_number().over(partition_by=ShipmentModel.destination_port, order_by=ShipmentModel.id)
+            ranked = select(*_ROW_COLUMNS, position.label("position")).where(
+                ShipmentModel.destination_port.in_(counts)
+            ).subquery()
+            stmt = (
+                select(ranked.c.id, ranked.c.destination_port, ranked.c.goods_description)
+                .where(ranked.c.position <= page_size)
+                .order_by(ranked.c.id)
+            )
+            for row in (await self.session.execute(stmt)).tuples():
+                pages.setdefault(row.destination_port, []).append(ShipmentRow._make(row))
+
+        # A shipment has one stored name, so merging the names' pages never repeats a row
+        return {
+            region: RegionImpact(
+                region_names,
+                sum(counts.get(name, 0) for name in region_names),
+                list(islice(heapq.merge(*(pages.get(name, []) for name in region_names)), page_size)),
+            )
+            for region, region_names in names_by_region.items()
+        }
+
+    async def get_by_ids(self, shipment_ids: Iterable[str]) -> List[ShipmentRow]:
+        ids = list(shipment_ids)
+        if not ids:
+            return []
+        stmt = select(*_ROW_COLUMNS).where(ShipmentModel.id.in_(ids)).order_by(ShipmentModel.id)
+        result = await self.session.execute(stmt)
+        return [ShipmentRow._make(row) for row in result.tuples()]
+
+    async def link_destination(self, assessment_id: uuid.UUID, port_name: str, radius_km: float = 0.0) -> int:
+        """Record every shipment bound for the port, or within ``radius_km`` of it, as affected, without fetching them."""
+        names = await self.resolve_destination(port_name, radius_km)
+        if not names:
+            return 0
+        # INSERT ... SELECT keeps the ids on the database side
+        shipments = select(literal(assessment_id, AssessmentShipmentModel.assessment_id.type), ShipmentModel.id).where(
+            ShipmentModel.destination_port.in_(names)
+        )
+        stmt = insert(AssessmentShipmentModel).from_select(["assessment_id", "shipment_id"], shipments)
+        result = await self.session.execute(stmt)
+        return result.rowcount or 0
+
+    async def link_names(self, links: Iterable[Tuple[uuid.UUID, Iterable[str]]]) -> None:
+        """Link each assessment to every shipment bound for its stored names, without fetching them.
+
+        One INSERT ... SELECT per (assessment, name) pair, sent as a single executemany.
+        """
+        params = [
+            {"link_assessment_id": assessment_id, "link_destination_port": name}
+            for assessment_id, names in links
+            for name in names
+        ]
+        if not params:
+            return
+        shipments = select(
+            bindparam("link_assessment_id", type_=AssessmentShipmentModel.assessment_id.type), ShipmentModel.id
+        ).where(ShipmentModel.destination_port == bindparam("link_destination_port"))
+        # On the Core table: the ORM would treat a parameter list as a bulk INSERT ... VALUES
+        stmt = insert(AssessmentShipmentModel.__table__).from_select(["assessment_id", "shipment_id"], shipments)
+        await self.session.execute(stmt, params)
+
+    async def add_links(self, links: Iterable[Tuple[uuid.UUID, str]]) -> None:
+        rows = [{"assessment_id": assessment_id, "shipment_id": shipment_id} for assessment_id, shipment_id in links]
+        if rows:
+            # One executemany round trip for the whole set
+            await self.session.execute(insert(AssessmentShipmentModel), rows)
+
+    async def upsert(self, shipments: Sequence[Mapping[str, str]]) -> int:
+        """Insert or update shipments inside the caller's transaction.
+
+        Returns how many links to open disruptions the writes added.
+        """
+        rows = last_per_id({column: shipment[column] for column in ShipmentRow._fields} for shipment in shipments)
+        if not rows:
+            return 0
+        await self.session.execute(upsert_statement(self.session.get_bind().dialect.name), rows)
+        # Core writes fire no ORM events, so tell the port index directly
+        self.port_index.add_many({row["destination_port"] for row in rows})
+        return await self.link_open_disruptions(rows)
+
+    async def link_open_disruptions(self, shipments: Iterable[Mapping[str, str]]) -> int:
+        """Add written shipments to the impact set of every open disruption at their destination."""
+        await self.disruptions.ensure_fresh(self.session)
+        # Each shipment costs a dict lookup per port key
+        candidates: Dict[Tuple[uuid.UUID, str], OpenDisruption] = {}
+        missed: List[Mapping[str, str]] = []
+        for shipment in shipments:
+            matches = self.disruptions.match(shipment["destination_port"])
+            if not matches:
+                missed.append(shipment)
+            for disruption in matches:
+                candidates[(disruption.assessment_id, shipment["id"])] = disruption
+        if missed:
+            # Another worker may have opened a disruption at these ports since the registry's last reload
+            await self.disruptions.recheck(self.session, {shipment["destination_port"] for shipment in missed})
+            for shipment in missed:
+                for disruption in self.disruptions.match(shipment["destination_port"]):
+                    candidates[(disruption.assessment_id, shipment["id"])] = disruption
+        if not candidates:
+            return 0
+
+        # Updates re-send shipments the assessment may already cover
+        existing = select(AssessmentShipmentModel.assessment_id, AssessmentShipmentModel.shipment_id).where(
+            AssessmentShipmentModel.assessment_id.in_({assessment_id for assessment_id, _ in candidates}),
+            AssessmentShipmentModel.shipment_id.in_({shipment_id for _, shipment_id in candidates}),
+        )
+        for assessment_id, shipment_id in (await self.session.execute(existing)).tuples():
+            candidates.pop((assessment_id, shipment_id), None)
+        if not candidates:
+            return 0
+
+        await self.add_links(candidates)
+        # Late shipments count toward the hour their disruption was reported in
+        added: Dict[OpenDisruption, int] = {}
+        for disruption in candidates.values():
+            added[disruption] = added.get(disruption, 0) + 1
+        await RiskRollupRepository(self.session).record(
+            RollupIncrement(d.port, hour_bucket(d.opened_at), 0, 0, count) for d, count in added.items()
+        )
+        return len(candidates)
+
+    async def count_by_assessment(self, assessment_id: uuid.UUID) -> int:
+        stmt = select(func.count()).select_from(AssessmentShipmentModel).where(
+            AssessmentShipmentModel.assessment_id == assessment_id
+        )
+        return (await self.session.execute(stmt)).scalar_one()
+
+    async def get_page_by_assessment(
+        self, assessment_id: uuid.UUID, limit: int, after: Optional[str] = None
+    ) -> List[ShipmentRow]:
+        """Keyset page of the shipments an assessment affected, ordered by id."""
+        stmt = (
+            select(*_ROW_COLUMNS)
+            .join(AssessmentShipmentModel, AssessmentShipmentModel.shipment_id == ShipmentModel.id)
+            .where(AssessmentShipmentModel.assessment_id == assessment_id)
+        )
+        if after is not None:
+            stmt = stmt.where(AssessmentShipmentModel.shipment_id > after)
+        stmt = stmt.order_by(AssessmentShipmentModel.shipment_id).limit(limit)
+        return [ShipmentRow._make(row) for row in (await self.session.execute(stmt)).tuples()]
@@ -0,0 +1,21 @@
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict
+
+class PortRiskBucket(BaseModel):
+    """Assessment totals for one port over one time bucket."""
+    model_config = ConfigDict(from_attributes=True)
+
+    port: str
+    bucket_start: datetime
+    assessments: int
+    disruptions: int
+    shipments_at_risk: int
+
+class PortRiskTotal(BaseModel):
+    """Assessment totals for one port over the requested range."""
+    model_config = ConfigDict(from_attributes=True)
+
+    port: str
+    assessments: int
+    disruptions: int
+    shipments_at_risk: int
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict, Field
-from typing import List, Optional
+from typing import List, Literal, Optional
 from uuid import UUID
 from datetime import datetime
 from app.schemas.shipment import ShipmentSchema
@@ -36,5 +36,35 @@ class RiskAssessmentResponse(BaseModel):
     assessment_id: UUID
     created_at: datetime
     detected_event: DisruptionEvent
-    affected_shipments: List[ShipmentSchema]
+    affected_shipments: List[ShipmentSchema] = Field(..., description="First page of affected shipments, ordered by id.")
+    affected_shipment_count: int = 0
+    next_cursor: Optional[str] = Field(None, description="Pass to the shipments endpoint for the next page; None when complete.")
     mitigation_strategy: MitigationAdvice
+    extraction_path: Optional[str] = None
+    duplicate_similarity: Optional[float] = None
+    source_tokens: Optional[int] = None
+    condensed_tokens: Optional[int] = None
+
+class AssessmentSummary(BaseModel):
+    """An assessment without its affected shipments, for listings."""
+    model_config = ConfigDict(from_attributes=True)
+
+    assessment_id: UUID
+    created_at: datetime
+    detected_event: DisruptionEvent
+    mitigation_strategy: MitigationAdvice
+
+class BatchAssessmentRequest(BaseModel):
+    """Input payload for the batch API. Items are validated individually."""
+    news_texts: List[str] = Field(..., min_length=1, description="Raw news snippets to analyze.")
+
+class BatchAssessmentResult(BaseModel):
+    """Outcome for a single snippet of a batch or stream."""
+    index: int
+    status: Literal["ok", "error"]
+    assessment: Optional[RiskAssessmentResponse] = None
+    error: Optional[str] = None
+
+class BatchAssessmentResponse(BaseModel):
+    """Aggregate Response DTO for the batch API, one result per input snippet."""
+    results: List[BatchAssessmentResult]
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Literal, Optional
+from uuid import UUID
+from datetime import datetime
+from app.schemas.assessment import RiskAssessmentResponse
+
+class AssessmentJobResponse(BaseModel):
+    """Status of an asynchronous assessment; carries the assessment once it succeeds."""
+    model_config = ConfigDict(from_attributes=True)
+
+    job_id: UUID
+    status: Literal["queued", "running", "succeeded", "failed"]
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    assessment: Optional[RiskAssessmentResponse] = None
@@ -1,3 +1,4 @@
+from typing import List, Optional
 from pydantic import BaseModel, ConfigDict
 
 class ShipmentSchema(BaseModel):
@@ -7,3 +8,16 @@ class ShipmentSchema(BaseModel):
     id: str
     destination_port: str
     goods_description: str
+
+class ShipmentPage(BaseModel):
+    """One keyset page of shipments."""
+    items: List[ShipmentSchema]
+    next_cursor: Optional[str] = None
+
+class ShipmentImportReport(BaseModel):
+    """Outcome of a bulk shipment import."""
+    rows_written: int
+    rows_rejected: int
+    chunks: int
+    elapsed_seconds: float
+    rows_per_second: float
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Set
+
+from sqlalchemy import insert, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.metrics import ASSESSMENT_WRITE_BATCH_ROWS
+from app.models.active_disruption import ActiveDisruptionModel
+from app.models.assessment import RiskAssessmentModel
+from app.models.assessment_shipment import AssessmentShipmentModel
+from app.models.shipment import ShipmentModel
+from app.repositories.disruption_registry import (
+    DisruptionRegistry,
+    OpenDisruption,
+    disruption_registry,
+    disruption_row,
+)
+from app.repositories.rollup_repo import RiskRollupRepository, RollupIncrement
+
+logger = logging.getLogger(__name__)
+
+_ASSESSMENT_COLUMNS = tuple(column.key for column in RiskAssessmentModel.__table__.columns)
+
+class _Pending(NamedTuple):
+    row: Dict[str, Any]
+    # destination_port values whose shipments the assessment affects
+    ports: FrozenSet[str]
+    rollup: Optional[RollupIncrement]
+    disruption: Optional[OpenDisruption]
+    future: "asyncio.Future[None]"
+
+class AssessmentWriteCoalescer:
+    """Group commit for assessments written by concurrent requests.
+
+    Rows are buffered for up to ``max_delay_ms`` or until ``max_rows`` are
+    waiting, then written in one transaction: a multi-row INSERT for the
+    assessments, one INSERT ... SELECT for all of their shipment links, one
+    upsert of the merged rollup increments and one INSERT for the disruptions
+    they open. Each caller is released only once that transaction has committed.
+    Assessments must carry client-side ids and timestamps.
+    """
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        max_rows: Optional[int] = None,
+        max_delay_ms: Optional[float] = None,
+        disruptions: Optional[DisruptionRegistry] = None,
+    ):
+        self.sessionmaker = sessionmaker
+        self.disruptions = disruptions if disruptions is not None else disruption_registry
+        self.max_rows = max_rows or settings.WRITE_COALESCE_MAX_ROWS
+        self.max_delay = (max_delay_ms if max_delay_ms is not None else settings.WRITE_COALESCE_MAX_DELAY_MS) / 1000.0
+        self._pending: List[_Pending] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: Set[asyncio.Task[None]] = set()
+
+    async def write(
+        self,
+        assessment: RiskAssessmentModel,
+        destination_ports: FrozenSet[str] = frozenset(),
+        rollup: Optional[RollupIncrement] = None,
+        disruption: Optional[OpenDisruption] = None,
+    ) -> None:
+        """Persist the assessment, link it to every shipment bound for ``destination_ports``,
+        apply its rollup and open its disruption."""
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        row = {key: getattr(assessment, key) for key in _ASSESSMENT_COLUMNS}
+        self._pending.append(_Pending(row, destination_ports, rollup, disruption, future))
+        if len(self._pending) >= self.max_rows:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush)
+        # A cancelled caller must not cancel the write its row is already part of
+        await asyncio.shield(future)
+
+    async def aclose(self) -> None:
+        """Flush anything still buffered and wait for in-flight writes."""
+        self._flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._write_batch(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _write_batch(self, batch: List[_Pending]) -> None:
+        ASSESSMENT_WRITE_BATCH_ROWS.observe(len(batch))
+        try:
+            async with self.sessionmaker() as session:
+                # insertmanyvalues turns this into multi-row INSERT statements
+                await session.execute(insert(RiskAssessmentModel), [pending.row for pending in batch])
+                links = [
+                    select(
+                        literal(pending.row["assessment_id"], AssessmentShipmentModel.assessment_id.type),
+                        ShipmentModel.id,
+                    ).where(ShipmentModel.destination_port.in_(pending.ports))
+                    for pending in batch
+                    if pending.ports
+                ]
+                if links:
+                    await session.execute(
+                        insert(AssessmentShipmentModel).from_select(
+                            ["assessment_id", "shipment_id"], union_all(*links) if len(links) > 1 else links[0]
+                        )
+                    )
+                await RiskRollupRepository(session).record(pending.rollup for pending in batch)
+                disruptions = [pending.disruption for pending in batch if pending.disruption is not None]
+                if disruptions:
+                    await session.execute(insert(ActiveDisruptionModel), [disruption_row(d) for d in disruptions])
+                await session.commit()
+        except Exception as e:
+            logger.error(f"Group commit of {len(batch)} assessments failed: {e}")
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+        else:
+            for disruption in disruptions:
+                self.disruptions.add(disruption)
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_result(None)
@@ -0,0 +1,319 @@
+import json
+import logging
+import re
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.core.config import settings
+from app.repositories.port_index import PORT_ALIASES, PortIndex, normalize_port_name, port_index, port_name_keys
+from app.schemas.assessment import DisruptionEvent
+from app.services.extraction_service import EventExtractor
+from app.services.extraction_trace import EXTRACTION_PATH_DISTILLED, record_extraction_path
+from app.services.near_duplicate import fold_text
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+_HASH_BITS = 18
+# Aliases this short ("la", "sg") are too ambiguous to tag in free text
+_MIN_ALIAS_LENGTH = 4
+# Stands in for a port name in the features, so the event is learned apart from where it happened
+_PORT_TOKEN = "<port>"
+
+# (event_type, is_disruption)
+EventClass = Tuple[str, bool]
+
+def snippet_words(text: str) -> List[str]:
+    return _WORD.findall(fold_text(text))
+
+def hashed_features(words: Sequence[str], hash_bits: int) -> np.ndarray:
+    """Distinct slots of the snippet's unigrams and bigrams.
+
+    crc32 rather than hash(): the slots are saved with the model, and str
+    hashing changes between processes.
+    """
+    grams = list(words) + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    mask = (1 << hash_bits) - 1
+    return np.unique(np.fromiter((zlib.crc32(g.encode()) & mask for g in grams), dtype=np.int64, count=len(grams)))
+
+class Prediction(NamedTuple):
+    event: DisruptionEvent
+    # Probability of the predicted event class
+    confidence: float
+    # Distinct ports mentioned; the model only picks one confidently when there is exactly one
+    ports_found: int
+
+class PortTagger:
+    """Finds the port a snippet is about by matching its n-grams against known port keys."""
+
+    def __init__(self, ports: Dict[str, str]):
+        # Canonical key -> the name to report, as the extractor spelled it
+        self.ports = dict(ports)
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        surfaces = {key: key for key in self.ports}
+        for alias, key in PORT_ALIASES.items():
+            if key in self.ports and len(alias) >= _MIN_ALIAS_LENGTH:
+                surfaces.setdefault(alias, key)
+        self._surfaces = surfaces
+        self._max_words = max((len(s.split()) for s in surfaces), default=1)
+
+    def add(self, names: Iterable[str]) -> None:
+        added = False
+        for name in names:
+            for key in port_name_keys(name):
+                if key not in self.ports:
+                    self.ports[key] = name
+                    added = True
+        if added:
+            self._rebuild()
+
+    def tag(self, words: Sequence[str]) -> Tuple[Optional[str], int, List[str]]:
+        """The first-mentioned port (longest name wins at a position), how many distinct ports
+        appear, and the words with each port name replaced by a placeholder."""
+        found: List[str] = []
+        masked: List[str] = []
+        i = 0
+        while i < len(words):
+            for n in range(min(self._max_words, len(words) - i), 0, -1):
+                key = self._surfaces.get(" ".join(words[i:i + n]))
+                if key is not None:
+                    if key not in found:
+                        found.append(key)
+                    masked.append(_PORT_TOKEN)
+                    i += n
+                    break
+            else:
+                masked.append(words[i])
+                i += 1
+        return (self.ports[found[0]] if found else None), len(found), masked
+
+class DistilledModel:
+    """A hashed n-gram softmax classifier for the event, plus gazetteer tagging for the port.
+
+    Fitted on snippets the extraction model already labelled, so it reproduces
+    that model's answers for the kinds of news it has seen often. Each class
+    is an (event_type, is_disruption) pair; the port is not learned but looked
+    up, since it is whichever known port the snippet names.
+    """
+
+    def __init__(
+        self,
+        weights: np.ndarray,
+        bias: np.ndarray,
+        classes: Sequence[EventClass],
+        ports: Dict[str, str],
+        hash_bits: int = _HASH_BITS,
+    ):
+        self.weights = weights
+        self.bias = bias
+        self.classes = [tuple(c) for c in classes]
+        self.hash_bits = hash_bits
+        self.tagger = PortTagger(ports)
+
+    @classmethod
+    def fit(
+        cls,
+        samples: Iterable[Tuple[str, DisruptionEvent]],
+        hash_bits: int = _HASH_BITS,
+        epochs: int = 100,
+        learning_rate: float = 0.5,
+        l2: float = 1e-4,
+        min_class_count: int = 5,
+    ) -> "DistilledModel":
+        """Full-batch gradient descent on the cross-entropy of the labelled snippets.
+
+        Classes seen fewer than ``min_class_count`` times are left out; the
+        model never predicts them, so such snippets go to the fallback.
+        """
+        samples = list(samples)
+        counts = Counter((e.event_type, e.is_disruption) for _, e in samples)
+        classes: List[EventClass] = sorted(c for c, n in counts.items() if n >= min_class_count)
+        class_ids = {c: i for i, c in enumerate(classes)}
+
+        spellings: Dict[str, Counter] = {}
+        for _, event in samples:
+            if event.target_port:
+                for key in port_name_keys(event.target_port):
+                    spellings.setdefault(key, Counter())[event.target_port] += 1
+        ports = {key: names.most_common(1)[0][0] for key, names in spellings.items()}
+        tagger = PortTagger(ports)
+
+        rows: List[np.ndarray] = []
+        labels: List[int] = []
+        for text, event in samples:
+            label = class_ids.get((event.event_type, event.is_disruption))
+            if label is not None:
+                rows.append(hashed_features(tagger.tag(snippet_words(text))[2], hash_bits))
+                labels.append(label)
+
+        weights = np.zeros((1 << hash_bits, len(classes)), dtype=np.float32)
+        bias = np.zeros(len(classes), dtype=np.float32)
+        if not rows:
+            return cls(weights, bias, classes, ports, hash_bits)
+
+        # CSR layout over the slots the corpus uses: row r's features are
+        # columns[indptr[r]:indptr[r + 1]], each valued 1/sqrt(number of features)
+        lengths = np.array([len(r) for r in rows])
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        used, columns = np.unique(np.concatenate(rows), return_inverse=True)
+        values = np.repeat(1.0 / np.sqrt(np.maximum(lengths, 1)), lengths)[:, None]
+        starts = indptr[:-1][lengths > 0]
+        targets = np.zeros((len(rows), len(classes)))
+        targets[np.arange(len(rows)), labels] = 1.0
+
+        # Adagrad: rare n-grams keep large steps while common ones settle
+        dense = np.zeros((len(used), len(classes)))
+        dense_bias = np.zeros(len(classes))
+        squared = np.full_like(dense, 1e-8)
+        squared_bias = np.full_like(dense_bias, 1e-8)
+        for _ in range(epochs):
+            logits = np.zeros((len(rows), len(classes)))
+            logits[lengths > 0] = np.add.reduceat(dense[columns] * values, starts, axis=0)
+            error = (_softmax(logits + dense_bias) - targets) / len(rows)
+            per_entry = np.repeat(error, lengths, axis=0) * values
+            gradient = np.stack(
+                [np.bincount(columns, weights=per_entry[:, c], minlength=len(used)) for c in range(len(classes))],
+                axis=1,
+            ) + l2 * dense
+            squared += gradient ** 2
+            dense -= learning_rate * gradient / np.sqrt(squared)
+            bias_gradient = error.sum(axis=0)
+            squared_bias += bias_gradient ** 2
+            dense_bias -= learning_rate * bias_gradient / np.sqrt(squared_bias)
+
+        weights[used] = dense
+        bias[:] = dense_bias
+        return cls(weights, bias, classes, ports, hash_bits)
+
+    def predict(self, text: str) -> Prediction:
+        target_port, ports_found, words = self.tagger.tag(snippet_words(text))
+        if not self.classes:
+            event = DisruptionEvent(target_port=target_port, event_type="Other", is_disruption=False, confidence_score=0.0)
+            return Prediction(event, 0.0, ports_found)
+
+        slots = hashed_features(words, self.hash_bits)
+        logits = self.bias.copy()
+        if len(slots):
+            logits += self.weights[slots].sum(axis=0) / np.sqrt(len(slots))
+        probs = _softmax(logits[None, :])[0]
+        best = int(probs.argmax())
+        confidence = float(probs[best])
+        event_type, is_disruption = self.classes[best]
+        event = DisruptionEvent(
+            target_port=target_port,
+            event_type=event_type,
+            is_disruption=is_disruption,
+            confidence_score=round(confidence, 3),
+        )
+        return Prediction(event, confidence, ports_found)
+
+    def save(self, path: Union[str, Path]) -> None:
+        meta = {"classes": self.classes, "ports": self.tagger.ports, "hash_bits": self.hash_bits}
+        # Most hashed slots are never hit; store only the rows that carry weight
+        used = np.flatnonzero(np.any(self.weights != 0, axis=1))
+        with open(path, "wb") as f:
+            np.savez_compressed(f, slots=used, rows=self.weights[used], bias=self.bias, meta=np.array(json.dumps(meta)))
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "DistilledModel":
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            weights = np.zeros((1 << meta["hash_bits"], len(meta["classes"])), dtype=np.float32)
+            weights[data["slots"]] = data["rows"]
+            return cls(weights, data["bias"], meta["classes"], meta["ports"], meta["hash_bits"])
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return shifted / shifted.sum(axis=1, keepdims=True)
+
+@dataclass
+class DistillationEvaluation:
+    """How the model would have done on snippets whose extraction is known, at a confidence threshold."""
+    min_confidence: float
+    samples: int = 0
+    answered: int = 0
+    answered_correct: int = 0
+
+    @property
+    def coverage(self) -> float:
+        """Share of snippets the model would answer without the fallback."""
+        return self.answered / self.samples if self.samples else 0.0
+
+    @property
+    def accuracy(self) -> float:
+        """Share of its own answers that agree with the extraction model."""
+        return self.answered_correct / self.answered if self.answered else 1.0
+
+def agrees(predicted: DisruptionEvent, expected: DisruptionEvent) -> bool:
+    return (
+        predicted.event_type == expected.event_type
+        and predicted.is_disruption == expected.is_disruption
+        and normalize_port_name(predicted.target_port or "") == normalize_port_name(expected.target_port or "")
+    )
+
+def answers_locally(prediction: Prediction, min_confidence: float) -> bool:
+    # A disruption is only actionable with exactly one port to attach it to
+    if prediction.event.is_disruption and prediction.ports_found != 1:
+        return False
+    return prediction.confidence >= min_confidence
+
+def evaluate_model(
+    model: DistilledModel, min_confidence: float, samples: Iterable[Tuple[str, DisruptionEvent]]
+) -> DistillationEvaluation:
+    evaluation = DistillationEvaluation(min_confidence=min_confidence)
+    for text, expected in samples:
+        evaluation.samples += 1
+        prediction = model.predict(text)
+        if answers_locally(prediction, min_confidence):
+            evaluation.answered += 1
+            evaluation.answered_correct += agrees(prediction.event, expected)
+    return evaluation
+
+class DistilledExtractionService:
+    """Answers from the distilled model when it is confident, otherwise from the wrapped extractor.
+
+    Ports that shipments are booked to join the model's gazetteer as the port
+    index learns them, so a port absent from the training data can still be
+    tagged.
+    """
+
+    def __init__(
+        self,
+        model: DistilledModel,
+        fallback: EventExtractor,
+        min_confidence: Optional[float] = None,
+        index: Optional[PortIndex] = None,
+    ):
+        self.model = model
+        self.fallback = fallback
+        self.min_confidence = min_confidence if min_confidence is not None else settings.DISTILLED_MIN_CONFIDENCE
+        self.index = index if index is not None else port_index
+        self._index_version: Optional[int] = None
+
+    async def parse_snippet(self, text: str) -> DisruptionEvent:
+        if self._index_version != self.index.version:
+            self._index_version = self.index.version
+            self.model.tagger.add(name for key in self.index.keys() for name in self.index.resolve(key))
+
+        prediction = self.model.predict(text)
+        if answers_locally(prediction, self.min_confidence):
+            record_extraction_path(EXTRACTION_PATH_DISTILLED)
+            return prediction.event
+        return await self.fallback.parse_snippet(text)
+
+def load_distilled_model(path: Optional[str] = None) -> Optional[DistilledModel]:
+    """The model at ``path`` (default DISTILLED_MODEL_PATH), or None if none is configured or trained yet."""
+    path = path if path is not None else settings.DISTILLED_MODEL_PATH
+    if not path:
+        return None
+    if not Path(path).exists():
+        logger.warning("No distilled model at %s; every snippet goes to the extraction backend", path)
+        return None
+    return DistilledModel.load(path)
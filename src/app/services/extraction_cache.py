@@ -0,0 +1,174 @@
+import hashlib
+import logging
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.metrics import EXTRACTION_CACHE_LOOKUPS_TOTAL, EXTRACTION_CACHE_REMOVALS_TOTAL
+from app.models.extraction_cache import ExtractionCacheEntryModel
+from app.schemas.assessment import DisruptionEvent
+from app.services.extraction_service import EventExtractor
+from app.services.extraction_trace import EXTRACTION_PATH_CACHE, EXTRACTION_PATH_SHARED_CACHE, record_extraction_path
+
+def normalize_snippet(text: str) -> str:
+    """Canonical form of a snippet: NFKC, case-folded, whitespace collapsed."""
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+def extraction_cache_key(text: str, model: Optional[str] = None, prompt: Optional[str] = None) -> str:
+    # The model and prompt are part of the key so that changing either
+    # naturally invalidates everything extracted under the old configuration.
+    material = "\x1f".join([
+        model or settings.EXTRACTION_MODEL,
+        prompt or settings.EXTRACTION_PROMPT,
+        normalize_snippet(text),
+    ])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+@dataclass
+class CacheStats:
+    # hits/misses describe the in-process tier; shared_hits are misses answered by the shared tier
+    hits: int = 0
+    misses: int = 0
+    shared_hits: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+class ExtractionCache:
+    """In-process LRU tier with TTL and size-based eviction."""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries if max_entries is not None else settings.EXTRACTION_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.EXTRACTION_CACHE_TTL_SECONDS
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, Tuple[float, DisruptionEvent]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[DisruptionEvent]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            EXTRACTION_CACHE_LOOKUPS_TOTAL.inc(result="miss")
+            return None
+        expires_at, event = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            EXTRACTION_CACHE_REMOVALS_TOTAL.inc(reason="expired")
+            EXTRACTION_CACHE_LOOKUPS_TOTAL.inc(result="miss")
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        EXTRACTION_CACHE_LOOKUPS_TOTAL.inc(result="hit")
+        return event
+
+    def set(self, key: str, event: DisruptionEvent) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, event)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+            EXTRACTION_CACHE_REMOVALS_TOTAL.inc(reason="evicted")
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+class DatabaseCacheTier:
+    """Shared tier stored in the application database so all workers benefit."""
+
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession], ttl_seconds: Optional[float] = None):
+        self.sessionmaker = sessionmaker
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.EXTRACTION_CACHE_TTL_SECONDS
+
+    async def get(self, key: str) -> Optional[DisruptionEvent]:
+        async with self.sessionmaker() as session:
+            entry = await session.get(ExtractionCacheEntryModel, key)
+            if entry is None:
+                return None
+            expires_at = entry.expires_at
+            # SQLite hands back naive datetimes; everything we write is UTC.
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            if expires_at <= datetime.now(timezone.utc):
+                await session.delete(entry)
+                await session.commit()
+                return None
+            return DisruptionEvent.model_validate(entry.event)
+
+    async def set(self, key: str, event: DisruptionEvent) -> None:
+        now = datetime.now(timezone.utc)
+        async with self.sessionmaker() as session:
+            await session.merge(ExtractionCacheEntryModel(
+                cache_key=key,
+                event=event.model_dump(),
+                created_at=now,
+                expires_at=now + timedelta(seconds=self.ttl_seconds),
+            ))
+            await session.commit()
+
+    async def prune(self) -> int:
+        async with self.sessionmaker() as session:
+            result = await session.execute(
+                delete(ExtractionCacheEntryModel).where(
+                    ExtractionCacheEntryModel.expires_at <= datetime.now(timezone.utc)
+                )
+            )
+            await session.commit()
+            return result.rowcount or 0
+
+class CachedExtractionService:
+    """Wraps an extractor so repeated snippets are answered from cache."""
+
+    def __init__(
+        self,
+        extractor: EventExtractor,
+        cache: ExtractionCache,
+        shared: Optional[DatabaseCacheTier] = None,
+    ):
+        self.extractor = extractor
+        self.cache = cache
+        self.shared = shared
+
+    async def parse_snippet(self, text: str) -> DisruptionEvent:
+        key = extraction_cache_key(text)
+
+        event = self.cache.get(key)
+        if event is not None:
+            record_extraction_path(EXTRACTION_PATH_CACHE)
+            return event
+
+        if self.shared is not None:
+            try:
+                event = await self.shared.get(key)
+            except Exception as e:
+                # The shared tier is an optimisation; never fail a request over it.
+                logging.warning(f"Shared extraction cache read failed: {e}")
+            if event is not None:
+                self.cache.stats.shared_hits += 1
+                EXTRACTION_CACHE_LOOKUPS_TOTAL.inc(result="shared_hit")
+                self.cache.set(key, event)
+                record_extraction_path(EXTRACTION_PATH_SHARED_CACHE)
+                return event
+
+        event = await self.extractor.parse_snippet(text)
+        self.cache.set(key, event)
+
+        if self.shared is not None:
+            try:
+                await self.shared.set(key, event)
+            except Exception as e:
+                logging.warning(f"Shared extraction cache write failed: {e}")
+
+        return event
+
+# Process-wide in-memory tier, shared by every request handled by this worker.
+extraction_cache = ExtractionCache()
@@ -0,0 +1,42 @@
+from app.core.config import settings
+from app.db.session import db
+from app.services.distilled_model import DistilledExtractionService, load_distilled_model
+from app.services.extraction_cache import CachedExtractionService, DatabaseCacheTier, extraction_cache
+from app.services.extraction_service import BatchEventExtractor, EventExtractor
+from app.services.micro_batch import MicroBatchingExtractionService
+from app.services.near_duplicate import NearDuplicateExtractionService, near_duplicate_index
+from app.services.relevance_filter import RelevanceFilterExtractionService, relevance_scorer
+from app.services.resilience import ResilientExtractionService
+from app.services.single_flight import SingleFlightExtractionService
+from app.services.snippet_condenser import CondensingExtractionService, SnippetCondenser
+
+def build_extraction_service(backend: BatchEventExtractor) -> EventExtractor:
+    """Wrap the process-wide extraction backend in the configured layers."""
+    guarded: BatchEventExtractor = backend
+    # Innermost: only calls that actually reach the backend are limited, hedged and counted
+    if settings.EXTRACTION_RESILIENCE_ENABLED:
+        guarded = ResilientExtractionService(backend)
+    extractor: EventExtractor = guarded
+    # Outside the resilience layer, so a packed request takes one concurrency slot and one breaker outcome
+    if settings.EXTRACTION_BATCH_MAX_ITEMS > 1:
+        extractor = MicroBatchingExtractionService(guarded)
+    # Outside the resilience layer: local answers are neither limited nor counted as backend calls
+    distilled = load_distilled_model()
+    if distilled is not None:
+        extractor = DistilledExtractionService(distilled, extractor)
+    # Exact-match cache sits outside the near-duplicate tier: cheapest check first
+    if settings.NEAR_DUPLICATE_ENABLED:
+        extractor = NearDuplicateExtractionService(extractor, near_duplicate_index)
+    if settings.EXTRACTION_CACHE_ENABLED:
+        shared = DatabaseCacheTier(db.sessionmaker) if settings.EXTRACTION_CACHE_SHARED else None
+        extractor = CachedExtractionService(extractor, extraction_cache, shared)
+    # Outside the cache so a burst of identical misses makes one call between them
+    if settings.SINGLE_FLIGHT_ENABLED:
+        extractor = SingleFlightExtractionService(extractor)
+    # The pre-filter runs first: it needs no hashing, lookup or I/O
+    if settings.RELEVANCE_FILTER_ENABLED:
+        extractor = RelevanceFilterExtractionService(extractor, relevance_scorer)
+    # Outermost, so every layer (and the cache keys) works on the cleaned-up text
+    if settings.SNIPPET_CONDENSER_ENABLED:
+        extractor = CondensingExtractionService(extractor, SnippetCondenser())
+    return extractor
@@ -1,41 +1,101 @@
-from google import genai
-from google.genai import types
+import asyncio
+import importlib
+from typing import Any, Dict, Optional, Protocol, Sequence
 from app.schemas.assessment import DisruptionEvent
 from app.core.config import settings
-import logging
-
-from typing import Optional, cast
 
 class ExtractionError(Exception):
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        # HTTP status the backend answered with, when it answered at all
+        self.status_code = status_code
+
+    @property
+    def overloaded(self) -> bool:
+        """The backend shed the call or failed on its side (429 or 5xx)."""
+        return self.status_code is not None and (self.status_code == 429 or self.status_code >= 500)
+
+    @property
+    def backend_fault(self) -> bool:
+        """Overload, or no usable answer at all; a 4xx rejection means the backend is healthy."""
+        return self.status_code is None or self.overloaded
+
+class ExtractionTimeout(ExtractionError):
     pass
 
-class IntelligentExtractionService:
-    def __init__(self, project: Optional[str] = None, location: Optional[str] = None):
-        self.project = project or settings.GOOGLE_CLOUD_PROJECT
-        self.location = location or settings.GOOGLE_CLOUD_LOCATION
-        self.client = genai.Client(vertexai=True, project=self.project, location=self.location)
+class ExtractionUnavailable(ExtractionError):
+    """Refused without calling the backend because its circuit breaker is open."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class EventExtractor(Protocol):
+    """Anything that can turn a news snippet into a DisruptionEvent."""
+
+    async def parse_snippet(self, text: str) -> DisruptionEvent: ...
+
+class BatchEventExtractor(EventExtractor, Protocol):
+    async def parse_snippets(self, texts: Sequence[str]) -> Dict[int, DisruptionEvent]:
+        """Extract several snippets in one request, keyed by position.
+
+        Snippets the answer left out or got wrong are simply missing; only a
+        failure of the request itself raises.
+        """
+        ...
+
+class ExtractionBackend(BatchEventExtractor, Protocol):
+    async def aclose(self) -> None: ...
+
+# Backends selectable with EXTRACTION_BACKEND, as "module:class". Importing one is
+# deferred to first use: the Vertex AI SDK alone costs about a second of import time.
+EXTRACTION_BACKENDS: Dict[str, str] = {
+    "vertex": "app.services.gemini_extraction_service:IntelligentExtractionService",
+    "fake": "app.services.fake_extraction_service:FakeExtractionService",
+}
+
+def load_backend_class(name: str) -> Any:
+    try:
+        module_name, _, class_name = EXTRACTION_BACKENDS[name].partition(":")
+    except KeyError:
+        raise ValueError(f"Unknown extraction backend '{name}'") from None
+    return getattr(importlib.import_module(module_name), class_name)
+
+class LazyExtractionBackend:
+    """The configured backend, imported and built on the first extraction.
+
+    The import runs in a worker thread so the event loop keeps serving while
+    a heavy SDK loads. Call ``load`` to warm it up ahead of traffic.
+    """
+
+    def __init__(self, name: Optional[str] = None, **options: Any):
+        self.name = name or settings.EXTRACTION_BACKEND
+        self.options = options
+        self._backend: Optional[ExtractionBackend] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._backend is not None
+
+    async def load(self) -> ExtractionBackend:
+        if self._backend is None:
+            async with self._lock:
+                if self._backend is None:
+                    backend_class = await asyncio.to_thread(load_backend_class, self.name)
+                    self._backend = backend_class(**self.options)
+        assert self._backend is not None
+        return self._backend
 
     async def parse_snippet(self, text: str) -> DisruptionEvent:
-        try:
-            # Using Gemini 2.5 Flash as it is reliable and fast for this.
-            response = await self.client.aio.models.generate_content(
-                model="gemini-2.5-flash",
-                contents=settings.EXTRACTION_PROMPT.format(text=text),
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json",
-                    response_schema=DisruptionEvent
-                )
-            )
-            
-            if response.parsed:
-                 return cast(DisruptionEvent, response.parsed)
-            
-            # Fallback validation if parsed is not populated (though it should be)
-            if response.text:
-                return DisruptionEvent.model_validate_json(response.text)
-                
-            raise ExtractionError("Empty response from AI")
-
-        except Exception as e:
-            logging.error(f"AI Extraction failed: {e}")
-            raise ExtractionError(f"AI Extraction failed: {str(e)}")
+        backend = self._backend or await self.load()
+        return await backend.parse_snippet(text)
+
+    async def parse_snippets(self, texts: Sequence[str]) -> Dict[int, DisruptionEvent]:
+        backend = self._backend or await self.load()
+        return await backend.parse_snippets(texts)
+
+    async def aclose(self) -> None:
+        # Nothing to close if no extraction ever ran
+        if self._backend is not None:
+            await self._backend.aclose()
@@ -0,0 +1,41 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+# Which layer produced an extraction
+EXTRACTION_PATH_MODEL = "model"
+EXTRACTION_PATH_CACHE = "cache"
+EXTRACTION_PATH_SHARED_CACHE = "shared_cache"
+EXTRACTION_PATH_NEAR_DUPLICATE = "near_duplicate"
+EXTRACTION_PATH_PREFILTER = "prefilter"
+EXTRACTION_PATH_COALESCED = "coalesced"
+EXTRACTION_PATH_DISTILLED = "distilled"
+
+@dataclass
+class ExtractionTrace:
+    """Provenance of one extraction, filled in by whichever layers handled it."""
+    path: str = EXTRACTION_PATH_MODEL
+    duplicate_similarity: Optional[float] = None
+    # Estimated tokens of the snippet as submitted and as sent on for extraction
+    source_tokens: Optional[int] = None
+    condensed_tokens: Optional[int] = None
+
+_current_trace: ContextVar[Optional[ExtractionTrace]] = ContextVar("extraction_trace", default=None)
+
+@contextmanager
+def trace_extraction() -> Iterator[ExtractionTrace]:
+    trace = ExtractionTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+def current_trace() -> Optional[ExtractionTrace]:
+    return _current_trace.get()
+
+def record_extraction_path(path: str) -> None:
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.path = path
@@ -0,0 +1,130 @@
+import asyncio
+import math
+import random
+import re
+from typing import Dict, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.repositories.port_index import normalize_port_name
+from app.schemas.assessment import DisruptionEvent
+from app.services.extraction_service import ExtractionError
+from app.services.near_duplicate import fold_text
+
+# Major container ports, busiest first; the seed data and the benchmark generator draw from these
+KNOWN_PORTS: Tuple[str, ...] = (
+    "Shanghai", "Singapore", "Ningbo-Zhoushan", "Shenzhen", "Qingdao", "Guangzhou", "Busan", "Tianjin",
+    "Hong Kong", "Rotterdam", "Dubai", "Port Klang", "Xiamen", "Antwerp", "Tanjung Pelepas", "Kaohsiung",
+    "Dalian", "Los Angeles", "Hamburg", "Long Beach", "Ho Chi Minh City", "New York/New Jersey",
+    "Laem Chabang", "Colombo", "Mumbai", "Jeddah", "Tanger Med", "Valencia", "Piraeus", "Savannah",
+)
+
+# First matching keyword decides the event type
+_EVENT_KEYWORDS: Tuple[Tuple[str, str, bool], ...] = (
+    ("strike", "Strike", True),
+    ("walkout", "Strike", True),
+    ("typhoon", "Weather", True),
+    ("hurricane", "Weather", True),
+    ("storm", "Weather", True),
+    ("fog", "Weather", True),
+    ("congestion", "Congestion", True),
+    ("closure", "Closure", True),
+    ("closed", "Closure", True),
+    ("fire", "Accident", True),
+    ("collision", "Accident", True),
+    ("cyberattack", "Cyberattack", True),
+    ("record", "Operations", False),
+    ("expands", "Operations", False),
+    ("opens", "Operations", False),
+)
+
+_WORD = re.compile(r"\w+")
+
+class FakeExtractionService:
+    """Deterministic offline stand-in for the Gemini extractor, for load tests and benchmarks.
+
+    The event comes from a keyword and port-name scan, and failures are drawn
+    from a generator seeded by the snippet, so the same snippet always gets the
+    same event and outcome. Latency is drawn per call, so a repeated call can
+    land elsewhere in the tail. Calls beyond ``capacity`` in flight are refused
+    with a 429, like a rate-limited endpoint.
+    """
+
+    def __init__(
+        self,
+        latency_median_ms: Optional[float] = None,
+        latency_sigma: Optional[float] = None,
+        error_rate: Optional[float] = None,
+        seed: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        capacity: Optional[int] = None,
+    ):
+        self.latency_median_ms = (
+            latency_median_ms if latency_median_ms is not None else settings.FAKE_EXTRACTION_LATENCY_MEDIAN_MS
+        )
+        self.latency_sigma = latency_sigma if latency_sigma is not None else settings.FAKE_EXTRACTION_LATENCY_SIGMA
+        self.error_rate = error_rate if error_rate is not None else settings.FAKE_EXTRACTION_ERROR_RATE
+        self.seed = seed if seed is not None else settings.FAKE_EXTRACTION_SEED
+        # 0 means unlimited
+        self.capacity = capacity if capacity is not None else settings.FAKE_EXTRACTION_CAPACITY
+        self.in_flight = 0
+        self._calls = 0
+        self._ports: Dict[str, str] = {normalize_port_name(port): port for port in KNOWN_PORTS}
+        for port in KNOWN_PORTS:
+            # Compound names also answer to each part, as in the port index
+            for part in re.split(r"[-/]", port):
+                self._ports.setdefault(normalize_port_name(part), port)
+        self._max_words = max(len(key.split()) for key in self._ports)
+        self._in_flight = asyncio.Semaphore(max_concurrency or settings.EXTRACTION_MAX_CONCURRENCY)
+
+    def latency_seconds(self, rng: random.Random) -> float:
+        """Log-normal around the median; sigma 0 gives a fixed latency."""
+        return self.latency_median_ms / 1000.0 * math.exp(self.latency_sigma * rng.gauss(0.0, 1.0))
+
+    def extract(self, text: str) -> DisruptionEvent:
+        words = _WORD.findall(fold_text(text))
+        target_port = None
+        for n in range(self._max_words, 0, -1):
+            for i in range(len(words) - n + 1):
+                target_port = self._ports.get(" ".join(words[i:i + n]))
+                if target_port is not None:
+                    break
+            if target_port is not None:
+                break
+
+        present = set(words)
+        for keyword, event_type, is_disruption in _EVENT_KEYWORDS:
+            if keyword in present:
+                return DisruptionEvent(
+                    target_port=target_port,
+                    event_type=event_type,
+                    is_disruption=is_disruption,
+                    confidence_score=0.9 if target_port else 0.5,
+                )
+        return DisruptionEvent(target_port=target_port, event_type="Other", is_disruption=False, confidence_score=0.3)
+
+    async def _simulate_request(self, key: str) -> None:
+        """One request's rate limiting, latency and failure; ``key`` seeds the outcome."""
+        if self.capacity and self.in_flight >= self.capacity:
+            raise ExtractionError("AI Extraction failed: simulated rate limit", status_code=429)
+        self._calls += 1
+        latency = self.latency_seconds(random.Random(f"{self.seed}:{key}:{self._calls}"))
+        self.in_flight += 1
+        try:
+            async with self._in_flight:
+                await asyncio.sleep(latency)
+        finally:
+            self.in_flight -= 1
+        if random.Random(f"{self.seed}:{key}").random() < self.error_rate:
+            raise ExtractionError("AI Extraction failed: simulated backend error", status_code=503)
+
+    async def parse_snippet(self, text: str) -> DisruptionEvent:
+        await self._simulate_request(text)
+        return self.extract(text)
+
+    async def parse_snippets(self, texts: Sequence[str]) -> Dict[int, DisruptionEvent]:
+        # A packed request costs one latency draw and one slot of capacity, like a single call
+        await self._simulate_request("\n".join(texts))
+        return {i: self.extract(text) for i, text in enumerate(texts)}
+
+    async def aclose(self) -> None:
+        pass
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import logging
+from typing import Dict, Optional, Sequence, cast
+
+import httpx
+from google import genai
+from google.genai import errors, types
+from pydantic import Field, ValidationError
+
+from app.core.config import settings
+from app.core.metrics import LLM_TOKENS_TOTAL
+from app.schemas.assessment import DisruptionEvent
+from app.services.extraction_service import ExtractionError
+
+class IndexedDisruptionEvent(DisruptionEvent):
+    """One answer of a packed request, tied back to its snippet."""
+    snippet_index: int = Field(..., description="Number of the snippet this event was extracted from.")
+
+def pack_snippets(texts: Sequence[str]) -> str:
+    return settings.EXTRACTION_BATCH_PROMPT.format(
+        snippets="\n\n".join(f"[{i}] {text}" for i, text in enumerate(texts))
+    )
+
+def unpack_events(payload: str, count: int) -> Dict[int, DisruptionEvent]:
+    """Events by snippet index from a packed response.
+
+    Items are validated one at a time, so a malformed item costs only its own
+    snippet; items with an unknown or repeated index are ignored.
+    """
+    try:
+        items = json.loads(payload)
+    except ValueError:
+        return {}
+    events: Dict[int, DisruptionEvent] = {}
+    for item in items if isinstance(items, list) else ():
+        if not isinstance(item, dict):
+            continue
+        index = item.get("snippet_index")
+        if not isinstance(index, int) or not 0 <= index < count or index in events:
+            continue
+        fields = {key: value for key, value in item.items() if key != "snippet_index"}
+        try:
+            events[index] = DisruptionEvent.model_validate(fields, strict=False)
+        except ValidationError:
+            continue
+    return events
+
+class IntelligentExtractionService:
+    """Gemini-backed extractor. Build one per process and share it across requests."""
+
+    def __init__(
+        self,
+        project: Optional[str] = None,
+        location: Optional[str] = None,
+        client: Optional[genai.Client] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        self.project = project or settings.GOOGLE_CLOUD_PROJECT
+        self.location = location or settings.GOOGLE_CLOUD_LOCATION
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._owns_client = client is None
+        if client is None:
+            # We own the pooled HTTP client so keep-alive connections are reused across calls
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.EXTRACTION_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.EXTRACTION_HTTP_MAX_CONNECTIONS,
+                    keepalive_expiry=settings.EXTRACTION_HTTP_KEEPALIVE_SECONDS,
+                )
+            )
+            client = genai.Client(
+                vertexai=True,
+                project=self.project,
+                location=self.location,
+                http_options=types.HttpOptions(httpx_async_client=self._http_client),
+            )
+        self.client = client
+        self._in_flight = asyncio.Semaphore(max_concurrency or settings.EXTRACTION_MAX_CONCURRENCY)
+
+    async def parse_snippet(self, text: str) -> DisruptionEvent:
+        try:
+            async with self._in_flight:
+                # Defaults to Gemini 2.5 Flash as it is reliable and fast for this.
+                response = await self.client.aio.models.generate_content(
+                    model=settings.EXTRACTION_MODEL,
+                    contents=settings.EXTRACTION_PROMPT.format(text=text),
+                    config=types.GenerateContentConfig(
+                        response_mime_type="application/json",
+                        response_schema=DisruptionEvent
+                    )
+                )
+            self._record_usage(response)
+            
+            if response.parsed:
+                 return cast(DisruptionEvent, response.parsed)
+            
+            # Fallback validation if parsed is not populated (though it should be)
+            if response.text:
+                return DisruptionEvent.model_validate_json(response.text)
+                
+            raise ExtractionError("Empty response from AI")
+
+        except Exception as e:
+            logging.error(f"AI Extraction failed: {e}")
+            status_code = e.code if isinstance(e, errors.APIError) else None
+            raise ExtractionError(f"AI Extraction failed: {str(e)}", status_code)
+
+    async def parse_snippets(self, texts: Sequence[str]) -> Dict[int, DisruptionEvent]:
+        try:
+            async with self._in_flight:
+                response = await self.client.aio.models.generate_content(
+                    model=settings.EXTRACTION_MODEL,
+                    contents=pack_snippets(texts),
+                    config=types.GenerateContentConfig(
+                        response_mime_type="application/json",
+                        response_schema=list[IndexedDisruptionEvent],
+                    )
+                )
+            self._record_usage(response)
+        except Exception as e:
+            logging.error(f"Batched AI Extraction of {len(texts)} snippets failed: {e}")
+            status_code = e.code if isinstance(e, errors.APIError) else None
+            raise ExtractionError(f"AI Extraction failed: {str(e)}", status_code)
+        # Parse the raw text rather than response.parsed, which is all-or-nothing
+        return unpack_events(response.text or "", len(texts))
+
+    @staticmethod
+    def _record_usage(response: types.GenerateContentResponse) -> None:
+        usage = response.usage_metadata
+        if usage is None:
+            return
+        for kind, count in (
+            ("prompt", usage.prompt_token_count),
+            ("output", usage.candidates_token_count),
+            ("thinking", usage.thoughts_token_count),
+            ("total", usage.total_token_count),
+        ):
+            if count:
+                LLM_TOKENS_TOTAL.inc(count, kind=kind)
+
+    async def aclose(self) -> None:
+        # Only close what we created; an injected client belongs to the caller
+        if not self._owns_client:
+            return
+        await self.client.aio.aclose()
+        if self._http_client is not None:
+            await self._http_client.aclose()
@@ -0,0 +1,117 @@
+import asyncio
+import logging
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.config import settings
+from app.core.metrics import record_error
+from app.repositories.job_repo import AssessmentJobRepository
+from app.repositories.shipment_repo import ShipmentRepository
+from app.services.extraction_service import EventExtractor
+from app.services.risk_service import RiskAssessmentService
+
+logger = logging.getLogger(__name__)
+
+# How long stop() lets in-flight jobs finish before cancelling them
+SHUTDOWN_GRACE_SECONDS = 10.0
+
+class AssessmentWorkerPool:
+    """Asyncio workers that drain the assessment job queue independently of HTTP traffic."""
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        extractor: EventExtractor,
+        size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        shutdown_grace: float = SHUTDOWN_GRACE_SECONDS,
+        sweep_interval: Optional[float] = None,
+        stale_after: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+    ):
+        self.sessionmaker = sessionmaker
+        self.extractor = extractor
+        self.size = size if size is not None else settings.ASSESSMENT_WORKERS
+        self.poll_interval = poll_interval if poll_interval is not None else settings.JOB_POLL_INTERVAL_SECONDS
+        self.shutdown_grace = shutdown_grace
+        self.sweep_interval = sweep_interval if sweep_interval is not None else settings.JOB_SWEEP_INTERVAL_SECONDS
+        self.stale_after = stale_after if stale_after is not None else settings.JOB_STALE_SECONDS
+        self.max_attempts = max_attempts if max_attempts is not None else settings.JOB_MAX_ATTEMPTS
+        self._tasks: List[asyncio.Task[None]] = []
+        self._stopping = asyncio.Event()
+
+    async def start(self) -> None:
+        await self.sweep()
+        self._stopping.clear()
+        self._tasks = [asyncio.create_task(self._run(), name=f"assessment-worker-{i}") for i in range(self.size)]
+        # Another instance's workers can die at any time, not only before this one starts
+        self._tasks.append(asyncio.create_task(self._sweep_periodically(), name="assessment-job-sweeper"))
+
+    async def stop(self) -> None:
+        # Let workers finish the job they hold; cancelling mid-query can wedge the connection
+        self._stopping.set()
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=self.shutdown_grace)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def sweep(self) -> None:
+        """Requeue jobs held past ``stale_after`` by a dead worker, failing those out of attempts."""
+        async with self.sessionmaker() as session:
+            stale = await AssessmentJobRepository(session).requeue_stale(self.stale_after, self.max_attempts)
+        if stale.requeued:
+            logger.info(f"Requeued {stale.requeued} stale assessment jobs")
+        if stale.failed:
+            logger.warning(f"Failed {stale.failed} stale assessment jobs after {self.max_attempts} attempts")
+
+    async def _sweep_periodically(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.sweep_interval)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                return
+            try:
+                await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Assessment job sweep error: {e}")
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                processed = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep the worker alive through transient DB errors
+                logger.error(f"Assessment worker error: {e}")
+                processed = False
+            if not processed:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def run_once(self) -> bool:
+        """Claim and process one job. Returns False when the queue is empty."""
+        async with self.sessionmaker() as session:
+            jobs = AssessmentJobRepository(session)
+            job = await jobs.claim_next()
+            if job is None:
+                return False
+
+            service = RiskAssessmentService(session, self.extractor, ShipmentRepository(session))
+            try:
+                assessment = await service.create_assessment(job.news_text)
+            except Exception as e:
+                record_error(e)
+                logger.error(f"Assessment job {job.job_id} failed: {e}")
+                await session.rollback()
+                await jobs.fail(job, str(e))
+            else:
+                await jobs.complete(job, assessment.assessment_id)
+            return True
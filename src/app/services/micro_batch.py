@@ -0,0 +1,107 @@
+import asyncio
+import logging
+from typing import List, NamedTuple, Optional, Set
+
+from app.core.config import settings
+from app.core.metrics import EXTRACTION_BATCH_ITEMS, EXTRACTION_BATCH_RETRIES_TOTAL
+from app.schemas.assessment import DisruptionEvent
+from app.services.extraction_service import BatchEventExtractor
+
+logger = logging.getLogger(__name__)
+
+class _Queued(NamedTuple):
+    text: str
+    future: "asyncio.Future[DisruptionEvent]"
+
+class MicroBatchingExtractionService:
+    """Packs snippets extracted around the same time into one backend request.
+
+    Snippets are queued for up to ``max_delay_ms`` or until ``max_items`` are
+    waiting, then sent together, so the per-request prompt overhead and the
+    request-rate quota are shared among them. A snippet the response left out
+    or garbled is retried on its own; a failed request fails every snippet in
+    it, exactly as a single call would have.
+    """
+
+    def __init__(
+        self,
+        extractor: BatchEventExtractor,
+        max_items: Optional[int] = None,
+        max_delay_ms: Optional[float] = None,
+    ):
+        self.extractor = extractor
+        self.max_items = max_items or settings.EXTRACTION_BATCH_MAX_ITEMS
+        self.max_delay = (
+            max_delay_ms if max_delay_ms is not None else settings.EXTRACTION_BATCH_MAX_DELAY_MS
+        ) / 1000.0
+        self._queue: List[_Queued] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._batches: Set[asyncio.Task[None]] = set()
+
+    async def parse_snippet(self, text: str) -> DisruptionEvent:
+        future: asyncio.Future[DisruptionEvent] = asyncio.get_running_loop().create_future()
+        self._queue.append(_Queued(text, future))
+        if len(self._queue) >= self.max_items:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush)
+        # A cancelled caller cancels its future; the batch skips it when answering
+        return await future
+
+    async def aclose(self) -> None:
+        """Send anything still queued and wait for batches in flight."""
+        self._flush()
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._queue = self._queue, []
+        # Callers that gave up while queued need no extraction
+        batch = [queued for queued in batch if not queued.future.done()]
+        if batch:
+            task = asyncio.create_task(self._send(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _send(self, batch: List[_Queued]) -> None:
+        EXTRACTION_BATCH_ITEMS.observe(len(batch))
+        if len(batch) == 1:
+            await self._send_one(batch[0])
+            return
+        try:
+            events = await self.extractor.parse_snippets([queued.text for queued in batch])
+        except Exception as e:
+            for queued in batch:
+                _fail(queued, e)
+            return
+
+        retries = []
+        for i, queued in enumerate(batch):
+            event = events.get(i)
+            if event is None:
+                retries.append(queued)
+            else:
+                _resolve(queued, event)
+        if retries:
+            logger.warning(f"Batched extraction answered {len(batch) - len(retries)} of {len(batch)} snippets; retrying the rest")
+            EXTRACTION_BATCH_RETRIES_TOTAL.inc(len(retries))
+            await asyncio.gather(*(self._send_one(queued) for queued in retries))
+
+    async def _send_one(self, queued: _Queued) -> None:
+        try:
+            event = await self.extractor.parse_snippet(queued.text)
+        except Exception as e:
+            _fail(queued, e)
+        else:
+            _resolve(queued, event)
+
+def _resolve(queued: _Queued, event: DisruptionEvent) -> None:
+    if not queued.future.done():
+        queued.future.set_result(event)
+
+def _fail(queued: _Queued, error: BaseException) -> None:
+    if not queued.future.done():
+        queued.future.set_exception(error)
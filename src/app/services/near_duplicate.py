@@ -0,0 +1,125 @@
+import hashlib
+import re
+import time
+import unicodedata
+from typing import List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.repositories.port_index import normalize_port_name
+from app.schemas.assessment import DisruptionEvent
+from app.services.extraction_service import EventExtractor
+from app.services.extraction_trace import EXTRACTION_PATH_NEAR_DUPLICATE, current_trace
+
+NUM_PERMUTATIONS = 128
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_WORD = re.compile(r"\w+")
+# Function words carry no signal about the event and dilute the similarity of short headlines
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or over that the to was were will with".split()
+)
+
+def fold_text(text: str) -> str:
+    """Strip diacritics and case-fold."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+def snippet_features(text: str) -> Set[str]:
+    return {word for word in _WORD.findall(fold_text(text)) if word not in _STOPWORDS}
+
+class MinHasher:
+    """MinHash signatures whose agreement rate estimates the Jaccard similarity of word sets."""
+
+    def __init__(self, num_permutations: int = NUM_PERMUTATIONS, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        # a < 2**31 and features < 2**32 keep a*x + b inside uint64
+        self._a = rng.integers(1, int(_MERSENNE_PRIME), size=num_permutations, dtype=np.uint64)
+        self._b = rng.integers(0, int(_MERSENNE_PRIME), size=num_permutations, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        features = snippet_features(text) or {""}
+        hashed = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(f.encode(), digest_size=4).digest(), "little") for f in features),
+            dtype=np.uint64,
+            count=len(features),
+        )
+        permuted = (self._a[:, None] * hashed[None, :] + self._b[:, None]) % _MERSENNE_PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+class NearDuplicateIndex:
+    """Ring buffer of recent snippet signatures and the events extracted from them."""
+
+    def __init__(
+        self,
+        capacity: Optional[int] = None,
+        threshold: Optional[float] = None,
+        ttl_seconds: Optional[float] = None,
+        hasher: Optional[MinHasher] = None,
+    ):
+        self.capacity = capacity if capacity is not None else settings.NEAR_DUPLICATE_CAPACITY
+        self.threshold = threshold if threshold is not None else settings.NEAR_DUPLICATE_THRESHOLD
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.NEAR_DUPLICATE_TTL_SECONDS
+        self.hasher = hasher or MinHasher()
+        self._signatures = np.zeros((self.capacity, NUM_PERMUTATIONS), dtype=np.uint32)
+        self._added_at = np.full(self.capacity, -np.inf)
+        self._events: List[Optional[DisruptionEvent]] = [None] * self.capacity
+        self._next = 0
+
+    def add(self, text: str, event: DisruptionEvent) -> None:
+        slot = self._next
+        self._signatures[slot] = self.hasher.signature(text)
+        self._added_at[slot] = time.monotonic()
+        self._events[slot] = event
+        self._next = (slot + 1) % self.capacity
+
+    def find(self, text: str) -> Optional[Tuple[DisruptionEvent, float]]:
+        """Best live match at or above the threshold, with its estimated similarity."""
+        live = self._added_at > time.monotonic() - self.ttl_seconds
+        if not live.any():
+            return None
+        # One vectorised pass over the whole window: fraction of agreeing MinHash slots per entry
+        similarity = (self._signatures == self.hasher.signature(text)).mean(axis=1)
+        similarity[~live] = -1.0
+
+        folded = f" {' '.join(_WORD.findall(fold_text(text)))} "
+        for slot in np.argsort(similarity)[::-1]:
+            score = float(similarity[slot])
+            if score < self.threshold:
+                return None
+            event = self._events[slot]
+            # Reworded coverage of the same story names the same port; never reuse across ports
+            if event is not None and (
+                event.target_port is None or f" {normalize_port_name(event.target_port)} " in folded
+            ):
+                return event, score
+        return None
+
+    def clear(self) -> None:
+        self._added_at[:] = -np.inf
+        self._events = [None] * self.capacity
+        self._next = 0
+
+class NearDuplicateExtractionService:
+    """Reuses the extraction of a recent, sufficiently similar snippet instead of calling the model."""
+
+    def __init__(self, extractor: EventExtractor, index: NearDuplicateIndex):
+        self.extractor = extractor
+        self.index = index
+
+    async def parse_snippet(self, text: str) -> DisruptionEvent:
+        match = self.index.find(text)
+        if match is not None:
+            event, similarity = match
+            trace = current_trace()
+            if trace is not None:
+                trace.path = EXTRACTION_PATH_NEAR_DUPLICATE
+                trace.duplicate_similarity = similarity
+            return event
+
+        event = await self.extractor.parse_snippet(text)
+        self.index.add(text, event)
+        return event
+
+# Process-wide window of recent extractions
+near_duplicate_index = NearDuplicateIndex()
@@ -0,0 +1,144 @@
+import re
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.repositories.port_index import PORT_ALIASES, PortIndex, port_index
+from app.schemas.assessment import DisruptionEvent
+from app.services.extraction_service import EventExtractor
+from app.services.extraction_trace import EXTRACTION_PATH_PREFILTER, record_extraction_path
+from app.services.near_duplicate import fold_text
+
+_WORD = re.compile(r"\w+")
+_TABLE_BITS = 20
+
+PORT_WEIGHT = 1.0
+TERM_WEIGHT = 0.5
+
+# Words that place a snippet in shipping and logistics
+LOGISTICS_TERMS = frozenset("""
+    port ports harbour harbor seaport terminal terminals berth berths dock docks dockworkers longshoremen
+    shipping shipment shipments ship ships vessel vessels tanker tankers freighter container containers teu
+    cargo freight logistics carrier carriers maritime canal strait customs embargo tariff tariffs
+    warehouse warehouses rail railway trucking truckers supply
+""".split())
+
+# Words that describe an operational disruption
+EVENT_TERMS = frozenset("""
+    strike strikes walkout lockout protest blockade typhoon hurricane cyclone storm storms flood flooding
+    fog earthquake tsunami fire explosion collision grounding grounded closure closed shutdown suspended
+    congestion backlog delay delays delayed outage cyberattack disruption disruptions sanctions
+""".split())
+
+class RelevanceScorer:
+    """Scores how likely a snippet is to concern shipping, from a weighted n-gram gazetteer.
+
+    Known port names (aliases plus every destination in the port index) and the
+    term lists above are hashed into one NumPy weight table; a snippet's score
+    is the summed weight of the distinct table slots its n-grams hit.
+    """
+
+    def __init__(self, index: Optional[PortIndex] = None):
+        self.index = index or port_index
+        self._weights = np.zeros(1 << _TABLE_BITS, dtype=np.float32)
+        self._max_words = 1
+        self._index_version: Optional[int] = None
+
+    @staticmethod
+    def _slot(term: str) -> int:
+        return hash(term) & ((1 << _TABLE_BITS) - 1)
+
+    def _rebuild(self) -> None:
+        weights = np.zeros_like(self._weights)
+        for term in LOGISTICS_TERMS | EVENT_TERMS:
+            weights[self._slot(term)] = TERM_WEIGHT
+        # Short aliases such as "la" or "sg" are too ambiguous in free text
+        ports = {key for key in PORT_ALIASES if len(key) > 3} | set(PORT_ALIASES.values()) | self.index.keys()
+        max_words = 1
+        for port in ports:
+            weights[self._slot(port)] = PORT_WEIGHT
+            max_words = max(max_words, len(port.split()))
+        self._weights = weights
+        self._max_words = max_words
+
+    def score(self, text: str) -> float:
+        # Ports learned by the index since the last call join the gazetteer
+        if self._index_version != self.index.version:
+            self._index_version = self.index.version
+            self._rebuild()
+
+        words = _WORD.findall(fold_text(text))
+        grams = [
+            " ".join(words[i:i + n])
+            for n in range(1, min(self._max_words, len(words)) + 1)
+            for i in range(len(words) - n + 1)
+        ]
+        if not grams:
+            return 0.0
+        slots = np.fromiter((self._slot(g) for g in grams), dtype=np.int64, count=len(grams))
+        return float(self._weights[np.unique(slots)].sum())
+
+class RelevanceFilterExtractionService:
+    """Answers snippets that score below the threshold with a non-disruptive event, without calling the model."""
+
+    def __init__(self, extractor: EventExtractor, scorer: RelevanceScorer, threshold: Optional[float] = None):
+        self.extractor = extractor
+        self.scorer = scorer
+        self.threshold = threshold if threshold is not None else settings.RELEVANCE_FILTER_THRESHOLD
+
+    async def parse_snippet(self, text: str) -> DisruptionEvent:
+        score = self.scorer.score(text)
+        if score < self.threshold:
+            record_extraction_path(EXTRACTION_PATH_PREFILTER)
+            return DisruptionEvent(
+                target_port=None,
+                event_type="Not shipping-related",
+                is_disruption=False,
+                confidence_score=round(1.0 - score / self.threshold, 3),
+            )
+        return await self.extractor.parse_snippet(text)
+
+@dataclass
+class FilterEvaluation:
+    """How a threshold would have split snippets whose model verdict is known."""
+    threshold: float
+    samples: int = 0
+    relevant: int = 0
+    kept: int = 0
+    kept_relevant: int = 0
+
+    def record(self, kept: bool, relevant: bool) -> None:
+        self.samples += 1
+        self.relevant += relevant
+        self.kept += kept
+        self.kept_relevant += kept and relevant
+
+    @property
+    def precision(self) -> float:
+        return self.kept_relevant / self.kept if self.kept else 1.0
+
+    @property
+    def recall(self) -> float:
+        return self.kept_relevant / self.relevant if self.relevant else 1.0
+
+    @property
+    def filter_rate(self) -> float:
+        return 1.0 - self.kept / self.samples if self.samples else 0.0
+
+def evaluate_filter(
+    scorer: RelevanceScorer, threshold: float, samples: Iterable[Tuple[str, bool]]
+) -> FilterEvaluation:
+    """Replay (snippet, model found a disruption) pairs through the scorer.
+
+    Recall is the share of model-detected disruptions the filter would still
+    have passed to the model; the filter rate is the share of calls it saves.
+    """
+    evaluation = FilterEvaluation(threshold=threshold)
+    for text, is_disruption in samples:
+        evaluation.record(scorer.score(text) >= threshold, is_disruption)
+    return evaluation
+
+# Process-wide scorer over the shared port index
+relevance_scorer = RelevanceScorer()
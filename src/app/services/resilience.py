@@ -0,0 +1,341 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Set, TypeVar, cast
+
+from app.core.config import settings
+from app.core.metrics import (
+    EXTRACTION_BACKEND_CALLS_TOTAL,
+    EXTRACTION_BACKEND_IN_FLIGHT,
+    EXTRACTION_BACKEND_SECONDS,
+    EXTRACTION_CIRCUIT_STATE,
+    EXTRACTION_CONCURRENCY_LIMIT,
+    EXTRACTION_HEDGES_TOTAL,
+)
+from app.schemas.assessment import DisruptionEvent
+from app.services.extraction_service import EventExtractor, ExtractionError, ExtractionTimeout, ExtractionUnavailable
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+OUTCOME_SUCCESS = "success"
+# The backend answered 429 or 5xx
+OUTCOME_OVERLOAD = "overload"
+OUTCOME_TIMEOUT = "timeout"
+# No usable answer: connection errors, empty or malformed responses
+OUTCOME_FAILURE = "failure"
+# A 4xx other than 429: the request was refused, the backend is fine
+OUTCOME_REJECTED = "rejected"
+# The losing side of a hedge, or a caller that went away
+OUTCOME_CANCELLED = "cancelled"
+
+# Successful latencies kept for the hedging percentile
+LATENCY_WINDOW = 512
+
+def classify(error: BaseException) -> str:
+    if isinstance(error, ExtractionTimeout):
+        return OUTCOME_TIMEOUT
+    if isinstance(error, ExtractionError):
+        if error.overloaded:
+            return OUTCOME_OVERLOAD
+        return OUTCOME_FAILURE if error.backend_fault else OUTCOME_REJECTED
+    return OUTCOME_FAILURE
+
+class LatencyWindow:
+    """Latencies of recent successful calls."""
+
+    def __init__(self, size: int = LATENCY_WINDOW):
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._sorted: Optional[List[float]] = None
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self._sorted = None
+
+    def percentile(self, q: float) -> float:
+        # Sorted lazily: many calls observe between two hedging decisions
+        if self._sorted is None:
+            self._sorted = sorted(self._samples)
+        index = min(len(self._sorted) - 1, int(len(self._sorted) * q / 100.0))
+        return self._sorted[index]
+
+class AdaptiveConcurrencyLimit:
+    """AIMD limit on concurrent backend calls.
+
+    Each success raises the limit by 1/limit, so about one slot per limit's
+    worth of successes. Overload or a timeout multiplies it by ``backoff``, at
+    most once per round of calls: calls that started before the last decrease
+    saw the old limit and do not cut it again.
+    """
+
+    def __init__(
+        self,
+        minimum: Optional[int] = None,
+        maximum: Optional[int] = None,
+        backoff: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.minimum = minimum if minimum is not None else settings.EXTRACTION_CONCURRENCY_MIN
+        self.maximum = maximum if maximum is not None else settings.EXTRACTION_MAX_CONCURRENCY
+        self.backoff = backoff if backoff is not None else settings.EXTRACTION_CONCURRENCY_BACKOFF
+        self.clock = clock
+        self.limit = float(self.maximum)
+        self.in_flight = 0
+        self._last_decrease = float("-inf")
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+
+    def _has_room(self) -> bool:
+        return self.in_flight < max(self.minimum, int(self.limit))
+
+    async def acquire(self) -> None:
+        while not self._has_room():
+            waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Woken and cancelled in the same tick: pass the wake-up on
+                    self._wake()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if one is free and nobody is queued for it."""
+        if self._waiters or not self._has_room():
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, started: float, outcome: str) -> None:
+        self.in_flight -= 1
+        if outcome == OUTCOME_SUCCESS:
+            self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+        elif outcome in (OUTCOME_OVERLOAD, OUTCOME_TIMEOUT) and started >= self._last_decrease:
+            self.limit = max(float(self.minimum), self.limit * self.backoff)
+            self._last_decrease = self.clock()
+        self._wake()
+
+    def _wake(self) -> None:
+        free = max(self.minimum, int(self.limit)) - self.in_flight
+        for waiter in list(self._waiters):
+            if free <= 0:
+                break
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+class CircuitBreaker:
+    """Stops calling a failing backend, then lets a single probe through to test recovery.
+
+    Closed: calls pass and consecutive backend faults are counted. After
+    ``failure_threshold`` of them the circuit opens and calls are refused for
+    ``reset_seconds``. Then it is half-open: one probe call is allowed; success
+    closes the circuit and failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: Optional[int] = None,
+        reset_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = (
+            failure_threshold if failure_threshold is not None else settings.CIRCUIT_FAILURE_THRESHOLD
+        )
+        self.reset_seconds = reset_seconds if reset_seconds is not None else settings.CIRCUIT_RESET_SECONDS
+        self.clock = clock
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._publish()
+
+    def before_call(self) -> bool:
+        """Raise ExtractionUnavailable unless a call may go to the backend now; True for the probe."""
+        if self.state == CIRCUIT_OPEN:
+            remaining = self._opened_at + self.reset_seconds - self.clock()
+            if remaining > 0:
+                raise ExtractionUnavailable("Extraction backend unavailable: circuit open", retry_after=remaining)
+            self._set_state(CIRCUIT_HALF_OPEN)
+        if self.state == CIRCUIT_HALF_OPEN:
+            if self._probing:
+                raise ExtractionUnavailable(
+                    "Extraction backend unavailable: recovery probe in flight", retry_after=self.reset_seconds
+                )
+            self._probing = True
+            return True
+        return False
+
+    def record(self, outcome: str, probe: bool = False) -> None:
+        """Settle a call that before_call let through."""
+        if probe:
+            self._probing = False
+        if outcome == OUTCOME_CANCELLED:
+            return
+        if outcome in (OUTCOME_SUCCESS, OUTCOME_REJECTED):
+            self.failures = 0
+            if probe:
+                self._set_state(CIRCUIT_CLOSED)
+            return
+        self.failures += 1
+        # Stragglers from before the circuit opened neither close it nor extend it
+        if probe or (self.state == CIRCUIT_CLOSED and self.failures >= self.failure_threshold):
+            self._opened_at = self.clock()
+            logger.warning(f"Extraction circuit opened after {self.failures} consecutive failures")
+            self._set_state(CIRCUIT_OPEN)
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        self._publish()
+
+    def _publish(self) -> None:
+        for state in (CIRCUIT_CLOSED, CIRCUIT_OPEN, CIRCUIT_HALF_OPEN):
+            EXTRACTION_CIRCUIT_STATE.set(1 if state == self.state else 0, state=state)
+
+class ResilientExtractionService:
+    """Deadline, hedging, adaptive concurrency and circuit breaking around the extraction backend.
+
+    Every call gets ``deadline_seconds``, queueing for a slot included. Once
+    enough latencies are known, a call still running at the
+    ``hedge_percentile`` latency gets a duplicate if a slot is free; the first
+    answer wins and the other call is cancelled. The breaker counts logical
+    calls, so a hedge does not count twice. A packed request of several
+    snippets is one call to all of this, and is never hedged.
+    """
+
+    def __init__(
+        self,
+        extractor: EventExtractor,
+        deadline_seconds: Optional[float] = None,
+        hedge_percentile: Optional[float] = None,
+        hedge_min_samples: Optional[int] = None,
+        limiter: Optional[AdaptiveConcurrencyLimit] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.extractor = extractor
+        self.deadline_seconds = (
+            deadline_seconds if deadline_seconds is not None else settings.EXTRACTION_DEADLINE_SECONDS
+        )
+        self.hedge_percentile = (
+            hedge_percentile if hedge_percentile is not None else settings.EXTRACTION_HEDGE_PERCENTILE
+        )
+        self.hedge_min_samples = (
+            hedge_min_samples if hedge_min_samples is not None else settings.EXTRACTION_HEDGE_MIN_SAMPLES
+        )
+        self.limiter = limiter or AdaptiveConcurrencyLimit()
+        self.breaker = breaker or CircuitBreaker()
+        self.latencies = LatencyWindow()
+        EXTRACTION_CONCURRENCY_LIMIT.set(self.limiter.limit)
+
+    async def parse_snippet(self, text: str) -> DisruptionEvent:
+        probe = self.breaker.before_call()
+        outcome = OUTCOME_CANCELLED
+        try:
+            event = await self._hedged(text, asyncio.get_running_loop().time() + self.deadline_seconds)
+            outcome = OUTCOME_SUCCESS
+            return event
+        except Exception as e:
+            outcome = classify(e)
+            raise
+        finally:
+            self.breaker.record(outcome, probe)
+
+    async def parse_snippets(self, texts: Sequence[str]) -> Dict[int, DisruptionEvent]:
+        extractor = cast(Any, self.extractor)
+        probe = self.breaker.before_call()
+        outcome = OUTCOME_CANCELLED
+        try:
+            deadline = asyncio.get_running_loop().time() + self.deadline_seconds
+            events: Dict[int, DisruptionEvent] = await self._attempt(lambda: extractor.parse_snippets(texts), deadline)
+            outcome = OUTCOME_SUCCESS
+            return events
+        except Exception as e:
+            outcome = classify(e)
+            raise
+        finally:
+            self.breaker.record(outcome, probe)
+
+    def hedge_delay(self) -> Optional[float]:
+        if self.hedge_percentile <= 0 or len(self.latencies) < self.hedge_min_samples:
+            return None
+        return self.latencies.percentile(self.hedge_percentile)
+
+    async def _hedged(self, text: str, deadline: float) -> DisruptionEvent:
+        primary = asyncio.create_task(self._attempt(lambda: self.extractor.parse_snippet(text), deadline))
+        running: Set[asyncio.Task[DisruptionEvent]] = {primary}
+        hedge: Optional[asyncio.Task[DisruptionEvent]] = None
+        try:
+            delay = self.hedge_delay()
+            if delay is not None:
+                await asyncio.wait(running, timeout=delay)
+                # Never hedge into a queue, an overloaded backend or a recovering one
+                if not primary.done() and self.breaker.state == CIRCUIT_CLOSED and self.limiter.try_acquire():
+                    EXTRACTION_HEDGES_TOTAL.inc(result="launched")
+                    hedge = asyncio.create_task(
+                        self._attempt(lambda: self.extractor.parse_snippet(text), deadline, reserved=True)
+                    )
+                    running.add(hedge)
+
+            error: Optional[BaseException] = None
+            while running:
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            EXTRACTION_HEDGES_TOTAL.inc(result="won")
+                        return task.result()
+                    error = task.exception()
+            assert error is not None
+            raise error
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def _attempt(self, call: Callable[[], Awaitable[T]], deadline: float, reserved: bool = False) -> T:
+        outcome = OUTCOME_CANCELLED
+        started: Optional[float] = None
+        try:
+            async with asyncio.timeout_at(deadline):
+                if not reserved:
+                    await self.limiter.acquire()
+                    reserved = True
+                started = self.limiter.clock()
+                EXTRACTION_BACKEND_IN_FLIGHT.inc()
+                result = await call()
+            outcome = OUTCOME_SUCCESS
+            return result
+        except TimeoutError:
+            outcome = OUTCOME_TIMEOUT
+            raise ExtractionTimeout(f"AI Extraction timed out after {self.deadline_seconds}s") from None
+        except Exception as e:
+            outcome = classify(e)
+            raise
+        finally:
+            if reserved:
+                self._settle(started, outcome)
+
+    def _settle(self, started: Optional[float], outcome: str) -> None:
+        now = self.limiter.clock()
+        self.limiter.release(started if started is not None else now, outcome)
+        EXTRACTION_CONCURRENCY_LIMIT.set(self.limiter.limit)
+        if started is None:
+            return
+        EXTRACTION_BACKEND_IN_FLIGHT.dec()
+        EXTRACTION_BACKEND_CALLS_TOTAL.inc(outcome=outcome)
+        if outcome != OUTCOME_CANCELLED:
+            EXTRACTION_BACKEND_SECONDS.observe(now - started)
+            if outcome == OUTCOME_SUCCESS:
+                self.latencies.observe(now - started)
@@ -1,21 +1,37 @@
-from typing import Sequence
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from typing import FrozenSet, List, Optional, Sequence, Tuple, Union
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.metrics import ASSESSMENT_STAGE_SECONDS, EXTRACTIONS_TOTAL
 from app.models.assessment import RiskAssessmentModel
-from app.models.shipment import ShipmentModel
-from app.repositories.shipment_repo import ShipmentRepository
-from app.services.extraction_service import IntelligentExtractionService
+from app.repositories.disruption_registry import DisruptionRegistry, OpenDisruption, disruption_registry
+from app.repositories.pagination import encode_cursor
+from app.repositories.port_proximity import impact_radius_km
+from app.repositories.rollup_repo import RiskRollupRepository, RollupIncrement, rollup_increment
+from app.repositories.shipment_repo import RegionImpact, ShipmentRepository, ShipmentRow
+from app.services.assessment_writer import AssessmentWriteCoalescer
+from app.services.extraction_service import EventExtractor
+from app.services.extraction_trace import ExtractionTrace, trace_extraction
 from app.schemas.assessment import DisruptionEvent, MitigationAdvice
 
 class RiskAssessmentService:
     def __init__(
         self, 
         db: AsyncSession, 
-        extractor: IntelligentExtractionService,
-        shipment_repo: ShipmentRepository
+        extractor: EventExtractor,
+        shipment_repo: ShipmentRepository,
+        writer: Optional[AssessmentWriteCoalescer] = None,
+        rollups: Optional[RiskRollupRepository] = None,
+        disruptions: Optional[DisruptionRegistry] = None,
     ):
         self.db = db
         self.extractor = extractor
         self.shipment_repo = shipment_repo
+        self.writer = writer
+        self.rollups = rollups or RiskRollupRepository(db)
+        self.disruptions = disruptions if disruptions is not None else disruption_registry
 
     async def create_assessment(self, news_text: str) -> RiskAssessmentModel:
         # 1. Validation (BR-001)
@@ -23,48 +39,215 @@ class RiskAssessmentService:
             raise ValueError("News text cannot be empty")
 
         # 2. Extract Event (BR-002, BR-003, BR-004)
-        event: DisruptionEvent = await self.extractor.parse_snippet(news_text)
+        with ASSESSMENT_STAGE_SECONDS.time(stage="extract"):
+            event, trace = await self._extract(news_text)
 
-        # 3. Identify Impact (BR-005)
-        affected_shipments: Sequence[ShipmentModel] = []
-        if not event.is_unknown() and event.is_disruption:
+        # 3. Identify Impact (BR-005): a cheap count first, then one page of rows.
+        # Regional events also reach shipments bound for nearby ports.
+        count = 0
+        first_page: Sequence[ShipmentRow] = []
+        radius_km = impact_radius_km(event.event_type)
+        if self._needs_impact(event):
             assert event.target_port is not None
-            affected_shipments = await self.shipment_repo.get_by_destination(event.target_port)
+            with ASSESSMENT_STAGE_SECONDS.time(stage="impact_query"):
+                count = await self.shipment_repo.count_by_destination(event.target_port, radius_km=radius_km)
+                if count:
+                    first_page = await self.shipment_repo.get_page_by_destination(
+                        event.target_port, settings.AFFECTED_SHIPMENTS_PAGE_SIZE, radius_km=radius_km
+                    )
 
-        # 4. Formulate Strategy (BR-006, BR-007)
-        strategy = self._generate_strategy(event, affected_shipments)
+        # 4 + 5. Formulate Strategy and Persist Aggregate
+        assessment = self._build_assessment(news_text, event, count, trace)
+        # Shipments booked to the port later join this assessment's impact set until it expires
+        disruption = self._open_disruption(assessment, event, radius_km)
+        with ASSESSMENT_STAGE_SECONDS.time(stage="commit"):
+            if self.writer is not None:
+                names: FrozenSet[str] = frozenset()
+                if count:
+                    assert event.target_port is not None
+                    names = await self.shipment_repo.resolve_destination(event.target_port, radius_km)
+                # End the read transaction first: requests parked on the writer must not
+                # hold the pooled connections its flush needs
+                await self.db.commit()
+                await self.writer.write(assessment, names, self._rollup_increment(assessment, count), disruption)
+            else:
+                self.db.add(assessment)
+                if count or disruption is not None:
+                    # The assessment row must exist before its links and disruption reference it
+                    await self.db.flush()
+                if count:
+                    assert event.target_port is not None
+                    await self.shipment_repo.link_destination(
+                        assessment.assessment_id, event.target_port, radius_km=radius_km
+                    )
+                if disruption is not None:
+                    self.disruptions.stage(self.db, disruption)
+                # Rollups move in the same transaction, so they never disagree with the assessments
+                await self.rollups.record([self._rollup_increment(assessment, count)])
+                await self.db.commit()
 
-        # 5. Persist Aggregate
-        assessment = RiskAssessmentModel(
+        # Attach the transient page so the Pydantic schema can serialize it
+        # (The schema expects 'affected_shipments'; the full set lives in assessment_shipments)
+        self._attach_first_page(assessment, first_page, count)
+
+        return assessment
+
+    async def get_assessment(self, assessment_id: uuid.UUID) -> Optional[RiskAssessmentModel]:
+        assessment = await self.db.get(RiskAssessmentModel, assessment_id)
+        if assessment is None:
+            return None
+        first_page = await self.shipment_repo.get_page_by_assessment(
+            assessment_id, settings.AFFECTED_SHIPMENTS_PAGE_SIZE
+        )
+        count = await self.shipment_repo.count_by_assessment(assessment_id) if first_page else 0
+        self._attach_first_page(assessment, first_page, count)
+        return assessment
+
+    async def get_affected_shipments(
+        self, assessment_id: uuid.UUID, limit: int, after: Optional[str] = None
+    ) -> Optional[Tuple[Sequence[ShipmentRow], Optional[str]]]:
+        """One page of the shipments an assessment affected, with the cursor for the next page."""
+        if await self.db.get(RiskAssessmentModel, assessment_id) is None:
+            return None
+        # One extra row tells us whether another page exists
+        shipments = await self.shipment_repo.get_page_by_assessment(assessment_id, limit + 1, after)
+        if len(shipments) > limit:
+            shipments = shipments[:limit]
+            return shipments, encode_cursor(shipments[-1].id)
+        return shipments, None
+
+    async def create_assessments_batch(
+        self, news_texts: Sequence[str], concurrency: Optional[int] = None
+    ) -> List[Union[RiskAssessmentModel, Exception]]:
+        """Assess many snippets at once; each slot holds either an assessment or its error."""
+        semaphore = asyncio.Semaphore(concurrency or settings.BATCH_EXTRACTION_CONCURRENCY)
+
+        async def extract(text: str) -> Tuple[DisruptionEvent, ExtractionTrace]:
+            if not text.strip():
+                raise ValueError("News text cannot be empty")
+            async with semaphore:
+                return await self._extract(text)
+
+        # 1 + 2. Validate and extract concurrently, keeping per-item failures
+        with ASSESSMENT_STAGE_SECONDS.time(stage="batch_extract"):
+            extracted = await asyncio.gather(*(extract(text) for text in news_texts), return_exceptions=True)
+        events = [e if isinstance(e, BaseException) else e[0] for e in extracted]
+
+        # 3. Identify Impact for every distinct port and radius: counts and first pages only,
+        # so a hub port's shipments never all pass through Python
+        regions = {
+            (e.target_port, impact_radius_km(e.event_type)) for e in events
+            if isinstance(e, DisruptionEvent) and self._needs_impact(e) and e.target_port is not None
+        }
+        page_size = settings.AFFECTED_SHIPMENTS_PAGE_SIZE
+        with ASSESSMENT_STAGE_SECONDS.time(stage="batch_impact_query"):
+            impacts = await self.shipment_repo.get_impact_by_regions(regions, page_size) if regions else {}
+
+        # 4 + 5. Build every aggregate and persist them in one transaction
+        results: List[Union[RiskAssessmentModel, Exception]] = []
+        assessments: List[RiskAssessmentModel] = []
+        links: List[Tuple[uuid.UUID, FrozenSet[str]]] = []
+        increments: List[Optional[RollupIncrement]] = []
+        opened: List[OpenDisruption] = []
+        for text, outcome in zip(news_texts, extracted):
+            if isinstance(outcome, BaseException):
+                results.append(outcome if isinstance(outcome, Exception) else Exception(str(outcome)))
+                continue
+            event, trace = outcome
+            radius_km = impact_radius_km(event.event_type)
+            impact: Optional[RegionImpact] = None
+            if self._needs_impact(event) and event.target_port is not None:
+                impact = impacts.get((event.target_port, radius_km))
+            count = impact.count if impact is not None else 0
+            assessment = self._build_assessment(text, event, count, trace)
+            self._attach_first_page(assessment, impact.first_page if impact is not None else [], count)
+            if impact is not None and count:
+                links.append((assessment.assessment_id, impact.names))
+            increments.append(self._rollup_increment(assessment, count))
+            disruption = self._open_disruption(assessment, event, radius_km)
+            if disruption is not None:
+                opened.append(disruption)
+            assessments.append(assessment)
+            results.append(assessment)
+
+        if assessments:
+            self.db.add_all(assessments)
+            with ASSESSMENT_STAGE_SECONDS.time(stage="batch_commit"):
+                if links or opened:
+                    await self.db.flush()
+                if links:
+                    # INSERT ... SELECT keeps the shipment ids on the database side
+                    await self.shipment_repo.link_names(links)
+                await self.rollups.record(increments)
+                for disruption in opened:
+                    self.disruptions.stage(self.db, disruption)
+                await self.db.commit()
+
+        return results
+
+    async def _extract(self, news_text: str) -> Tuple[DisruptionEvent, ExtractionTrace]:
+        # Extraction layers record how they produced the event on the active trace
+        with trace_extraction() as trace:
+            event = await self.extractor.parse_snippet(news_text)
+        EXTRACTIONS_TOTAL.inc(path=trace.path)
+        return event, trace
+
+    @staticmethod
+    def _needs_impact(event: DisruptionEvent) -> bool:
+        return not event.is_unknown() and event.is_disruption
+
+    def _open_disruption(
+        self, assessment: RiskAssessmentModel, event: DisruptionEvent, radius_km: float
+    ) -> Optional[OpenDisruption]:
+        if not self._needs_impact(event) or event.target_port is None:
+            return None
+        return self.disruptions.opening(assessment.assessment_id, event.target_port, assessment.created_at, radius_km)
+
+    @staticmethod
+    def _rollup_increment(assessment: RiskAssessmentModel, shipment_count: int) -> Optional[RollupIncrement]:
+        return rollup_increment(assessment.detected_event, assessment.created_at, shipment_count)
+
+    @staticmethod
+    def _attach_first_page(assessment: RiskAssessmentModel, page: Sequence[ShipmentRow], count: int) -> None:
+        assessment.affected_shipments = list(page)
+        assessment.affected_shipment_count = count
+        assessment.next_cursor = encode_cursor(page[-1].id) if page and count > len(page) else None
+
+    def _build_assessment(
+        self,
+        news_text: str,
+        event: DisruptionEvent,
+        shipment_count: int,
+        trace: ExtractionTrace,
+    ) -> RiskAssessmentModel:
+        strategy = self._generate_strategy(event, shipment_count)
+        return RiskAssessmentModel(
+            # Generated client-side so no refresh round trip is needed after the insert
+            assessment_id=uuid.uuid4(),
+            created_at=datetime.now(timezone.utc),
             source_snippet=news_text,
             detected_event=event.model_dump(),
             mitigation_strategy=strategy.model_dump(),
-            affected_shipment_ids=[s.id for s in affected_shipments]
+            extraction_path=trace.path,
+            duplicate_similarity=trace.duplicate_similarity,
+            source_tokens=trace.source_tokens,
+            condensed_tokens=trace.condensed_tokens,
         )
-        self.db.add(assessment)
-        await self.db.commit()
-        await self.db.refresh(assessment)
-        
-        # Attach the transient objects so the Pydantic schema can serialize them
-        # (The schema expects 'affected_shipments', but the DB model only has 'affected_shipment_ids')
-        assessment.affected_shipments = list(affected_shipments)
-
-        return assessment
 
-    def _generate_strategy(self, event: DisruptionEvent, shipments: Sequence[ShipmentModel]) -> MitigationAdvice:
+    def _generate_strategy(self, event: DisruptionEvent, shipment_count: int) -> MitigationAdvice:
         if not event.is_disruption:
             return MitigationAdvice(
                 recommendation_text="No action required. Event is non-disruptive.",
                 action_required=False
             )
         
-        if not shipments:
+        if not shipment_count:
              return MitigationAdvice(
                 recommendation_text=f"Disruption at {event.target_port}, but no active shipments found.",
                 action_required=False 
             )
 
         return MitigationAdvice(
-            recommendation_text=f"Action Required: Reroute {len(shipments)} shipments destined for {event.target_port} due to {event.event_type}.",
+            recommendation_text=f"Action Required: Reroute {shipment_count} shipments destined for {event.target_port} due to {event.event_type}.",
             action_required=True
         )
@@ -0,0 +1,225 @@
+import csv
+import json
+import logging
+import time
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Mapping, Optional
+
+import yaml
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.models.shipment import ShipmentModel
+from app.repositories.disruption_registry import DisruptionRegistry, disruption_registry
+from app.repositories.port_index import PortIndex, port_index
+from app.repositories.shipment_repo import ShipmentRepository, last_per_id, upsert_statement
+from app.schemas.shipment import ShipmentImportReport
+
+logger = logging.getLogger(__name__)
+
+SHIPMENT_COLUMNS = ("id", "destination_port", "goods_description")
+FORMATS = ("csv", "ndjson", "yaml")
+
+class ShipmentImportError(Exception):
+    pass
+
+def detect_format(name: str) -> str:
+    """Infer the import format from a file name or a content type."""
+    lowered = name.lower()
+    if lowered.endswith((".csv", "/csv")):
+        return "csv"
+    if lowered.endswith((".ndjson", ".jsonl", "/x-ndjson", "/jsonl")):
+        return "ndjson"
+    if lowered.endswith((".yaml", ".yml", "/yaml", "/x-yaml")):
+        return "yaml"
+    raise ShipmentImportError(f"Cannot infer import format from '{name}'")
+
+def iter_csv_records(stream: IO[str]) -> Iterator[Dict[str, Any]]:
+    yield from csv.DictReader(stream)
+
+def iter_ndjson_records(stream: IO[str]) -> Iterator[Dict[str, Any]]:
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+class _Frame:
+    __slots__ = ("is_mapping", "key")
+
+    def __init__(self, is_mapping: bool):
+        self.is_mapping = is_mapping
+        self.key: Optional[str] = None
+
+def iter_yaml_records(stream: IO[str]) -> Iterator[Dict[str, Any]]:
+    """Stream flat records from a top-level list, or from the list under a top-level 'shipments' key.
+
+    Works on parser events, so only the record being built is held in memory;
+    yaml.safe_load would materialise the whole document first.
+    """
+    stack: List[_Frame] = []
+    records_depth: Optional[int] = None
+    record: Optional[Dict[str, Any]] = None
+
+    for event in yaml.parse(stream, Loader=yaml.SafeLoader):
+        if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+            is_mapping = isinstance(event, yaml.MappingStartEvent)
+            parent = stack[-1] if stack else None
+            if not is_mapping and records_depth is None and (
+                parent is None or (len(stack) == 1 and parent.is_mapping and parent.key == "shipments")
+            ):
+                records_depth = len(stack) + 1
+            elif is_mapping and records_depth is not None and len(stack) == records_depth:
+                record = {}
+            stack.append(_Frame(is_mapping))
+
+        elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            stack.pop()
+            if record is not None and len(stack) == records_depth:
+                yield record
+                record = None
+            elif records_depth is not None and len(stack) < records_depth:
+                records_depth = None
+            if stack and stack[-1].is_mapping:
+                # A nested collection was the value for the pending key
+                stack[-1].key = None
+
+        elif isinstance(event, (yaml.ScalarEvent, yaml.AliasEvent)):
+            frame = stack[-1] if stack else None
+            if frame is None or not frame.is_mapping:
+                continue
+            if frame.key is None:
+                frame.key = getattr(event, "value", None)
+                continue
+            if record is not None and records_depth is not None and len(stack) == records_depth + 1:
+                record[frame.key] = getattr(event, "value", None)
+            frame.key = None
+
+def iter_records(stream: IO[str], fmt: str) -> Iterator[Dict[str, Any]]:
+    if fmt == "csv":
+        return iter_csv_records(stream)
+    if fmt == "ndjson":
+        return iter_ndjson_records(stream)
+    if fmt == "yaml":
+        return iter_yaml_records(stream)
+    raise ShipmentImportError(f"Unsupported import format '{fmt}'")
+
+class ShipmentImporter:
+    """Writes shipment records in chunks with Core bulk upserts, bypassing the ORM.
+
+    PostgreSQL loads each chunk with COPY into a temporary staging table and
+    merges it with INSERT ... ON CONFLICT; other databases use an executemany
+    upsert. Either way the last record for an id wins. Each chunk's shipments
+    join the impact set of any open disruption at their destination.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        chunk_size: Optional[int] = None,
+        index: Optional[PortIndex] = None,
+        disruptions: Optional[DisruptionRegistry] = None,
+    ):
+        self.engine = engine
+        self.chunk_size = chunk_size or settings.SHIPMENT_IMPORT_CHUNK_SIZE
+        self.port_index = index or port_index
+        self.disruptions = disruptions if disruptions is not None else disruption_registry
+
+    async def import_file(self, path: Path, fmt: Optional[str] = None) -> ShipmentImportReport:
+        with open(path, "r", newline="", encoding="utf-8") as stream:
+            return await self.import_stream(stream, fmt or detect_format(path.name))
+
+    async def import_stream(self, stream: IO[str], fmt: str) -> ShipmentImportReport:
+        return await self.import_records(iter_records(stream, fmt))
+
+    async def import_records(self, records: Iterable[Mapping[str, Any]]) -> ShipmentImportReport:
+        started = time.perf_counter()
+        written = rejected = chunks = 0
+        iterator = iter(records)
+        while chunk := list(islice(iterator, self.chunk_size)):
+            rows = []
+            for record in chunk:
+                row = self._clean(record)
+                if row is None:
+                    rejected += 1
+                else:
+                    rows.append(row)
+            if rows:
+                async with self.engine.begin() as conn:
+                    await self._write_chunk(conn, rows)
+                    await self._link_open_disruptions(conn, rows)
+                # Core writes fire no ORM events, so tell the port index directly
+                self.port_index.add_many({row["destination_port"] for row in rows})
+                written += len(rows)
+            chunks += 1
+
+        elapsed = time.perf_counter() - started
+        report = ShipmentImportReport(
+            rows_written=written,
+            rows_rejected=rejected,
+            chunks=chunks,
+            elapsed_seconds=round(elapsed, 3),
+            rows_per_second=round(written / elapsed, 1) if elapsed > 0 else 0.0,
+        )
+        logger.info(
+            f"Imported {report.rows_written} shipments ({report.rows_rejected} rejected) "
+            f"in {report.elapsed_seconds}s, {report.rows_per_second} rows/sec"
+        )
+        return report
+
+    @staticmethod
+    def _clean(record: Mapping[str, Any]) -> Optional[Dict[str, str]]:
+        row = {}
+        for column in SHIPMENT_COLUMNS:
+            value = record.get(column)
+            if value is None or not str(value).strip():
+                return None
+            row[column] = str(value).strip()
+        return row
+
+    async def _write_chunk(self, conn: AsyncConnection, rows: List[Dict[str, str]]) -> None:
+        dialect = conn.dialect.name
+        if dialect == "postgresql":
+            await self._copy_chunk(conn, rows)
+        else:
+            await conn.execute(upsert_statement(dialect), last_per_id(rows))
+
+    async def _link_open_disruptions(self, conn: AsyncConnection, rows: List[Dict[str, str]]) -> None:
+        # In the chunk's transaction, so a shipment is never visible without its disruption links
+        session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+        try:
+            await ShipmentRepository(session, self.port_index, self.disruptions).link_open_disruptions(rows)
+            await session.commit()
+        finally:
+            await session.close()
+
+    async def _copy_chunk(self, conn: AsyncConnection, rows: List[Dict[str, str]]) -> None:
+        # seq numbers rows in COPY order, so the merge can keep each id's last record
+        await conn.execute(text(
+            "CREATE TEMP TABLE IF NOT EXISTS shipments_import_staging "
+            "(LIKE shipments INCLUDING DEFAULTS, seq BIGSERIAL) ON COMMIT DELETE ROWS"
+        ))
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(  # type: ignore[union-attr]
+            "shipments_import_staging",
+            records=[tuple(row[c] for c in SHIPMENT_COLUMNS) for row in rows],
+            columns=list(SHIPMENT_COLUMNS),
+        )
+        staged = text(
+            "SELECT DISTINCT ON (id) id, destination_port, goods_description FROM shipments_import_staging "
+            "ORDER BY id, seq DESC"
+        ).columns(*(ShipmentModel.__table__.c[c] for c in SHIPMENT_COLUMNS))
+        stmt = pg_insert(ShipmentModel.__table__).from_select(list(SHIPMENT_COLUMNS), staged.subquery().select())
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["id"],
+            set_={"destination_port": stmt.excluded.destination_port, "goods_description": stmt.excluded.goods_description},
+        )
+        await conn.execute(stmt)
+
+async def seed_shipments(engine: AsyncEngine, path: Path) -> Optional[ShipmentImportReport]:
+    """Import seed data into an empty shipments table; a no-op once any shipment exists."""
+    async with engine.connect() as conn:
+        if (await conn.execute(select(ShipmentModel.id).limit(1))).first() is not None:
+            return None
+    return await ShipmentImporter(engine).import_file(path)
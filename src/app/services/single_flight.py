@@ -0,0 +1,61 @@
+import asyncio
+from typing import Dict
+
+from app.core.metrics import SINGLE_FLIGHT_CALLS_TOTAL
+from app.schemas.assessment import DisruptionEvent
+from app.services.extraction_cache import normalize_snippet
+from app.services.extraction_service import EventExtractor
+from app.services.extraction_trace import EXTRACTION_PATH_COALESCED, record_extraction_path
+
+class _Flight:
+    __slots__ = ("task", "waiters", "abandoned")
+
+    def __init__(self, task: "asyncio.Task[DisruptionEvent]"):
+        self.task = task
+        self.waiters = 0
+        self.abandoned = False
+
+class SingleFlightExtractionService:
+    """Concurrent calls for the same normalized snippet share one in-flight extraction.
+
+    The first caller starts the extraction in its own task; later callers await
+    that task instead of starting another. Every waiter sees the same event or
+    the same exception. A cancelled waiter only stops waiting, and the
+    extraction itself is cancelled once no caller is left waiting on it.
+    """
+
+    def __init__(self, extractor: EventExtractor):
+        self.extractor = extractor
+        self._in_flight: Dict[str, _Flight] = {}
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    async def parse_snippet(self, text: str) -> DisruptionEvent:
+        key = normalize_snippet(text)
+        flight = self._in_flight.get(key)
+        if flight is None or flight.abandoned:
+            # The task inherits this caller's context, so inner layers still fill in its trace
+            flight = self._in_flight[key] = _Flight(asyncio.create_task(self.extractor.parse_snippet(text)))
+            flight.task.add_done_callback(lambda _, flight=flight: self._forget(key, flight))
+            SINGLE_FLIGHT_CALLS_TOTAL.inc(role="leader")
+        else:
+            SINGLE_FLIGHT_CALLS_TOTAL.inc(role="follower")
+            record_extraction_path(EXTRACTION_PATH_COALESCED)
+
+        flight.waiters += 1
+        try:
+            # Shielded so one waiter's cancellation does not cancel the shared call
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.abandoned = True
+                flight.task.cancel()
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._in_flight.get(key) is flight:
+            del self._in_flight[key]
+        # Retrieve the outcome so an exception nobody awaited is not reported as lost
+        if not flight.task.cancelled():
+            flight.task.exception()
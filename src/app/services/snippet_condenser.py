@@ -0,0 +1,152 @@
+import html
+import math
+import re
+from html.parser import HTMLParser
+from typing import List, NamedTuple, Optional
+
+from app.core.config import settings
+from app.core.metrics import SNIPPET_TOKENS_TOTAL
+from app.schemas.assessment import DisruptionEvent
+from app.services.extraction_service import EventExtractor
+from app.services.extraction_trace import current_trace
+from app.services.relevance_filter import RelevanceScorer, relevance_scorer
+
+# Gemini's rule of thumb is about four characters per token
+_CHARS_PER_TOKEN = 4
+_TAG = re.compile(r"<(?:[a-zA-Z][\w-]*|/[a-zA-Z][\w-]*|!--)[^>]*>")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[\"'“‘(\[]?[A-Z0-9])")
+_BOILERPLATE = re.compile(
+    r"\b(subscribe|sign up|newsletter|cookies?|privacy policy|terms of (use|service)|all rights reserved"
+    r"|copyright|advertisement|sponsored|share (this|on)|follow us|read more|related (articles|stories)"
+    r"|click here|log ?in|register now)\b|©",
+    re.IGNORECASE,
+)
+# Lines this short that look like boilerplate are dropped; longer ones may be real sentences that mention it
+_BOILERPLATE_MAX_WORDS = 12
+# The opening sentence usually says what happened and where
+_LEDE_BONUS = 1.0
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+class CondensedSnippet(NamedTuple):
+    text: str
+    source_tokens: int
+    condensed_tokens: int
+
+class _TextExtractor(HTMLParser):
+    """Visible text of an HTML document, one line per block, without page furniture."""
+
+    _SKIP = frozenset({"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "button", "svg", "iframe"})
+    _BLOCK = frozenset({"p", "div", "br", "li", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "article", "section", "blockquote"})
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP:
+            self._skipping += 1
+        elif tag in self._BLOCK:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIP:
+            self._skipping = max(0, self._skipping - 1)
+        elif tag in self._BLOCK:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skipping:
+            self.parts.append(data)
+
+def strip_markup(text: str) -> str:
+    if not _TAG.search(text):
+        return html.unescape(text)
+    parser = _TextExtractor()
+    parser.feed(text)
+    parser.close()
+    return "".join(parser.parts)
+
+def content_lines(text: str) -> List[str]:
+    """Non-empty lines with whitespace collapsed, dropping short boilerplate and repeats."""
+    lines: List[str] = []
+    seen = set()
+    for line in text.splitlines():
+        line = " ".join(line.split())
+        if not line or line in seen:
+            continue
+        if _BOILERPLATE.search(line) and len(line.split()) <= _BOILERPLATE_MAX_WORDS:
+            continue
+        seen.add(line)
+        lines.append(line)
+    return lines
+
+def split_sentences(lines: List[str]) -> List[str]:
+    return [sentence for line in lines for sentence in _SENTENCE_END.split(line) if sentence]
+
+class SnippetCondenser:
+    """Cuts a scraped article down to the sentences that matter for extraction, within a token budget.
+
+    Markup, page furniture and boilerplate lines are removed first. If the
+    rest still exceeds ``max_tokens``, sentences are ranked by the relevance
+    scorer's port and disruption gazetteer (the opening sentence gets a bonus)
+    and the best are kept, in their original order. Short snippets are
+    returned untouched.
+    """
+
+    def __init__(self, max_tokens: Optional[int] = None, scorer: Optional[RelevanceScorer] = None):
+        self.max_tokens = max_tokens if max_tokens is not None else settings.SNIPPET_MAX_TOKENS
+        self.scorer = scorer if scorer is not None else relevance_scorer
+
+    def condense(self, text: str) -> CondensedSnippet:
+        source_tokens = estimate_tokens(text)
+        stripped = strip_markup(text)
+        if stripped == text and source_tokens <= self.max_tokens and not _BOILERPLATE.search(text):
+            return CondensedSnippet(text, source_tokens, source_tokens)
+
+        sentences = split_sentences(content_lines(stripped))
+        condensed = " ".join(sentences)
+        if estimate_tokens(condensed) > self.max_tokens:
+            condensed = self._select(sentences)
+        if not condensed:
+            # Nothing but boilerplate: let the model see what there was
+            condensed = " ".join(stripped.split())[: self.max_tokens * _CHARS_PER_TOKEN]
+        return CondensedSnippet(condensed, source_tokens, estimate_tokens(condensed))
+
+    def _select(self, sentences: List[str]) -> str:
+        budget = self.max_tokens * _CHARS_PER_TOKEN
+        ranked = sorted(
+            range(len(sentences)),
+            key=lambda i: (-(self.scorer.score(sentences[i]) + (_LEDE_BONUS if i == 0 else 0.0)), i),
+        )
+        chosen: List[int] = []
+        used = 0
+        for i in ranked:
+            # Joining adds one space per sentence
+            cost = len(sentences[i]) + (1 if chosen else 0)
+            if used + cost <= budget:
+                chosen.append(i)
+                used += cost
+        if not chosen and sentences:
+            # A single sentence longer than the budget: keep its beginning
+            return sentences[ranked[0]][:budget]
+        return " ".join(sentences[i] for i in sorted(chosen))
+
+class CondensingExtractionService:
+    """Sends the wrapped extractor a condensed snippet and records both token counts on the trace."""
+
+    def __init__(self, extractor: EventExtractor, condenser: SnippetCondenser):
+        self.extractor = extractor
+        self.condenser = condenser
+
+    async def parse_snippet(self, text: str) -> DisruptionEvent:
+        condensed = self.condenser.condense(text)
+        SNIPPET_TOKENS_TOTAL.inc(condensed.source_tokens, stage="source")
+        SNIPPET_TOKENS_TOTAL.inc(condensed.condensed_tokens, stage="condensed")
+        trace = current_trace()
+        if trace is not None:
+            trace.source_tokens = condensed.source_tokens
+            trace.condensed_tokens = condensed.condensed_tokens
+        return await self.extractor.parse_snippet(condensed.text)
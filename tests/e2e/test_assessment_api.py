@@ -29,7 +29,6 @@ async def test_create_assessment_api_success(mock_service):
             "is_disruption": True, 
             "confidence_score": 0.9
         },
-        affected_shipment_ids=[],
         mitigation_strategy={
             "recommendation_text": "Avoid", 
             "action_required": True
@@ -59,3 +58,316 @@ async def test_create_assessment_api_invalid_input(mock_service):
     assert response.status_code == 422
     
     app.dependency_overrides = {}
+
+@pytest.mark.asyncio
+async def test_create_assessment_batch_api(mock_service):
+    app.dependency_overrides[get_risk_service] = lambda: mock_service
+
+    mock_model = RiskAssessmentModel(
+        assessment_id=uuid4(),
+        created_at=datetime.now(timezone.utc),
+        source_snippet="Strike in Rotterdam......",
+        detected_event={
+            "target_port": "Rotterdam",
+            "event_type": "Strike",
+            "is_disruption": True,
+            "confidence_score": 0.9
+        },
+        mitigation_strategy={
+            "recommendation_text": "Avoid",
+            "action_required": True
+        }
+    )
+    mock_model.affected_shipments = []
+    mock_service.create_assessments_batch.return_value = [mock_model, ValueError("News text cannot be empty")]
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post(
+            "/api/v1/assessments/batch",
+            json={"news_texts": ["Strike in Rotterdam......", "Short", "            "]}
+        )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == ["ok", "error", "error"]
+    assert results[0]["assessment"]["detected_event"]["target_port"] == "Rotterdam"
+    assert results[2]["error"] == "News text cannot be empty"
+
+    # The too-short snippet never reaches the service
+    mock_service.create_assessments_batch.assert_awaited_once_with(["Strike in Rotterdam......", "            "])
+
+    app.dependency_overrides = {}
+
+@pytest.mark.asyncio
+async def test_extraction_service_is_shared_across_requests(mocker):
+    from fastapi import Request
+    from app.db.session import Database
+    from app.deps import get_extraction_service
+
+    # Keep the lifespan off the environment's database and away from Vertex AI
+    mocker.patch("app.main.db", Database("sqlite+aiosqlite:///:memory:", replica_urls=[]))
+    backend = mocker.patch("app.main.LazyExtractionBackend").return_value
+    backend.load = AsyncMock()
+    backend.aclose = AsyncMock()
+    mocker.patch("app.main.settings.SEED_DATA_PATH", "missing.yaml")
+
+    async with app.router.lifespan_context(app):
+        first = get_extraction_service(Request({"type": "http", "app": app}))
+        second = get_extraction_service(Request({"type": "http", "app": app}))
+
+    assert first is second
+    backend.aclose.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_startup_loads_booked_ports_for_the_relevance_filter(mocker, tmp_path):
+    from app.db.session import Database
+    from app.models.shipment import ShipmentModel
+    from app.repositories.port_index import PortIndex
+    from app.services.relevance_filter import RelevanceScorer
+
+    database = Database(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}", replica_urls=[])
+    async with database.engine.begin() as conn:
+        await conn.run_sync(ShipmentModel.__table__.create)
+        await conn.execute(ShipmentModel.__table__.insert().values(id="S1", destination_port="Gdańsk", goods_description="A"))
+    index = PortIndex()
+    scorer = RelevanceScorer(index)
+    assert scorer.score("Gdansk expands") == 0.0
+
+    mocker.patch("app.main.db", database)
+    mocker.patch("app.main.port_index", index)
+    backend = mocker.patch("app.main.LazyExtractionBackend").return_value
+    backend.load = AsyncMock()
+    backend.aclose = AsyncMock()
+    mocker.patch("app.main.settings.SEED_DATA_PATH", "missing.yaml")
+
+    async with app.router.lifespan_context(app):
+        # A port known only from the shipments table counts before any shipment lookup
+        assert scorer.score("Gdansk expands") == 1.0
+
+@pytest.mark.asyncio
+async def test_create_assessment_stream_api(mock_service):
+    import json
+    app.dependency_overrides[get_risk_service] = lambda: mock_service
+
+    mock_model = RiskAssessmentModel(
+        assessment_id=uuid4(),
+        created_at=datetime.now(timezone.utc),
+        source_snippet="Strike in Rotterdam......",
+        detected_event={
+            "target_port": "Rotterdam",
+            "event_type": "Strike",
+            "is_disruption": True,
+            "confidence_score": 0.9
+        },
+        mitigation_strategy={
+            "recommendation_text": "Avoid",
+            "action_required": True
+        }
+    )
+    mock_model.affected_shipments = []
+    mock_service.create_assessment.side_effect = [mock_model, ValueError("News text cannot be empty")]
+
+    async def body():
+        yield b'{"news_text": "Strike in Rotterdam......"}\n{"news_te'
+        yield b'xt": "Short"}\n\n'
+        yield b'not json\n{"news_text": "            "}'
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/api/v1/assessments/stream", content=body())
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert [r["status"] for r in results] == ["ok", "error", "error", "error"]
+    assert results[0]["assessment"]["detected_event"]["target_port"] == "Rotterdam"
+    assert results[3]["error"] == "News text cannot be empty"
+    assert mock_service.create_assessment.await_count == 2
+    # The failed record rolled back the shared session before the next one ran
+    mock_service.db.rollback.assert_awaited_once()
+
+    app.dependency_overrides = {}
+
+@pytest.mark.asyncio
+async def test_assessment_job_api(mock_service):
+    from app.deps import get_job_repo
+    from app.models.job import AssessmentJobModel
+
+    job = AssessmentJobModel(
+        job_id=uuid4(),
+        status="succeeded",
+        news_text="Strike in Rotterdam......",
+        attempts=1,
+        assessment_id=uuid4(),
+        created_at=datetime.now(timezone.utc),
+        finished_at=datetime.now(timezone.utc),
+    )
+    mock_model = RiskAssessmentModel(
+        assessment_id=job.assessment_id,
+        created_at=datetime.now(timezone.utc),
+        source_snippet="Strike in Rotterdam......",
+        detected_event={
+            "target_port": "Rotterdam",
+            "event_type": "Strike",
+            "is_disruption": True,
+            "confidence_score": 0.9
+        },
+        mitigation_strategy={
+            "recommendation_text": "Avoid",
+            "action_required": True
+        }
+    )
+    mock_model.affected_shipments = []
+    mock_jobs = AsyncMock()
+    mock_jobs.enqueue.return_value = AssessmentJobModel(
+        job_id=job.job_id, status="queued", news_text=job.news_text, created_at=job.created_at
+    )
+    mock_jobs.wait_for.return_value = job
+    mock_service.get_assessment.return_value = mock_model
+    app.dependency_overrides[get_job_repo] = lambda: mock_jobs
+    app.dependency_overrides[get_risk_service] = lambda: mock_service
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        submitted = await ac.post("/api/v1/assessments/jobs/", json={"news_text": "Strike in Rotterdam......"})
+        polled = await ac.get(f"/api/v1/assessments/jobs/{job.job_id}", params={"wait": 5})
+
+    assert submitted.status_code == 202
+    assert submitted.json()["status"] == "queued"
+    assert polled.status_code == 200
+    assert polled.json()["status"] == "succeeded"
+    assert polled.json()["assessment"]["detected_event"]["target_port"] == "Rotterdam"
+    assert mock_jobs.wait_for.await_args.args[0] == job.job_id
+
+    app.dependency_overrides = {}
+
+@pytest.mark.asyncio
+async def test_import_shipments_api():
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app.db.base import Base
+    from app.deps import get_shipment_importer
+    from app.repositories.port_index import PortIndex
+    from app.services.shipment_import import ShipmentImporter
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    app.dependency_overrides[get_shipment_importer] = lambda: ShipmentImporter(engine, index=PortIndex())
+
+    body = "id,destination_port,goods_description\nS1,Rotterdam,A\nS2,Hamburg,B\n"
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/api/v1/shipments/import", content=body, headers={"content-type": "text/csv"})
+        unsupported = await ac.post("/api/v1/shipments/import", content=body, headers={"content-type": "text/plain"})
+
+    assert response.status_code == 200
+    assert response.json()["rows_written"] == 2
+    assert unsupported.status_code == 415
+
+    app.dependency_overrides = {}
+    await engine.dispose()
+
+@pytest.mark.asyncio
+async def test_list_affected_shipments_api(mock_service):
+    from app.models.shipment import ShipmentModel
+    app.dependency_overrides[get_risk_service] = lambda: mock_service
+    shipment = ShipmentModel(id="S1", destination_port="Rotterdam", goods_description="Goods")
+    mock_service.get_affected_shipments.side_effect = [([shipment], "UzE"), None]
+    assessment_id = uuid4()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        page = await ac.get(f"/api/v1/assessments/{assessment_id}/shipments", params={"limit": 1})
+        missing = await ac.get(f"/api/v1/assessments/{assessment_id}/shipments", params={"cursor": "UzE"})
+        invalid = await ac.get(f"/api/v1/assessments/{assessment_id}/shipments", params={"cursor": "!"})
+
+    assert page.status_code == 200
+    assert page.json() == {"items": [{"id": "S1", "destination_port": "Rotterdam", "goods_description": "Goods"}], "next_cursor": "UzE"}
+    mock_service.get_affected_shipments.assert_any_await(assessment_id, 1, None)
+    mock_service.get_affected_shipments.assert_any_await(assessment_id, 100, "S1")
+    assert missing.status_code == 404
+    assert invalid.status_code == 400
+
+    app.dependency_overrides = {}
+
+@pytest.mark.asyncio
+async def test_list_shipment_assessments_api():
+    from app.deps import get_assessment_repo, get_shipment_repo
+    from app.models.shipment import ShipmentModel
+    shipments, assessments = AsyncMock(), AsyncMock()
+    app.dependency_overrides[get_shipment_repo] = lambda: shipments
+    app.dependency_overrides[get_assessment_repo] = lambda: assessments
+    assessment = RiskAssessmentModel(
+        assessment_id=uuid4(),
+        created_at=datetime.now(timezone.utc),
+        source_snippet="Strike in Rotterdam",
+        detected_event={"target_port": "Rotterdam", "event_type": "Strike", "is_disruption": True, "confidence_score": 0.9},
+        mitigation_strategy={"recommendation_text": "Avoid", "action_required": True},
+    )
+    shipments.get_by_ids.side_effect = [[ShipmentModel(id="S1", destination_port="Rotterdam", goods_description="A")], []]
+    assessments.get_by_shipment.return_value = [assessment]
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        found = await ac.get("/api/v1/shipments/S1/assessments", params={"limit": 5})
+        missing = await ac.get("/api/v1/shipments/S2/assessments")
+
+    assert found.status_code == 200
+    assert [a["assessment_id"] for a in found.json()] == [str(assessment.assessment_id)]
+    assessments.get_by_shipment.assert_awaited_once_with("S1", 5)
+    assert missing.status_code == 404
+
+    app.dependency_overrides = {}
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(mock_service):
+    from app.core.metrics import HTTP_REQUESTS_TOTAL
+    app.dependency_overrides[get_risk_service] = lambda: mock_service
+    mock_service.create_assessment.side_effect = RuntimeError("boom")
+    served = HTTP_REQUESTS_TOTAL.value(method="POST", status="500")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        await ac.post("/api/v1/assessments/", json={"news_text": "Strike at the Port of Rotterdam"})
+        response = await ac.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'errors_total{type="RuntimeError"}' in response.text
+    assert "http_requests_in_flight 1" in response.text
+    assert HTTP_REQUESTS_TOTAL.value(method="POST", status="500") == served + 1
+
+    app.dependency_overrides = {}
+
+@pytest.mark.asyncio
+async def test_analytics_disruptions_by_day_and_range_checks():
+    from datetime import timedelta
+    from app.deps import get_rollup_repo
+    from app.repositories.rollup_repo import RollupIncrement
+
+    day = datetime(2026, 10, 17, tzinfo=timezone.utc)
+    rollups = AsyncMock()
+    rollups.get_buckets.return_value = [
+        RollupIncrement("Rotterdam", day + timedelta(hours=1), 2, 1, 5),
+        RollupIncrement("Rotterdam", day + timedelta(hours=7), 1, 1, 3),
+    ]
+    app.dependency_overrides[get_rollup_repo] = lambda: rollups
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get(
+            "/api/v1/analytics/disruptions",
+            params={"start": "2026-10-17T00:00:00Z", "end": "2026-10-18T00:00:00Z", "bucket": "day"},
+        )
+        backwards = await ac.get(
+            "/api/v1/analytics/disruptions", params={"start": "2026-10-18T00:00:00Z", "end": "2026-10-17T00:00:00Z"}
+        )
+        too_long = await ac.get("/api/v1/analytics/shipments-at-risk", params={"start": "2020-01-01T00:00:00Z"})
+
+    assert response.status_code == 200
+    assert response.json() == [{
+        "port": "Rotterdam",
+        "bucket_start": "2026-10-17T00:00:00Z",
+        "assessments": 3,
+        "disruptions": 2,
+        "shipments_at_risk": 8,
+    }]
+    assert rollups.get_buckets.call_args.args == (day, day + timedelta(days=1))
+    assert backwards.status_code == 400
+    assert too_long.status_code == 400
+
+    app.dependency_overrides = {}
@@ -32,8 +32,7 @@ async def test_assessment_persistence(db_session):
     assessment = RiskAssessmentModel(
         source_snippet="Strike in Rotterdam",
         detected_event=event_data,
-        mitigation_strategy={"action_required": True, "recommendation_text": "Avoid"},
-        affected_shipment_ids=["SCH-123"]
+        mitigation_strategy={"action_required": True, "recommendation_text": "Avoid"}
     )
     
     db_session.add(assessment)
@@ -47,4 +46,3 @@ async def test_assessment_persistence(db_session):
     retrieved = result.scalar_one()
     
     assert retrieved.detected_event["target_port"] == "Rotterdam"
-    assert retrieved.affected_shipment_ids == ["SCH-123"]
@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import select
+from app.db.base import Base
+from app.db.query_counter import QueryCounter
+from app.db.session import Database
+from app.models.job import AssessmentJobModel
+from app.models.shipment import ShipmentModel
+from app.repositories.job_repo import AssessmentJobRepository
+from app.repositories.shipment_repo import ShipmentRepository
+from app.repositories.port_index import PortIndex
+
+@pytest.fixture
+async def database(tmp_path):
+    database = Database(f"sqlite+aiosqlite:///{tmp_path}/primary.db", [f"sqlite+aiosqlite:///{tmp_path}/replica.db"])
+    for engine, port in zip(database.engines, ["Rotterdam", "Hamburg"]):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        # Distinct rows tell the two databases apart
+        async with database.sessionmaker(bind=engine) as session:
+            session.add(ShipmentModel(id="S1", destination_port=port, goods_description="Goods"))
+            await session.commit()
+    yield database
+    await database.dispose()
+
+@pytest.mark.asyncio
+async def test_plain_reads_go_to_the_replica(database):
+    primary, replica = database.engines
+    async with database.sessionmaker() as session:
+        with QueryCounter(primary) as on_primary, QueryCounter(replica) as on_replica:
+            shipments = await ShipmentRepository(session, PortIndex()).get_by_destination("Hamburg")
+
+    assert [s.destination_port for s in shipments] == ["Hamburg"]
+    assert on_primary.count == 0 and on_replica.count > 0
+
+@pytest.mark.asyncio
+async def test_writes_pin_the_session_to_the_primary(database):
+    primary, replica = database.engines
+    async with database.sessionmaker() as session:
+        session.add(ShipmentModel(id="S2", destination_port="Rotterdam", goods_description="More goods"))
+        await session.commit()
+        with QueryCounter(replica) as on_replica:
+            # Reads after a write see that write
+            ids = (await session.execute(select(ShipmentModel.id).order_by(ShipmentModel.id))).scalars().all()
+
+    assert ids == ["S1", "S2"]
+    assert on_replica.count == 0
+
+@pytest.mark.asyncio
+async def test_locking_reads_go_to_the_primary(database):
+    async with database.sessionmaker() as session:
+        await AssessmentJobRepository(session).enqueue("Strike in Rotterdam")
+    async with database.sessionmaker() as session:
+        stmt = select(AssessmentJobModel).with_for_update()
+        assert len((await session.execute(stmt)).scalars().all()) == 1
+
+@pytest.mark.asyncio
+async def test_job_queue_reads_use_the_primary(database):
+    primary, replica = database.engines
+    async with database.sessionmaker() as session:
+        with QueryCounter(replica) as on_replica:
+            assert await AssessmentJobRepository(session).claim_next() is None
+    assert on_replica.count == 0
+
+@pytest.mark.asyncio
+async def test_without_replicas_everything_uses_the_primary(tmp_path):
+    database = Database(f"sqlite+aiosqlite:///{tmp_path}/only.db", replica_urls=[])
+    async with database.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with database.sessionmaker() as session:
+        session.add(ShipmentModel(id="S1", destination_port="Rotterdam", goods_description="Goods"))
+        await session.commit()
+    async with database.sessionmaker() as session:
+        assert (await session.execute(select(ShipmentModel.id))).scalars().all() == ["S1"]
+    assert database.engines == [database.engine]
+    await database.dispose()
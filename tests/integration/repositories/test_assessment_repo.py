@@ -0,0 +1,40 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from app.models.assessment import RiskAssessmentModel
+from app.models.shipment import ShipmentModel
+from app.repositories.assessment_repo import AssessmentRepository
+from app.repositories.shipment_repo import ShipmentRepository
+from app.db.base import Base
+
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+@pytest.fixture
+async def db_session():
+    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with SessionLocal() as session:
+        yield session
+
+    await engine.dispose()
+
+@pytest.mark.asyncio
+async def test_get_by_shipment_newest_first(db_session):
+    now = datetime.now(timezone.utc)
+    older, newer, unrelated = (
+        RiskAssessmentModel(source_snippet=text, detected_event={}, mitigation_strategy={}, created_at=created_at)
+        for text, created_at in (("older", now - timedelta(hours=1)), ("newer", now), ("unrelated", now))
+    )
+    db_session.add_all([ShipmentModel(id="S1", destination_port="Rotterdam", goods_description="A"), older, newer, unrelated])
+    await db_session.flush()
+    await ShipmentRepository(db_session).add_links([(older.assessment_id, "S1"), (newer.assessment_id, "S1")])
+    await db_session.commit()
+
+    repo = AssessmentRepository(db_session)
+
+    assert [a.source_snippet for a in await repo.get_by_shipment("S1", limit=10)] == ["newer", "older"]
+    assert [a.source_snippet for a in await repo.get_by_shipment("S1", limit=1)] == ["newer"]
+    assert list(await repo.get_by_shipment("S2", limit=10)) == []
@@ -0,0 +1,97 @@
+import pytest
+import uuid
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from app.models.shipment import ShipmentModel
+from app.repositories.disruption_registry import DisruptionRegistry
+from app.repositories.port_index import PortIndex
+from app.repositories.rollup_repo import RiskRollupRepository
+from app.repositories.shipment_repo import ShipmentRepository
+from app.services.fake_extraction_service import FakeExtractionService
+from app.services.risk_service import RiskAssessmentService
+from app.db.base import Base
+
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+@pytest.fixture
+async def db_session():
+    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with SessionLocal() as session:
+        yield session
+
+    await engine.dispose()
+
+@pytest.fixture
+def registry():
+    return DisruptionRegistry(ttl_hours=72, max_age_seconds=3600)
+
+def make_service(session, registry):
+    return RiskAssessmentService(
+        session,
+        FakeExtractionService(latency_median_ms=0, latency_sigma=0, error_rate=0),
+        ShipmentRepository(session, PortIndex(), registry),
+        disruptions=registry,
+    )
+
+def shipment(shipment_id, port):
+    return {"id": shipment_id, "destination_port": port, "goods_description": "Goods"}
+
+def test_match_uses_canonical_keys_and_drops_expired_entries(registry):
+    now = datetime.now(timezone.utc)
+    strike = registry.opening(uuid.uuid4(), "Port of Ningbo", now)
+    stale = registry.opening(uuid.uuid4(), "Ningbo", now - timedelta(hours=100))
+    registry.add(strike)
+    registry.add(stale)
+
+    assert registry.match("NINGBO-Zhoushan") == [strike]
+    assert registry.match("Shanghai") == []
+    assert len(registry) == 1
+
+@pytest.mark.asyncio
+async def test_shipments_written_after_an_assessment_join_its_impact_set(db_session, registry):
+    db_session.add(ShipmentModel(id="S1", destination_port="Rotterdam", goods_description="A"))
+    await db_session.commit()
+    service = make_service(db_session, registry)
+    assessment = await service.create_assessment("Dock workers at Rotterdam begin a strike.")
+    assert assessment.affected_shipment_count == 1
+
+    repo = ShipmentRepository(db_session, PortIndex(), registry)
+    added = await repo.upsert([shipment("S2", "Port of Rotterdam"), shipment("S3", "Hamburg")])
+    await db_session.commit()
+
+    assert added == 1
+    assert await repo.count_by_assessment(assessment.assessment_id) == 2
+    # Re-sending a shipment the assessment already covers adds nothing
+    assert await repo.upsert([shipment("S1", "Rotterdam"), shipment("S2", "Rotterdam")]) == 0
+    await db_session.commit()
+
+    bucket_start = assessment.created_at.replace(minute=0, second=0, microsecond=0)
+    buckets = await RiskRollupRepository(db_session).get_buckets(bucket_start, bucket_start + timedelta(hours=1))
+    assert [(b.port, b.shipments_at_risk) for b in buckets] == [("rotterdam", 2)]
+
+@pytest.mark.asyncio
+async def test_registry_reloads_open_disruptions_from_the_table(db_session, registry):
+    service = make_service(db_session, registry)
+    await service.create_assessments_batch(["Typhoon warning for Rotterdam terminals.", "Central bank holds rates."])
+
+    reloaded = DisruptionRegistry(ttl_hours=72, max_age_seconds=3600)
+    await reloaded.refresh(db_session)
+
+    assert [d.port for d in reloaded.match("Rotterdam")] == ["Rotterdam"]
+    assert reloaded.match("Rotterdam") == registry.match("Rotterdam")
+
+@pytest.mark.asyncio
+async def test_rolled_back_disruptions_are_not_registered(db_session, registry):
+    service = make_service(db_session, registry)
+    service.rollups.record = None  # type: ignore[method-assign]
+
+    with pytest.raises(TypeError):
+        await service.create_assessment("Dock workers at Rotterdam begin a strike.")
+    await db_session.rollback()
+
+    assert registry.match("Rotterdam") == []
+
@@ -0,0 +1,103 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from app.models.job import JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED
+from app.repositories.job_repo import AssessmentJobRepository
+from app.db.base import Base
+from uuid import uuid4
+
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+@pytest.fixture
+async def db_session():
+    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with SessionLocal() as session:
+        yield session
+    
+    await engine.dispose()
+
+@pytest.mark.asyncio
+async def test_claim_next_takes_oldest_queued_job(db_session):
+    repo = AssessmentJobRepository(db_session)
+    first = await repo.enqueue("Strike in Rotterdam")
+    second = await repo.enqueue("Storm in Hamburg")
+
+    claimed = await repo.claim_next()
+    assert claimed.job_id == first.job_id
+    assert claimed.status == JOB_RUNNING
+    assert claimed.attempts == 1
+    assert claimed.claimed_at is not None
+
+    assert (await repo.claim_next()).job_id == second.job_id
+    assert await repo.claim_next() is None
+
+@pytest.mark.asyncio
+async def test_complete_and_fail(db_session):
+    repo = AssessmentJobRepository(db_session)
+    ok = await repo.enqueue("Strike in Rotterdam")
+    bad = await repo.enqueue("Storm in Hamburg")
+    assessment_id = uuid4()
+
+    await repo.complete(await repo.claim_next(), assessment_id)
+    await repo.fail(await repo.claim_next(), "AI Extraction failed")
+
+    ok = await repo.get(ok.job_id)
+    bad = await repo.get(bad.job_id)
+    assert (ok.status, ok.assessment_id) == (JOB_SUCCEEDED, assessment_id)
+    assert (bad.status, bad.error) == (JOB_FAILED, "AI Extraction failed")
+    assert ok.is_finished() and bad.is_finished()
+
+@pytest.mark.asyncio
+async def test_wait_for_returns_unfinished_job_after_timeout(db_session):
+    repo = AssessmentJobRepository(db_session)
+    job = await repo.enqueue("Strike in Rotterdam")
+
+    waited = await repo.wait_for(job.job_id, timeout=0.05, poll_interval=0.01)
+
+    assert waited.status == JOB_QUEUED
+
+@pytest.mark.asyncio
+async def test_requeue_stale_running_jobs(db_session):
+    repo = AssessmentJobRepository(db_session)
+    await repo.enqueue("Strike in Rotterdam")
+    job = await repo.claim_next()
+    job.claimed_at = datetime.now(timezone.utc) - timedelta(minutes=10)
+    await db_session.commit()
+
+    assert await repo.requeue_stale(60, max_attempts=3) == (1, 0)
+    assert (await repo.claim_next()).attempts == 2
+
+@pytest.mark.asyncio
+async def test_stale_jobs_out_of_attempts_are_failed(db_session):
+    repo = AssessmentJobRepository(db_session)
+    await repo.enqueue("Strike in Rotterdam")
+    for _ in range(2):
+        job = await repo.claim_next()
+        job.claimed_at = datetime.now(timezone.utc) - timedelta(minutes=10)
+        await db_session.commit()
+        stale = await repo.requeue_stale(60, max_attempts=2)
+
+    assert stale == (0, 1)
+    job = await repo.get(job.job_id)
+    assert job.status == JOB_FAILED
+    assert job.attempts == 2
+    assert "2 attempts" in job.error
+    assert await repo.claim_next() is None
+
+@pytest.mark.asyncio
+async def test_wait_for_keeps_earlier_results_loaded(db_session):
+    repo = AssessmentJobRepository(db_session)
+    done = await repo.enqueue("Strike in Rotterdam")
+    pending = await repo.enqueue("Strike in Hamburg")
+    await repo.fail(done, "API Error")
+
+    done = await repo.wait_for(done.job_id, timeout=1, poll_interval=0.01)
+    await repo.wait_for(pending.job_id, timeout=0.05, poll_interval=0.01)
+
+    # Polling for the second job must not expire the first one
+    db_session.expunge_all()
+    assert done.status == JOB_FAILED
@@ -0,0 +1,135 @@
+import numpy as np
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from app.models.shipment import ShipmentModel
+from app.repositories.disruption_registry import DisruptionRegistry
+from app.repositories.port_index import PortIndex
+from app.repositories.port_proximity import (
+    KDTree,
+    PortProximityIndex,
+    chord_length,
+    great_circle_km,
+    impact_radius_km,
+    seed_ports,
+    unit_vectors,
+)
+from app.repositories.shipment_repo import ShipmentRepository
+from app.services.fake_extraction_service import FakeExtractionService
+from app.services.risk_service import RiskAssessmentService
+from app.db.base import Base
+
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+RADII = {"typhoon": 400.0, "weather": 250.0}
+
+@pytest.fixture
+async def db_session():
+    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with SessionLocal() as session:
+        yield session
+
+    await engine.dispose()
+
+@pytest.fixture
+async def proximity(db_session):
+    index = PortProximityIndex()
+    assert await seed_ports(db_session) > 0
+    await index.refresh(db_session)
+    return index
+
+def make_service(session, proximity, registry):
+    return RiskAssessmentService(
+        session,
+        FakeExtractionService(latency_median_ms=0, latency_sigma=0, error_rate=0),
+        ShipmentRepository(session, PortIndex(), registry, proximity),
+        disruptions=registry,
+    )
+
+def shipment(shipment_id, port):
+    return {"id": shipment_id, "destination_port": port, "goods_description": "Goods"}
+
+def test_tree_radius_queries_match_a_brute_force_scan():
+    rng = np.random.default_rng(7)
+    latitudes, longitudes = rng.uniform(-80, 80, 1000), rng.uniform(-180, 180, 1000)
+    tree = KDTree(unit_vectors(latitudes, longitudes), leaf_size=8)
+
+    for i, radius_km in enumerate((50.0, 400.0, 2500.0)):
+        found = set(tree.query_radius(tree.points[i], chord_length(radius_km)))
+        expected = {
+            j for j in range(1000)
+            if great_circle_km((latitudes[i], longitudes[i]), (latitudes[j], longitudes[j])) <= radius_km
+        }
+        assert found == expected
+
+@pytest.mark.asyncio
+async def test_ports_within_a_radius_answer_to_canonical_keys(proximity):
+    assert proximity.keys_within("Port of Shenzhen", 400) == {"shenzhen", "hong kong", "guangzhou"}
+    # Compound catalogue names answer to each part
+    assert {"ningbo", "zhoushan", "shanghai"} <= proximity.keys_within("Shanghai", 400)
+    assert proximity.keys_within("Shenzhen", 0) == {"shenzhen"}
+    assert proximity.keys_within("Atlantis", 400) == {"atlantis"}
+
+def test_impact_radius_takes_the_largest_matching_event_type():
+    assert impact_radius_km("Typhoon", RADII, 0.0) == 400.0
+    assert impact_radius_km("Severe weather", RADII, 0.0) == 250.0
+    assert impact_radius_km("Strike", RADII, 0.0) == 0.0
+    assert impact_radius_km(None, RADII, 10.0) == 10.0
+
+@pytest.mark.asyncio
+async def test_regional_events_reach_shipments_bound_for_nearby_ports(db_session, proximity):
+    db_session.add_all([
+        ShipmentModel(id="S1", destination_port="Shenzhen", goods_description="A"),
+        ShipmentModel(id="S2", destination_port="HK", goods_description="B"),
+        ShipmentModel(id="S3", destination_port="Port of Guangzhou", goods_description="C"),
+        ShipmentModel(id="S4", destination_port="Xiamen", goods_description="D"),
+    ])
+    await db_session.commit()
+    registry = DisruptionRegistry(ttl_hours=72, max_age_seconds=3600, proximity=proximity)
+    service = make_service(db_session, proximity, registry)
+
+    typhoon = await service.create_assessment("Typhoon warning for Shenzhen terminals.")
+    strike = await service.create_assessment("Dock workers at Shenzhen begin a strike.")
+    batch = await service.create_assessments_batch(["Typhoon warning for Shenzhen terminals."])
+
+    assert [s.id for s in typhoon.affected_shipments] == ["S1", "S2", "S3"]
+    assert [s.id for s in strike.affected_shipments] == ["S1"]
+    assert [s.id for s in batch[0].affected_shipments] == ["S1", "S2", "S3"]
+
+@pytest.mark.asyncio
+async def test_shipments_booked_near_an_open_disruption_join_its_impact_set(db_session, proximity):
+    registry = DisruptionRegistry(ttl_hours=72, max_age_seconds=3600, proximity=proximity)
+    service = make_service(db_session, proximity, registry)
+    typhoon = await service.create_assessment("Typhoon warning for Shenzhen terminals.")
+
+    repo = ShipmentRepository(db_session, PortIndex(), registry, proximity)
+    assert await repo.upsert([shipment("S1", "Hong Kong"), shipment("S2", "Xiamen")]) == 1
+    await db_session.commit()
+    assert await repo.count_by_assessment(typhoon.assessment_id) == 1
+
+    # The radius survives a reload from the table
+    reloaded = DisruptionRegistry(ttl_hours=72, max_age_seconds=3600, proximity=proximity)
+    await reloaded.refresh(db_session)
+    assert [d.assessment_id for d in reloaded.match("Guangzhou")] == [typhoon.assessment_id]
+    assert reloaded.match("Xiamen") == []
+    assert len(reloaded) == 1
+
+@pytest.mark.asyncio
+async def test_shipments_join_disruptions_another_worker_opened_since_the_last_reload(db_session, proximity):
+    other_worker = DisruptionRegistry(ttl_hours=72, max_age_seconds=3600, proximity=proximity)
+    this_worker = DisruptionRegistry(ttl_hours=72, max_age_seconds=3600, proximity=proximity)
+    await this_worker.refresh(db_session)
+
+    service = make_service(db_session, proximity, other_worker)
+    typhoon = await service.create_assessment("Typhoon warning for Shenzhen terminals.")
+    strike = await service.create_assessment("Dock workers at Rotterdam begin a strike.")
+    assert len(this_worker) == 0
+
+    repo = ShipmentRepository(db_session, PortIndex(), this_worker, proximity)
+    shipments = [shipment("S1", "Hong Kong"), shipment("S2", "Port of Rotterdam"), shipment("S3", "Xiamen")]
+    assert await repo.upsert(shipments) == 2
+    await db_session.commit()
+    assert await repo.count_by_assessment(typhoon.assessment_id) == 1
+    assert await repo.count_by_assessment(strike.assessment_id) == 1
@@ -0,0 +1,80 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from app.models.shipment import ShipmentModel
+from app.repositories.port_index import PortIndex
+from app.repositories.rollup_repo import RiskRollupRepository, rollup_increment
+from app.repositories.shipment_repo import ShipmentRepository
+from app.services.fake_extraction_service import FakeExtractionService
+from app.services.risk_service import RiskAssessmentService
+from app.db.base import Base
+
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+HOUR = datetime(2026, 10, 17, 9, tzinfo=timezone.utc)
+
+@pytest.fixture
+async def db_session():
+    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with SessionLocal() as session:
+        yield session
+
+    await engine.dispose()
+
+def strike(port, minutes, shipments=0, disruptive=True):
+    event = {"target_port": port, "event_type": "Strike", "is_disruption": disruptive, "confidence_score": 0.9}
+    return rollup_increment(event, HOUR + timedelta(minutes=minutes), shipments)
+
+@pytest.mark.asyncio
+async def test_record_merges_and_accumulates_hourly_buckets(db_session):
+    rollups = RiskRollupRepository(db_session)
+
+    # Spellings of one port share its canonical series
+    await rollups.record([strike("Rotterdam", 5, 10), strike("Port of Rotterdam", 50, 4), strike("Hamburg", 70, 2), None])
+    await db_session.commit()
+    # A later transaction adds to the same bucket
+    await rollups.record([strike("ROTTERDAM", 30, 1, disruptive=False)])
+    await db_session.commit()
+
+    buckets = await rollups.get_buckets(HOUR, HOUR + timedelta(hours=2))
+    assert [tuple(b) for b in buckets] == [
+        ("rotterdam", HOUR, 3, 2, 14),
+        ("hamburg", HOUR + timedelta(hours=1), 1, 1, 2),
+    ]
+    assert [b.port for b in await rollups.get_buckets(HOUR, HOUR + timedelta(hours=2), port="Port of Hamburg")] == ["hamburg"]
+    assert await rollups.get_buckets(HOUR + timedelta(hours=2), HOUR + timedelta(hours=3)) == []
+
+@pytest.mark.asyncio
+async def test_port_totals_rank_by_shipments_at_risk(db_session):
+    rollups = RiskRollupRepository(db_session)
+    await rollups.record([strike("Rotterdam", 5, 3), strike("Hamburg", 70, 2), strike("Hamburg", 130, 5)])
+    await db_session.commit()
+
+    totals = await rollups.get_port_totals(HOUR, HOUR + timedelta(hours=3), limit=10)
+
+    assert [tuple(t) for t in totals] == [("hamburg", 2, 2, 7), ("rotterdam", 1, 1, 3)]
+    assert len(await rollups.get_port_totals(HOUR, HOUR + timedelta(hours=3), limit=1)) == 1
+
+@pytest.mark.asyncio
+async def test_assessments_update_rollups_as_they_are_written(db_session):
+    db_session.add_all([
+        ShipmentModel(id="S1", destination_port="Rotterdam", goods_description="A"),
+        ShipmentModel(id="S2", destination_port="Rotterdam", goods_description="B"),
+    ])
+    await db_session.commit()
+    service = RiskAssessmentService(
+        db_session,
+        FakeExtractionService(latency_median_ms=0, latency_sigma=0, error_rate=0),
+        ShipmentRepository(db_session, PortIndex()),
+    )
+
+    single = await service.create_assessment("Dock workers at Rotterdam begin a strike.")
+    await service.create_assessments_batch(["Typhoon warning for Rotterdam terminals.", "Central bank holds rates."])
+
+    bucket_start = single.created_at.replace(minute=0, second=0, microsecond=0)
+    buckets = await RiskRollupRepository(db_session).get_buckets(bucket_start, bucket_start + timedelta(hours=2))
+    assert sum(b.assessments for b in buckets) == 2
+    assert sum(b.shipments_at_risk for b in buckets) == 4
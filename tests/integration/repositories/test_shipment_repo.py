@@ -1,8 +1,12 @@
 import pytest
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from app.models.assessment import RiskAssessmentModel
 from app.models.shipment import ShipmentModel
-from app.repositories.shipment_repo import ShipmentRepository
+from app.repositories.shipment_repo import ShipmentRepository, last_per_id
+from app.repositories.port_index import PortIndex
 from app.db.base import Base
+from sqlalchemy import insert
+import yaml
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
@@ -41,3 +45,116 @@ async def test_get_by_destination(seeded_session):
     # No match
     results_empty = await repo.get_by_destination("Unknown")
     assert len(results_empty) == 0
+
+@pytest.mark.asyncio
+async def test_count_and_keyset_pages(seeded_session):
+    repo = ShipmentRepository(seeded_session)
+
+    assert await repo.count_by_destination("Port of Rotterdam") == 2
+    assert await repo.count_by_destination("Unknown") == 0
+
+    first = await repo.get_page_by_destination("Rotterdam", limit=1)
+    second = await repo.get_page_by_destination("Rotterdam", limit=1, after=first[-1].id)
+    third = await repo.get_page_by_destination("Rotterdam", limit=1, after=second[-1].id)
+    assert [s.id for s in first + second] == ["S1", "S2"]
+    assert list(third) == []
+
+@pytest.mark.asyncio
+async def test_impact_by_regions_reads_counts_and_first_pages(seeded_session):
+    seeded_session.add(ShipmentModel(id="S0", destination_port="Port of Rotterdam", goods_description="Z"))
+    await seeded_session.commit()
+    repo = ShipmentRepository(seeded_session, PortIndex())
+
+    impacts = await repo.get_impact_by_regions([("Rotterdam", 0.0), ("Hamburg", 0.0), ("Unknown", 0.0)], page_size=2)
+
+    rotterdam = impacts[("Rotterdam", 0.0)]
+    assert rotterdam.names == {"Rotterdam", "Port of Rotterdam"}
+    assert rotterdam.count == 3
+    # The page spans both stored spellings, in id order
+    assert [s.id for s in rotterdam.first_page] == ["S0", "S1"]
+    assert (impacts[("Hamburg", 0.0)].count, [s.id for s in impacts[("Hamburg", 0.0)].first_page]) == (1, ["S3"])
+    assert impacts[("Unknown", 0.0)] == (frozenset(), 0, [])
+
+@pytest.mark.asyncio
+async def test_assessment_links(seeded_session):
+    repo = ShipmentRepository(seeded_session)
+    first = RiskAssessmentModel(source_snippet="a", detected_event={}, mitigation_strategy={})
+    second = RiskAssessmentModel(source_snippet="b", detected_event={}, mitigation_strategy={})
+    seeded_session.add_all([first, second])
+    await seeded_session.flush()
+
+    assert await repo.link_destination(first.assessment_id, "Port of Rotterdam") == 2
+    await repo.link_names([(second.assessment_id, frozenset({"Hamburg"}))])
+    await seeded_session.commit()
+
+    assert await repo.count_by_assessment(first.assessment_id) == 2
+    page = await repo.get_page_by_assessment(first.assessment_id, limit=1)
+    rest = await repo.get_page_by_assessment(first.assessment_id, limit=5, after=page[-1].id)
+    assert [s.id for s in page + rest] == ["S1", "S2"]
+    assert [s.id for s in await repo.get_page_by_assessment(second.assessment_id, limit=5)] == ["S3"]
+
+@pytest.mark.asyncio
+async def test_get_by_destination_normalizes_names(db_session):
+    db_session.add_all([
+        ShipmentModel(id="L1", destination_port="Los Angeles", goods_description="A"),
+        ShipmentModel(id="L2", destination_port="Port of LA", goods_description="B"),
+        ShipmentModel(id="G1", destination_port="Göteborg", goods_description="C"),
+    ])
+    await db_session.commit()
+    repo = ShipmentRepository(db_session, PortIndex())
+
+    for name in ("LA", "los angeles", "Port of Los Angeles", "L.A."):
+        results = await repo.get_by_destination(name)
+        assert {s.id for s in results} == {"L1", "L2"}
+
+    assert {s.id for s in await repo.get_by_destination("Goteborg")} == {"G1"}
+
+@pytest.mark.asyncio
+async def test_port_index_tracks_new_shipments(seeded_session):
+    repo = ShipmentRepository(seeded_session)
+    assert len(await repo.get_by_destination("Antwerp")) == 0
+
+    # Inserts after the index was loaded are picked up without a reload
+    seeded_session.add(ShipmentModel(id="S4", destination_port="Antwerpen", goods_description="D"))
+    await seeded_session.commit()
+
+    assert [s.id for s in await repo.get_by_destination("Port of Antwerp")] == ["S4"]
+
+@pytest.mark.asyncio
+async def test_upsert_keeps_the_last_record_for_a_repeated_id(db_session):
+    repo = ShipmentRepository(db_session, PortIndex())
+    rows = [
+        {"id": "S1", "destination_port": "Rotterdam", "goods_description": "A"},
+        {"id": "S2", "destination_port": "Hamburg", "goods_description": "B"},
+        {"id": "S1", "destination_port": "Antwerp", "goods_description": "A2"},
+    ]
+    # One ON CONFLICT statement may not touch a row twice on PostgreSQL
+    assert [(r["id"], r["goods_description"]) for r in last_per_id(rows)] == [("S1", "A2"), ("S2", "B")]
+
+    await repo.upsert(rows)
+    await db_session.commit()
+
+    assert [s.id for s in await repo.get_by_destination("Antwerp")] == ["S1"]
+    assert await repo.get_by_destination("Rotterdam") == []
+
+@pytest.mark.asyncio
+async def test_port_index_sees_writes_made_outside_the_orm(db_session):
+    repo = ShipmentRepository(db_session, PortIndex(miss_max_age_seconds=0))
+    assert len(await repo.get_by_destination("Busan")) == 0
+
+    # A Core insert (as another worker or a bulk load would do) fires no ORM events
+    await db_session.execute(insert(ShipmentModel).values(id="B1", destination_port="Busan", goods_description="E"))
+    await db_session.commit()
+
+    assert [s.id for s in await repo.get_by_destination("Busan")] == ["B1"]
+
+@pytest.mark.asyncio
+async def test_every_seed_port_is_reachable_by_its_parts(db_session):
+    with open("seed_data.yaml") as f:
+        seed = yaml.safe_load(f)["shipments"]
+    db_session.add_all([ShipmentModel(**item) for item in seed])
+    await db_session.commit()
+    repo = ShipmentRepository(db_session, PortIndex())
+
+    for name in ("Ningbo", "Zhoushan", "New Jersey", "New York", "Klang", "Port Klang", "Ho Chi Minh City"):
+        assert len(await repo.get_by_destination(name)) == 2, name
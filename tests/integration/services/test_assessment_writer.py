@@ -0,0 +1,120 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.db.query_counter import QueryCounter
+from app.models.assessment import RiskAssessmentModel
+from app.models.active_disruption import ActiveDisruptionModel
+from app.models.assessment_shipment import AssessmentShipmentModel
+from app.models.shipment import ShipmentModel
+from app.repositories.disruption_registry import DisruptionRegistry
+from app.repositories.port_index import PortIndex
+from app.repositories.shipment_repo import ShipmentRepository
+from app.services.assessment_writer import AssessmentWriteCoalescer
+from app.services.fake_extraction_service import FakeExtractionService
+from app.services.risk_service import RiskAssessmentService
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+@pytest.fixture
+async def sessionmaker(engine):
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    async with sessionmaker() as session:
+        session.add_all([
+            ShipmentModel(id="S1", destination_port="Rotterdam", goods_description="A"),
+            ShipmentModel(id="S2", destination_port="Rotterdam", goods_description="B"),
+            ShipmentModel(id="S3", destination_port="Hamburg", goods_description="C"),
+        ])
+        await session.commit()
+    return sessionmaker
+
+def make_assessment(assessment_id=None):
+    return RiskAssessmentModel(
+        assessment_id=assessment_id or uuid.uuid4(),
+        created_at=datetime.now(timezone.utc),
+        source_snippet="Strike at the port",
+        detected_event={"target_port": "Rotterdam", "event_type": "Strike", "is_disruption": True, "confidence_score": 0.9},
+        mitigation_strategy={"recommendation_text": "Reroute", "action_required": True},
+    )
+
+async def count(sessionmaker, model):
+    async with sessionmaker() as session:
+        return (await session.execute(select(func.count()).select_from(model))).scalar_one()
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_one_transaction(engine, sessionmaker):
+    writer = AssessmentWriteCoalescer(sessionmaker, max_rows=100, max_delay_ms=20)
+    ports = [frozenset({"Rotterdam"}), frozenset({"Hamburg"}), frozenset(), frozenset({"Rotterdam"})]
+
+    with QueryCounter(engine) as queries:
+        await asyncio.gather(*(writer.write(make_assessment(), names) for names in ports))
+
+    # One multi-row INSERT for the assessments and one INSERT ... SELECT for every link
+    assert queries.count == 2
+    assert await count(sessionmaker, RiskAssessmentModel) == 4
+    assert await count(sessionmaker, AssessmentShipmentModel) == 5
+
+@pytest.mark.asyncio
+async def test_full_buffer_flushes_without_waiting(sessionmaker):
+    writer = AssessmentWriteCoalescer(sessionmaker, max_rows=2, max_delay_ms=60_000)
+
+    await asyncio.wait_for(asyncio.gather(writer.write(make_assessment()), writer.write(make_assessment())), timeout=5)
+
+    assert await count(sessionmaker, RiskAssessmentModel) == 2
+
+@pytest.mark.asyncio
+async def test_failed_flush_fails_every_waiter(sessionmaker):
+    writer = AssessmentWriteCoalescer(sessionmaker, max_rows=100, max_delay_ms=10)
+    duplicate = uuid.uuid4()
+
+    results = await asyncio.gather(
+        writer.write(make_assessment(duplicate)), writer.write(make_assessment(duplicate)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, IntegrityError) for result in results)
+    assert await count(sessionmaker, RiskAssessmentModel) == 0
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_still_gets_its_row_written(sessionmaker):
+    writer = AssessmentWriteCoalescer(sessionmaker, max_rows=100, max_delay_ms=20)
+
+    task = asyncio.create_task(writer.write(make_assessment()))
+    await asyncio.sleep(0)
+    task.cancel()
+    await writer.aclose()
+
+    assert await count(sessionmaker, RiskAssessmentModel) == 1
+
+@pytest.mark.asyncio
+async def test_service_writes_through_the_coalescer(sessionmaker):
+    registry = DisruptionRegistry()
+    writer = AssessmentWriteCoalescer(sessionmaker, max_rows=100, max_delay_ms=1, disruptions=registry)
+    index = PortIndex()
+    extractor = FakeExtractionService(latency_median_ms=0, latency_sigma=0, error_rate=0)
+
+    async with sessionmaker() as session:
+        service = RiskAssessmentService(
+            session, extractor, ShipmentRepository(session, index), writer, disruptions=registry
+        )
+        assessment = await service.create_assessment("Dock workers at Rotterdam begin a strike.")
+
+    assert assessment.affected_shipment_count == 2
+    # The disruption is persisted in the same flush and registered once it commits
+    assert await count(sessionmaker, ActiveDisruptionModel) == 1
+    assert [d.assessment_id for d in registry.match("Rotterdam")] == [assessment.assessment_id]
+    async with sessionmaker() as session:
+        service = RiskAssessmentService(session, extractor, ShipmentRepository(session, index))
+        stored = await service.get_assessment(assessment.assessment_id)
+    assert [s.id for s in stored.affected_shipments] == ["S1", "S2"]
@@ -0,0 +1,41 @@
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from app.services.extraction_cache import DatabaseCacheTier
+from app.schemas.assessment import DisruptionEvent
+from app.db.base import Base
+
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+@pytest.fixture
+async def sessionmaker():
+    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    await engine.dispose()
+
+@pytest.mark.asyncio
+async def test_shared_tier_round_trip(sessionmaker):
+    tier = DatabaseCacheTier(sessionmaker, ttl_seconds=60)
+    event = DisruptionEvent(target_port="Hamburg", event_type="Weather", is_disruption=True, confidence_score=0.7)
+
+    assert await tier.get("k1") is None
+    await tier.set("k1", event)
+    assert await tier.get("k1") == event
+
+    # Overwriting the same key is an upsert, not a conflict
+    await tier.set("k1", event)
+    assert await tier.get("k1") == event
+
+@pytest.mark.asyncio
+async def test_shared_tier_expiry(sessionmaker):
+    tier = DatabaseCacheTier(sessionmaker, ttl_seconds=0)
+    event = DisruptionEvent(target_port="Hamburg", event_type="Weather", is_disruption=True, confidence_score=0.7)
+
+    await tier.set("k1", event)
+    assert await tier.get("k1") is None
+    
+    await tier.set("k2", event)
+    assert await tier.prune() == 1
@@ -0,0 +1,109 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from app.models.job import AssessmentJobModel, JOB_FAILED, JOB_RUNNING, JOB_SUCCEEDED
+from app.models.shipment import ShipmentModel
+from app.repositories.job_repo import AssessmentJobRepository
+from app.schemas.assessment import DisruptionEvent
+from app.services.job_worker import AssessmentWorkerPool
+from app.db.base import Base
+
+@pytest.fixture
+async def sessionmaker(tmp_path):
+    # A file database so workers and the test use separate connections
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with SessionLocal() as session:
+        session.add(ShipmentModel(id="S1", destination_port="Rotterdam", goods_description="A"))
+        await session.commit()
+
+    yield SessionLocal
+
+    await engine.dispose()
+
+@pytest.fixture
+def mock_extractor():
+    async def parse(text):
+        if "fail" in text:
+            raise Exception("API Error")
+        return DisruptionEvent(target_port="Rotterdam", event_type="Strike", is_disruption=True, confidence_score=0.9)
+
+    extractor = MagicMock()
+    extractor.parse_snippet = AsyncMock(side_effect=parse)
+    return extractor
+
+@pytest.mark.asyncio
+async def test_worker_pool_drains_queue(sessionmaker, mock_extractor):
+    async with sessionmaker() as session:
+        repo = AssessmentJobRepository(session)
+        ok = await repo.enqueue("Strike in Rotterdam")
+        bad = await repo.enqueue("please fail")
+
+    pool = AssessmentWorkerPool(sessionmaker, mock_extractor, size=2, poll_interval=0.01)
+    await pool.start()
+    try:
+        async with sessionmaker() as session:
+            repo = AssessmentJobRepository(session)
+            ok = await repo.wait_for(ok.job_id, timeout=5, poll_interval=0.01)
+            bad = await repo.wait_for(bad.job_id, timeout=5, poll_interval=0.01)
+    finally:
+        await pool.stop()
+
+    assert ok.status == JOB_SUCCEEDED
+    assert ok.assessment_id is not None
+    assert bad.status == JOB_FAILED
+    assert "API Error" in bad.error
+    # Each job was extracted exactly once despite two competing workers
+    assert mock_extractor.parse_snippet.await_count == 2
+
+@pytest.mark.asyncio
+async def test_stop_lets_in_flight_job_finish(sessionmaker, mock_extractor):
+    started = asyncio.Event()
+
+    async def slow_parse(text):
+        started.set()
+        await asyncio.sleep(0.1)
+        return DisruptionEvent(target_port="Rotterdam", event_type="Strike", is_disruption=True, confidence_score=0.9)
+
+    mock_extractor.parse_snippet.side_effect = slow_parse
+    async with sessionmaker() as session:
+        job = await AssessmentJobRepository(session).enqueue("Strike in Rotterdam")
+
+    pool = AssessmentWorkerPool(sessionmaker, mock_extractor, size=1, poll_interval=0.01)
+    await pool.start()
+    await started.wait()
+    await pool.stop()
+
+    async with sessionmaker() as session:
+        job = await AssessmentJobRepository(session).get(job.job_id)
+    assert job.status == JOB_SUCCEEDED
+
+@pytest.mark.asyncio
+async def test_workers_requeue_jobs_left_stale_after_start(sessionmaker, mock_extractor):
+    pool = AssessmentWorkerPool(
+        sessionmaker, mock_extractor, size=1, poll_interval=0.01, sweep_interval=0.01, stale_after=60
+    )
+    await pool.start()
+    try:
+        # A worker elsewhere claims a job and dies while this pool is running
+        async with sessionmaker() as session:
+            repo = AssessmentJobRepository(session)
+            job = await repo.enqueue("Strike in Rotterdam")
+            await session.execute(
+                update(AssessmentJobModel)
+                .where(AssessmentJobModel.job_id == job.job_id)
+                .values(status=JOB_RUNNING, attempts=1, claimed_at=datetime.now(timezone.utc) - timedelta(minutes=10))
+            )
+            await session.commit()
+            job = await repo.wait_for(job.job_id, timeout=5, poll_interval=0.01)
+    finally:
+        await pool.stop()
+
+    assert job.status == JOB_SUCCEEDED
+    assert job.attempts == 2
@@ -0,0 +1,133 @@
+import pytest
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from app.models.assessment import RiskAssessmentModel
+from app.models.assessment_shipment import AssessmentShipmentModel
+from app.models.shipment import ShipmentModel
+from app.models.active_disruption import ActiveDisruptionModel
+from app.repositories.disruption_registry import DisruptionRegistry, disruption_row
+from app.repositories.port_index import PortIndex
+from app.repositories.port_proximity import PortProximityIndex, seed_ports
+from app.services.shipment_import import ShipmentImporter, seed_shipments
+from app.cli import import_shipments
+from app.db.base import Base
+from app.db.session import Database
+
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+async def count_shipments(engine):
+    async with engine.connect() as conn:
+        return (await conn.execute(select(func.count()).select_from(ShipmentModel))).scalar_one()
+
+@pytest.mark.asyncio
+async def test_import_records_in_chunks_with_upsert(engine):
+    index = PortIndex()
+    importer = ShipmentImporter(engine, chunk_size=2, index=index)
+
+    report = await importer.import_records([
+        {"id": "S1", "destination_port": "Rotterdam", "goods_description": "A"},
+        {"id": "S2", "destination_port": "Hamburg", "goods_description": "B"},
+        {"id": "S3", "destination_port": "", "goods_description": "C"},
+        {"id": "S1", "destination_port": "Antwerp", "goods_description": "A2"},
+    ])
+
+    assert (report.rows_written, report.rows_rejected, report.chunks) == (3, 1, 2)
+    assert report.rows_per_second > 0
+    assert await count_shipments(engine) == 2
+    async with engine.connect() as conn:
+        port = (await conn.execute(select(ShipmentModel.destination_port).where(ShipmentModel.id == "S1"))).scalar_one()
+    assert port == "Antwerp"
+    # Core writes still reach the port index
+    assert index.resolve("Port of Antwerp") == {"Antwerp"}
+
+@pytest.mark.asyncio
+async def test_seed_shipments_only_fills_an_empty_table(engine):
+    first = await seed_shipments(engine, Path("seed_data.yaml"))
+    second = await seed_shipments(engine, Path("seed_data.yaml"))
+
+    assert first.rows_written == 40
+    assert second is None
+    assert await count_shipments(engine) == 40
+
+@pytest.mark.asyncio
+async def test_imported_shipments_join_open_disruptions(engine):
+    now = datetime.now(timezone.utc)
+    assessment_id = uuid.uuid4()
+    registry = DisruptionRegistry(max_age_seconds=3600)
+    # Opened by another worker: the importer's registry picks it up from the table
+    async with engine.begin() as conn:
+        await conn.execute(RiskAssessmentModel.__table__.insert().values(
+            assessment_id=assessment_id, created_at=now, source_snippet="Strike in Hamburg",
+            detected_event={"target_port": "Hamburg"}, mitigation_strategy={}, extraction_path="model",
+        ))
+        await conn.execute(
+            ActiveDisruptionModel.__table__.insert().values(disruption_row(registry.opening(assessment_id, "Hamburg", now)))
+        )
+    importer = ShipmentImporter(engine, chunk_size=2, index=PortIndex(), disruptions=registry)
+
+    await importer.import_records([
+        {"id": "S1", "destination_port": "Port of Hamburg", "goods_description": "A"},
+        {"id": "S2", "destination_port": "Rotterdam", "goods_description": "B"},
+        {"id": "S3", "destination_port": "HAMBURG", "goods_description": "C"},
+    ])
+
+    async with engine.connect() as conn:
+        linked = (await conn.execute(
+            select(AssessmentShipmentModel.shipment_id).where(AssessmentShipmentModel.assessment_id == assessment_id)
+        )).scalars().all()
+    assert sorted(linked) == ["S1", "S3"]
+
+@pytest.mark.asyncio
+async def test_imported_shipments_join_disruptions_whose_radius_reaches_their_port(engine):
+    now = datetime.now(timezone.utc)
+    assessment_id = uuid.uuid4()
+    async with AsyncSession(engine) as session:
+        await seed_ports(session)
+    # Neither index has been loaded, as in a fresh import CLI process
+    registry = DisruptionRegistry(max_age_seconds=3600, proximity=PortProximityIndex())
+    async with engine.begin() as conn:
+        await conn.execute(RiskAssessmentModel.__table__.insert().values(
+            assessment_id=assessment_id, created_at=now, source_snippet="Typhoon warning for Shenzhen",
+            detected_event={"target_port": "Shenzhen"}, mitigation_strategy={}, extraction_path="model",
+        ))
+        await conn.execute(ActiveDisruptionModel.__table__.insert().values(
+            disruption_row(registry.opening(assessment_id, "Shenzhen", now, radius_km=400.0))
+        ))
+    importer = ShipmentImporter(engine, index=PortIndex(), disruptions=registry)
+
+    await importer.import_records([
+        {"id": "S1", "destination_port": "Hong Kong", "goods_description": "A"},
+        {"id": "S2", "destination_port": "Xiamen", "goods_description": "B"},
+    ])
+
+    async with engine.connect() as conn:
+        linked = (await conn.execute(
+            select(AssessmentShipmentModel.shipment_id).where(AssessmentShipmentModel.assessment_id == assessment_id)
+        )).scalars().all()
+    assert linked == ["S1"]
+
+@pytest.mark.asyncio
+async def test_cli_imports_into_an_empty_database(tmp_path, mocker, capsys):
+    database = Database(f"sqlite+aiosqlite:///{tmp_path / 'fresh.db'}", [])
+    mocker.patch.object(import_shipments, "db", database)
+    # A registry that has never read active_disruptions, as in a new CLI process
+    mocker.patch("app.services.shipment_import.disruption_registry", DisruptionRegistry())
+    path = tmp_path / "shipments.csv"
+    path.write_text("id,destination_port,goods_description\nS1,Rotterdam,A\nS2,Hamburg,B\n")
+
+    await import_shipments.run(import_shipments.parse_args([str(path)]))
+
+    assert '"rows_written": 2' in capsys.readouterr().out
+    assert await count_shipments(database.engine) == 2
+    await database.dispose()
@@ -0,0 +1,173 @@
+"""Regression gates against tests/perf/baselines.json.
+
+Round-trip counts are exact budgets: a change that adds a statement to a hot
+path fails here until the baseline is raised on purpose. Timings are compared
+with a generous tolerance, since they depend on the machine.
+"""
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.cli.benchmark_serialization import encode_direct, encode_with_schema, make_assessment
+from app.cli.generate_benchmark_data import generate_news, generate_shipments
+from app.cli.load_test import replay
+from app.cli.profile_imports import profile_import
+from app.db.base import Base
+from app.db.query_counter import QueryCounter
+from app.deps import get_risk_service
+from app.main import app
+from app.models.assessment import RiskAssessmentModel
+from app.models.shipment import ShipmentModel
+from app.repositories.port_index import PortIndex
+from app.repositories.shipment_repo import ShipmentRepository, ShipmentRow
+from app.schemas.assessment import RiskAssessmentResponse
+from app.services.fake_extraction_service import FakeExtractionService
+from app.services.risk_service import RiskAssessmentService
+from app.services.shipment_import import ShipmentImporter
+
+BASELINES = json.loads((Path(__file__).parent / "baselines.json").read_text())
+SNIPPET = "Dock workers at Rotterdam begin an indefinite strike over pay."
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+@pytest.fixture
+async def index(engine):
+    index = PortIndex()
+    await ShipmentImporter(engine, index=index).import_records(generate_shipments(2000))
+    # A warm index keeps its refresh query out of the counts
+    async with async_sessionmaker(engine)() as session:
+        await index.refresh(session)
+    return index
+
+@pytest.fixture
+def sessionmaker(engine):
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+@pytest.fixture
+def extractor():
+    return FakeExtractionService(latency_median_ms=0, latency_sigma=0, error_rate=0)
+
+def service_for(session, extractor, index):
+    return RiskAssessmentService(session, extractor, ShipmentRepository(session, index))
+
+@pytest.mark.asyncio
+async def test_create_assessment_round_trips(engine, sessionmaker, extractor, index):
+    async with sessionmaker() as session:
+        with QueryCounter(engine) as queries:
+            assessment = await service_for(session, extractor, index).create_assessment(SNIPPET)
+
+    assert assessment.affected_shipment_count > 0
+    assert queries.count <= BASELINES["round_trips"]["create_assessment"]
+
+@pytest.mark.asyncio
+async def test_get_assessment_round_trips(engine, sessionmaker, extractor, index):
+    async with sessionmaker() as session:
+        created = await service_for(session, extractor, index).create_assessment(SNIPPET)
+    async with sessionmaker() as session:
+        with QueryCounter(engine) as queries:
+            fetched = await service_for(session, extractor, index).get_assessment(created.assessment_id)
+
+    assert fetched.affected_shipment_count == created.affected_shipment_count
+    assert queries.count <= BASELINES["round_trips"]["get_assessment"]
+
+@pytest.mark.asyncio
+async def test_batch_round_trips_do_not_grow_with_batch_size(engine, sessionmaker, extractor, index):
+    snippets = [f"Severe congestion at the Port of {port} today." for port in ("Shanghai", "Busan", "Hamburg", "Antwerp", "Dubai")] * 2
+    async with sessionmaker() as session:
+        with QueryCounter(engine) as queries:
+            results = await service_for(session, extractor, index).create_assessments_batch(snippets)
+
+    assert all(isinstance(result, RiskAssessmentModel) for result in results)
+    assert queries.count <= BASELINES["round_trips"]["create_assessments_batch_10"]
+
+@pytest.mark.asyncio
+async def test_load_driver_reports_round_trips_per_request(engine, sessionmaker, extractor, index):
+    async def override():
+        async with sessionmaker() as session:
+            yield service_for(session, extractor, index)
+
+    app.dependency_overrides[get_risk_service] = override
+    snippets = [snippet for snippet in generate_news(40, seed=3) if len(snippet) >= 10]
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            with QueryCounter(engine) as queries:
+                # One in-memory SQLite connection backs every session, so keep requests serial
+                report = await replay(client, snippets, concurrency=1)
+    finally:
+        app.dependency_overrides = {}
+
+    assert report.requests == len(snippets)
+    assert report.errors == 0
+    assert report.as_dict()["p99_ms"] >= report.as_dict()["p50_ms"]
+    assert queries.count <= BASELINES["round_trips"]["load_test_request"] * report.requests
+
+def test_serialization_time():
+    assessment = RiskAssessmentModel(
+        assessment_id=uuid.uuid4(),
+        created_at=datetime.now(timezone.utc),
+        source_snippet=SNIPPET,
+        detected_event={"target_port": "Rotterdam", "event_type": "Strike", "is_disruption": True, "confidence_score": 0.9},
+        mitigation_strategy={"recommendation_text": "Reroute", "action_required": True},
+    )
+    assessment.affected_shipments = [
+        ShipmentModel(id=f"SHP-{i:09d}", destination_port="Rotterdam", goods_description="Electronics") for i in range(100)
+    ]
+    assessment.affected_shipment_count = 100
+
+    def serialize() -> bytes:
+        return RiskAssessmentResponse.model_validate(assessment).model_dump_json().encode()
+
+    serialize()
+    runs = []
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(50):
+            serialize()
+        runs.append((time.perf_counter() - started) / 50 * 1e6)
+
+    # Best of five damps scheduler noise
+    budget = BASELINES["timings_us"]["serialize_assessment_100_shipments"] * BASELINES["timing_tolerance"]
+    assert min(runs) <= budget, f"{min(runs):.0f}us per serialization, budget {budget:.0f}us"
+
+def best_of_five(fn):
+    fn()
+    timings = []
+    for _ in range(5):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1e6)
+    return min(timings)
+
+def test_direct_encoding_of_10k_shipments():
+    rows = [ShipmentRow(f"SHP-{i:09d}", "Rotterdam", "Electronics") for i in range(10_000)]
+    models = [ShipmentModel(id=r.id, destination_port=r.destination_port, goods_description=r.goods_description) for r in rows]
+
+    direct = best_of_five(lambda: encode_direct(make_assessment(rows)))
+    schema = best_of_five(lambda: encode_with_schema(make_assessment(models)))
+
+    budget = BASELINES["timings_us"]["encode_assessment_direct_10k_shipments"] * BASELINES["timing_tolerance"]
+    assert direct <= budget, f"{direct:.0f}us per 10k-shipment response, budget {budget:.0f}us"
+    assert schema / direct >= BASELINES["min_direct_encoding_speedup"]
+
+def test_app_imports_within_budget_without_the_model_sdk():
+    # A fresh interpreter, so modules this test session already imported don't hide the cost
+    profile = profile_import("app.main")
+
+    for module in BASELINES["not_imported_at_startup"]:
+        assert not profile.loaded(module), f"{module} is imported at startup; load it lazily"
+    budget = BASELINES["timings_us"]["import_app_main"] * BASELINES["timing_tolerance"]
+    wall_us = profile.wall_seconds * 1e6
+    slowest = ", ".join(f"{t.module} {t.cumulative_us / 1000:.0f}ms" for t in profile.slowest(5)[1:])
+    assert wall_us <= budget, f"import app.main took {wall_us / 1000:.0f}ms, budget {budget / 1000:.0f}ms ({slowest})"
@@ -0,0 +1,43 @@
+import json
+import uuid
+from datetime import datetime, timezone
+from pydantic_core import to_json
+from app.api.v1.serialization import assessment_payload, batch_result_payload, shipment_page_payload
+from app.models.assessment import RiskAssessmentModel
+from app.repositories.shipment_repo import ShipmentRow
+from app.schemas.assessment import BatchAssessmentResult, RiskAssessmentResponse
+from app.schemas.shipment import ShipmentPage
+
+def make_assessment(shipments=3):
+    assessment = RiskAssessmentModel(
+        assessment_id=uuid.uuid4(),
+        created_at=datetime.now(timezone.utc),
+        source_snippet="Strike in Rotterdam",
+        detected_event={"target_port": "Rotterdam", "event_type": "Strike", "is_disruption": True, "confidence_score": 0.9},
+        mitigation_strategy={"recommendation_text": "Reroute", "action_required": True},
+        extraction_path="near_duplicate",
+        duplicate_similarity=0.8,
+    )
+    assessment.affected_shipments = [ShipmentRow(f"S{i}", "Rotterdam", "Goods") for i in range(shipments)]
+    assessment.affected_shipment_count = shipments + 10
+    assessment.next_cursor = "UzI"
+    return assessment
+
+def test_assessment_payload_matches_the_response_schema():
+    assessment = make_assessment()
+
+    fast = to_json(assessment_payload(assessment))
+
+    assert fast == RiskAssessmentResponse.model_validate(assessment).model_dump_json().encode()
+
+def test_batch_and_page_payloads_match_their_schemas():
+    assessment = make_assessment()
+    ok = BatchAssessmentResult(index=0, status="ok", assessment=RiskAssessmentResponse.model_validate(assessment))
+    error = BatchAssessmentResult(index=1, status="error", error="Invalid")
+
+    assert json.loads(to_json(batch_result_payload(0, assessment=assessment))) == ok.model_dump(mode="json")
+    assert json.loads(to_json(batch_result_payload(1, error="Invalid"))) == error.model_dump(mode="json")
+    page = shipment_page_payload(assessment.affected_shipments, "UzI")
+    assert to_json(page) == ShipmentPage.model_validate(
+        {"items": [s._asdict() for s in assessment.affected_shipments], "next_cursor": "UzI"}
+    ).model_dump_json().encode()
@@ -0,0 +1,26 @@
+import pytest
+from app.api.v1.streaming import LineTooLongError, iter_ndjson_lines
+
+async def chunks(*parts):
+    for part in parts:
+        yield part
+
+async def collect(stream):
+    return [item async for item in stream]
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_lines_reassembles_split_records():
+    lines = await collect(iter_ndjson_lines(chunks(b'{"a": 1}\n{"b"', b': 2}\n\n  \n{"c": 3}'), 100))
+    assert lines == [b'{"a": 1}', b'{"b": 2}', b'{"c": 3}']
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_lines_drops_oversized_lines():
+    lines = await collect(iter_ndjson_lines(chunks(b"x" * 20, b"x" * 20, b'\n{"ok": 1}\n'), 16))
+    assert isinstance(lines[0], LineTooLongError)
+    assert lines[1:] == [b'{"ok": 1}']
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_lines_drops_oversized_line_within_one_chunk():
+    lines = await collect(iter_ndjson_lines(chunks(b"x" * 20 + b'\n{"ok": 1}\n'), 16))
+    assert isinstance(lines[0], LineTooLongError)
+    assert lines[1:] == [b'{"ok": 1}']
@@ -0,0 +1,54 @@
+import pytest
+from app.core.metrics import MetricsRegistry, _Metric
+
+def test_render_counters_and_gauges():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ["method"])
+    in_flight = registry.gauge("in_flight", "In flight.")
+
+    requests.inc(method="GET")
+    requests.inc(2, method='P"OST')
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{method="GET"} 1',
+        'requests_total{method="P\\"OST"} 2',
+        "# HELP in_flight In flight.",
+        "# TYPE in_flight gauge",
+        "in_flight 1",
+    ]
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    stage = registry.histogram("stage_seconds", "Stages.", ["stage"], buckets=[0.1, 1.0])
+
+    stage.observe(0.05, stage="extract")
+    stage.observe(0.1, stage="extract")
+    stage.observe(3.0, stage="extract")
+    with stage.time(stage="commit"):
+        pass
+
+    lines = registry.render().splitlines()
+    assert 'stage_seconds_bucket{stage="extract",le="0.1"} 2' in lines
+    assert 'stage_seconds_bucket{stage="extract",le="1"} 2' in lines
+    assert 'stage_seconds_bucket{stage="extract",le="+Inf"} 3' in lines
+    assert 'stage_seconds_sum{stage="extract"} 3.15' in lines
+    assert 'stage_seconds_count{stage="extract"} 3' in lines
+    assert stage.count(stage="commit") == 1
+
+def test_duplicate_registration_is_rejected():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests.")
+    with pytest.raises(ValueError):
+        registry.counter("requests_total", "Requests.")
+
+def test_metric_kinds_must_render_samples():
+    class Untyped(_Metric):
+        kind = "untyped"
+
+    with pytest.raises(TypeError):
+        Untyped("untyped", "No samples.")
@@ -0,0 +1,37 @@
+import pytest
+from app.repositories.port_index import PortIndex, normalize_port_name, port_name_keys
+
+@pytest.mark.parametrize("raw, expected", [
+    ("Rotterdam", "rotterdam"),
+    ("Port of Rotterdam", "rotterdam"),
+    ("  ROTTERDAM  port", "rotterdam"),
+    ("LA", "los angeles"),
+    ("Los Angeles", "los angeles"),
+    ("São Paulo", "sao paulo"),
+    ("Göteborg", "goteborg"),
+    ("Port Said", "port said"),
+])
+def test_normalize_port_name(raw, expected):
+    assert normalize_port_name(raw) == expected
+
+def test_port_index_resolves_all_spellings():
+    index = PortIndex()
+    index.add_many(["Los Angeles", "Port of LA", "Hamburg"])
+
+    assert index.resolve("la") == {"Los Angeles", "Port of LA"}
+    assert index.resolve("Port of Hamburg") == {"Hamburg"}
+    assert index.resolve("Unknown") == frozenset()
+    assert index.keys() == {"los angeles", "hamburg"}
+
+def test_compound_names_answer_to_each_part():
+    assert port_name_keys("Ningbo-Zhoushan") == {"ningbo zhoushan", "ningbo", "zhoushan"}
+    assert port_name_keys("New York/New Jersey") == {"new york", "new jersey"}
+
+    index = PortIndex()
+    index.add_many(["Ningbo-Zhoushan", "New York/New Jersey", "Port Klang"])
+
+    assert index.resolve("Ningbo") == {"Ningbo-Zhoushan"}
+    assert index.resolve("Port of Ningbo-Zhoushan") == {"Ningbo-Zhoushan"}
+    assert index.resolve("New Jersey") == {"New York/New Jersey"}
+    assert index.resolve("NYC") == {"New York/New Jersey"}
+    assert index.resolve("Klang") == {"Port Klang"}
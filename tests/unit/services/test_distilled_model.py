@@ -0,0 +1,80 @@
+import pytest
+from app.cli.generate_benchmark_data import generate_news
+from app.repositories.port_index import PortIndex
+from app.services.distilled_model import DistilledExtractionService, DistilledModel, evaluate_model
+from app.services.extraction_trace import EXTRACTION_PATH_DISTILLED, EXTRACTION_PATH_MODEL, trace_extraction
+from app.services.fake_extraction_service import KNOWN_PORTS, FakeExtractionService
+
+LABELLER = FakeExtractionService(latency_median_ms=0, latency_sigma=0, error_rate=0)
+# Ports the training corpus never mentions
+UNSEEN_PORTS = ("Savannah", "Piraeus")
+SEEN_PORTS = [p for p in KNOWN_PORTS if p not in UNSEEN_PORTS]
+
+def labelled(count, seed, ports):
+    return [(text, LABELLER.extract(text)) for text in generate_news(count, ports=ports, seed=seed)]
+
+@pytest.fixture(scope="module")
+def model():
+    return DistilledModel.fit(labelled(1500, seed=1, ports=SEEN_PORTS))
+
+class CountingBackend:
+    def __init__(self):
+        self.calls = 0
+
+    async def parse_snippet(self, text):
+        self.calls += 1
+        return LABELLER.extract(text)
+
+def test_model_reproduces_the_labels_it_was_distilled_from(model):
+    evaluation = evaluate_model(model, 0.9, labelled(500, seed=2, ports=SEEN_PORTS))
+
+    assert evaluation.coverage > 0.95
+    assert evaluation.accuracy == 1.0
+
+def test_unfamiliar_or_ambiguous_snippets_are_not_answered_locally(model):
+    evaluation = evaluate_model(model, 0.9, [
+        (text, LABELLER.extract(text))
+        for text in ("Quarterly earnings beat forecasts at a chipmaker.", "Strike at Rotterdam spreads to Hamburg.")
+    ])
+
+    assert evaluation.answered == 0
+
+def test_saved_model_predicts_the_same(model, tmp_path):
+    path = tmp_path / "distilled.npz"
+    model.save(path)
+    loaded = DistilledModel.load(path)
+
+    for text, _ in labelled(50, seed=3, ports=KNOWN_PORTS):
+        assert loaded.predict(text).event == model.predict(text).event
+
+@pytest.mark.asyncio
+async def test_service_answers_confident_snippets_and_falls_back_on_the_rest(model):
+    backend = CountingBackend()
+    service = DistilledExtractionService(model, backend, min_confidence=0.9, index=PortIndex())
+
+    with trace_extraction() as trace:
+        event = await service.parse_snippet("Dock workers at Rotterdam begin an indefinite strike over pay, halting container operations.")
+    assert (event.target_port, event.event_type, event.is_disruption) == ("Rotterdam", "Strike", True)
+    assert trace.path == EXTRACTION_PATH_DISTILLED
+    assert backend.calls == 0
+
+    with trace_extraction() as trace:
+        await service.parse_snippet("Quarterly earnings beat forecasts at a chipmaker.")
+    assert trace.path == EXTRACTION_PATH_MODEL
+    assert backend.calls == 1
+
+@pytest.mark.asyncio
+async def test_ports_booked_on_shipments_join_the_gazetteer(model):
+    index = PortIndex()
+    backend = CountingBackend()
+    service = DistilledExtractionService(model, backend, min_confidence=0.9, index=index)
+    snippet = "Dock workers at Savannah begin an indefinite strike over pay, halting container operations."
+
+    # A disruption with no known port is left to the backend
+    await service.parse_snippet(snippet)
+    assert backend.calls == 1
+
+    index.add("Savannah")
+    event = await service.parse_snippet(snippet)
+    assert event.target_port == "Savannah"
+    assert backend.calls == 1
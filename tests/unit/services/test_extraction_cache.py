@@ -0,0 +1,111 @@
+import pytest
+from app.core.metrics import EXTRACTION_CACHE_LOOKUPS_TOTAL, registry
+from unittest.mock import AsyncMock, MagicMock
+from app.services.extraction_cache import (
+    CachedExtractionService,
+    ExtractionCache,
+    extraction_cache_key,
+    normalize_snippet,
+)
+from app.services.extraction_trace import trace_extraction
+from app.schemas.assessment import DisruptionEvent
+
+@pytest.fixture
+def event():
+    return DisruptionEvent(
+        target_port="Rotterdam",
+        event_type="Strike",
+        is_disruption=True,
+        confidence_score=0.9
+    )
+
+@pytest.fixture
+def mock_extractor(event):
+    extractor = MagicMock()
+    extractor.parse_snippet = AsyncMock(return_value=event)
+    return extractor
+
+def test_normalize_snippet_collapses_case_and_whitespace():
+    assert normalize_snippet("  Strike in\n ROTTERDAM  ") == "strike in rotterdam"
+
+def test_cache_key_depends_on_model_and_prompt():
+    base = extraction_cache_key("Strike in Rotterdam", model="m1", prompt="p {text}")
+    assert base == extraction_cache_key("strike  in rotterdam", model="m1", prompt="p {text}")
+    assert base != extraction_cache_key("Strike in Rotterdam", model="m2", prompt="p {text}")
+    assert base != extraction_cache_key("Strike in Rotterdam", model="m1", prompt="q {text}")
+
+def test_lru_evicts_least_recently_used(event):
+    cache = ExtractionCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", event)
+    cache.set("b", event)
+    cache.get("a")
+    cache.set("c", event)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == event
+    assert cache.stats.evictions == 1
+    assert cache.stats.hits == 2
+    assert cache.stats.misses == 1
+
+def test_ttl_expires_entries(event):
+    cache = ExtractionCache(max_entries=10, ttl_seconds=0)
+    cache.set("a", event)
+
+    assert cache.get("a") is None
+    assert cache.stats.expirations == 1
+    assert cache.stats.misses == 1
+
+@pytest.mark.asyncio
+async def test_cached_service_only_calls_model_once(mock_extractor, event):
+    cache = ExtractionCache(max_entries=10, ttl_seconds=60)
+    service = CachedExtractionService(mock_extractor, cache)
+
+    with trace_extraction() as first_trace:
+        first = await service.parse_snippet("Strike in Rotterdam")
+    with trace_extraction() as second_trace:
+        second = await service.parse_snippet("strike in   Rotterdam")
+
+    assert first == second == event
+    assert (first_trace.path, second_trace.path) == ("model", "cache")
+    mock_extractor.parse_snippet.assert_awaited_once()
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+def test_cache_lookups_are_exported_on_the_metrics_registry(event):
+    cache = ExtractionCache(max_entries=10, ttl_seconds=60)
+    hits, misses = (EXTRACTION_CACHE_LOOKUPS_TOTAL.value(result=r) for r in ("hit", "miss"))
+
+    cache.get("k")
+    cache.set("k", event)
+    cache.get("k")
+
+    assert EXTRACTION_CACHE_LOOKUPS_TOTAL.value(result="hit") == hits + 1
+    assert EXTRACTION_CACHE_LOOKUPS_TOTAL.value(result="miss") == misses + 1
+    assert "# TYPE extraction_cache_lookups_total counter" in registry.render().splitlines()
+
+@pytest.mark.asyncio
+async def test_cached_service_uses_shared_tier(mock_extractor, event):
+    shared = MagicMock()
+    shared.get = AsyncMock(return_value=event)
+    shared.set = AsyncMock()
+    cache = ExtractionCache(max_entries=10, ttl_seconds=60)
+    service = CachedExtractionService(mock_extractor, cache, shared)
+
+    with trace_extraction() as trace:
+        result = await service.parse_snippet("Strike in Rotterdam")
+
+    assert result == event
+    assert trace.path == "shared_cache"
+    mock_extractor.parse_snippet.assert_not_called()
+    assert cache.stats.misses == 1
+    assert cache.stats.shared_hits == 1
+    assert len(cache) == 1
+
+@pytest.mark.asyncio
+async def test_cached_service_ignores_shared_tier_failures(mock_extractor, event):
+    shared = MagicMock()
+    shared.get = AsyncMock(side_effect=Exception("DB down"))
+    shared.set = AsyncMock(side_effect=Exception("DB down"))
+    service = CachedExtractionService(mock_extractor, ExtractionCache(max_entries=10, ttl_seconds=60), shared)
+
+    assert await service.parse_snippet("Strike in Rotterdam") == event
@@ -1,6 +1,10 @@
+import json
 import pytest
 from unittest.mock import AsyncMock, MagicMock
-from app.services.extraction_service import IntelligentExtractionService, ExtractionError
+from google.genai import types
+from app.core.metrics import LLM_TOKENS_TOTAL
+from app.services.extraction_service import ExtractionError
+from app.services.gemini_extraction_service import IntelligentExtractionService, unpack_events
 from app.schemas.assessment import DisruptionEvent
 
 @pytest.fixture
@@ -16,7 +20,11 @@ async def test_parse_snippet_success(mock_genai_client):
     service.client = mock_genai_client
     
     # Mock response
-    mock_response = MagicMock()
+    mock_response = MagicMock(
+        usage_metadata=types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=120, candidates_token_count=30, total_token_count=150
+        )
+    )
     mock_response.parsed = DisruptionEvent(
         target_port="Rotterdam",
         event_type="Strike",
@@ -26,10 +34,12 @@ async def test_parse_snippet_success(mock_genai_client):
     
     service.client.aio.models.generate_content = AsyncMock(return_value=mock_response)
     
+    prompt_tokens = LLM_TOKENS_TOTAL.value(kind="prompt")
     event = await service.parse_snippet("Some text")
     
     assert event.target_port == "Rotterdam"
     assert event.confidence_score == 0.9
+    assert LLM_TOKENS_TOTAL.value(kind="prompt") == prompt_tokens + 120
 
 @pytest.mark.asyncio
 async def test_parse_snippet_no_location(mock_genai_client):
@@ -37,7 +47,7 @@ async def test_parse_snippet_no_location(mock_genai_client):
     service.client = mock_genai_client
     
     # Mock response with no location
-    mock_response = MagicMock()
+    mock_response = MagicMock(usage_metadata=None)
     mock_response.parsed = DisruptionEvent(
         target_port=None,
         event_type="General News",
@@ -62,3 +72,80 @@ async def test_parse_snippet_failure(mock_genai_client):
     
     with pytest.raises(ExtractionError):
         await service.parse_snippet("Some text")
+
+@pytest.mark.asyncio
+async def test_parse_snippet_limits_in_flight_requests(mock_genai_client):
+    import asyncio
+    service = IntelligentExtractionService(project="test", location="us-central1", client=mock_genai_client, max_concurrency=2)
+
+    in_flight = 0
+    peak = 0
+    mock_response = MagicMock(usage_metadata=None)
+    mock_response.parsed = DisruptionEvent(
+        target_port="Rotterdam",
+        event_type="Strike",
+        is_disruption=True,
+        confidence_score=0.9
+    )
+
+    async def generate_content(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return mock_response
+
+    mock_genai_client.aio.models.generate_content = generate_content
+
+    await asyncio.gather(*(service.parse_snippet(f"text {i}") for i in range(6)))
+
+    assert peak == 2
+
+@pytest.mark.asyncio
+async def test_aclose_leaves_injected_client_open(mock_genai_client):
+    mock_genai_client.aio.aclose = AsyncMock()
+    service = IntelligentExtractionService(project="test", location="us-central1", client=mock_genai_client)
+
+    await service.aclose()
+
+    mock_genai_client.aio.aclose.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_aclose_closes_owned_pooled_client(mocker):
+    genai_client = MagicMock()
+    genai_client.aio.aclose = AsyncMock()
+    client_cls = mocker.patch("app.services.gemini_extraction_service.genai.Client", return_value=genai_client)
+
+    service = IntelligentExtractionService(project="test", location="us-central1")
+    http_client = client_cls.call_args.kwargs["http_options"].httpx_async_client
+    assert not http_client.is_closed
+
+    await service.aclose()
+
+    # The genai client is built on our pooled HTTP client, and both are closed
+    genai_client.aio.aclose.assert_awaited_once()
+    assert http_client.is_closed
+
+@pytest.mark.asyncio
+async def test_parse_snippets_keeps_the_well_formed_items_of_a_packed_response(mock_genai_client):
+    service = IntelligentExtractionService(project="test", location="us-central1", client=mock_genai_client)
+    mock_response = MagicMock(usage_metadata=None)
+    # Snippet 1 is garbled, snippet 2 is missing and an out-of-range index is ignored
+    mock_response.text = json.dumps([
+        {"snippet_index": 0, "target_port": "Rotterdam", "event_type": "Strike", "is_disruption": True, "confidence_score": 1},
+        {"snippet_index": 1, "target_port": "Hamburg", "event_type": "Strike"},
+        {"snippet_index": 7, "target_port": "Antwerp", "event_type": "Fog", "is_disruption": True, "confidence_score": 0.5},
+    ])
+    mock_genai_client.aio.models.generate_content = AsyncMock(return_value=mock_response)
+
+    events = await service.parse_snippets(["Strike at Rotterdam", "Strike at Hamburg", "Fog at Antwerp"])
+
+    assert list(events) == [0]
+    assert events[0].target_port == "Rotterdam"
+    prompt = mock_genai_client.aio.models.generate_content.call_args.kwargs["contents"]
+    assert "[0] Strike at Rotterdam" in prompt and "[2] Fog at Antwerp" in prompt
+
+def test_unparseable_packed_response_yields_no_events():
+    assert unpack_events("not json", 3) == {}
+    assert unpack_events('{"snippet_index": 0}', 3) == {}
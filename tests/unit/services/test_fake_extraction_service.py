@@ -0,0 +1,46 @@
+import random
+import pytest
+from app.services.extraction_service import ExtractionError
+from app.services.fake_extraction_service import FakeExtractionService
+
+@pytest.mark.asyncio
+async def test_fake_extraction_is_deterministic():
+    service = FakeExtractionService(latency_median_ms=0, latency_sigma=0, error_rate=0)
+
+    event = await service.parse_snippet("Dock workers at the Port of Rotterdam begin a strike.")
+
+    assert (event.target_port, event.event_type, event.is_disruption) == ("Rotterdam", "Strike", True)
+    assert await service.parse_snippet("Dock workers at the Port of Rotterdam begin a strike.") == event
+
+@pytest.mark.asyncio
+async def test_fake_extraction_matches_compound_and_multiword_ports():
+    service = FakeExtractionService(latency_median_ms=0, latency_sigma=0, error_rate=0)
+
+    assert (await service.parse_snippet("Typhoon closes in on Ningbo terminals")).target_port == "Ningbo-Zhoushan"
+    assert (await service.parse_snippet("Congestion worsens at Los Angeles")).target_port == "Los Angeles"
+    unrelated = await service.parse_snippet("Central bank holds interest rates steady.")
+    assert unrelated.target_port is None and not unrelated.is_disruption
+
+@pytest.mark.asyncio
+async def test_fake_extraction_error_rate():
+    always = FakeExtractionService(latency_median_ms=0, latency_sigma=0, error_rate=1.0)
+    with pytest.raises(ExtractionError):
+        await always.parse_snippet("Strike at Hamburg port")
+
+    sometimes = FakeExtractionService(latency_median_ms=0, latency_sigma=0, error_rate=0.5, seed=7)
+    outcomes = []
+    for i in range(200):
+        try:
+            await sometimes.parse_snippet(f"Strike number {i} at Hamburg port")
+            outcomes.append(True)
+        except ExtractionError:
+            outcomes.append(False)
+    assert 60 < outcomes.count(False) < 140
+
+def test_fake_latency_is_lognormal_around_the_median():
+    service = FakeExtractionService(latency_median_ms=100, latency_sigma=0.5)
+    rng = random.Random(1)
+    samples = sorted(service.latency_seconds(rng) for _ in range(2001))
+
+    assert 0.08 < samples[1000] < 0.12
+    assert samples[-1] > 0.2
@@ -0,0 +1,97 @@
+import asyncio
+import pytest
+from app.core.metrics import EXTRACTION_BATCH_RETRIES_TOTAL
+from app.schemas.assessment import DisruptionEvent
+from app.services.extraction_service import ExtractionError
+from app.services.micro_batch import MicroBatchingExtractionService
+
+def event_for(text):
+    return DisruptionEvent(target_port=text, event_type="Strike", is_disruption=True, confidence_score=0.9)
+
+class BatchBackend:
+    """Answers packed requests, leaving out the snippets in ``drop``."""
+
+    def __init__(self, drop=(), error=None):
+        self.drop = set(drop)
+        self.error = error
+        self.batches = []
+        self.singles = []
+
+    async def parse_snippets(self, texts):
+        self.batches.append(list(texts))
+        await asyncio.sleep(0.01)
+        if self.error is not None:
+            raise self.error
+        return {i: event_for(text) for i, text in enumerate(texts) if text not in self.drop}
+
+    async def parse_snippet(self, text):
+        self.singles.append(text)
+        return event_for(text)
+
+async def extract_all(service, texts):
+    return await asyncio.gather(*(service.parse_snippet(t) for t in texts), return_exceptions=True)
+
+@pytest.mark.asyncio
+async def test_snippets_arriving_together_share_one_request():
+    backend = BatchBackend()
+    service = MicroBatchingExtractionService(backend, max_items=8, max_delay_ms=5)
+
+    events = await extract_all(service, ["Rotterdam", "Hamburg", "Antwerp"])
+
+    assert backend.batches == [["Rotterdam", "Hamburg", "Antwerp"]]
+    assert [e.target_port for e in events] == ["Rotterdam", "Hamburg", "Antwerp"]
+
+@pytest.mark.asyncio
+async def test_full_batches_are_sent_without_waiting():
+    backend = BatchBackend()
+    service = MicroBatchingExtractionService(backend, max_items=2, max_delay_ms=10_000)
+
+    events = await asyncio.wait_for(extract_all(service, ["A", "B", "C", "D"]), timeout=1)
+
+    assert backend.batches == [["A", "B"], ["C", "D"]]
+    assert [e.target_port for e in events] == ["A", "B", "C", "D"]
+
+@pytest.mark.asyncio
+async def test_a_lone_snippet_is_sent_as_a_single_call():
+    backend = BatchBackend()
+    service = MicroBatchingExtractionService(backend, max_items=8, max_delay_ms=1)
+
+    await service.parse_snippet("Rotterdam")
+
+    assert backend.batches == []
+    assert backend.singles == ["Rotterdam"]
+
+@pytest.mark.asyncio
+async def test_snippets_missing_from_the_response_are_retried_alone():
+    backend = BatchBackend(drop={"Hamburg"})
+    service = MicroBatchingExtractionService(backend, max_items=8, max_delay_ms=5)
+    retries = EXTRACTION_BATCH_RETRIES_TOTAL.value()
+
+    events = await extract_all(service, ["Rotterdam", "Hamburg", "Antwerp"])
+
+    assert [e.target_port for e in events] == ["Rotterdam", "Hamburg", "Antwerp"]
+    assert backend.singles == ["Hamburg"]
+    assert EXTRACTION_BATCH_RETRIES_TOTAL.value() == retries + 1
+
+@pytest.mark.asyncio
+async def test_a_failed_request_fails_every_snippet_in_it():
+    backend = BatchBackend(error=ExtractionError("quota", status_code=429))
+    service = MicroBatchingExtractionService(backend, max_items=8, max_delay_ms=5)
+
+    results = await extract_all(service, ["Rotterdam", "Hamburg"])
+
+    assert all(isinstance(r, ExtractionError) and r.status_code == 429 for r in results)
+    assert backend.singles == []
+
+@pytest.mark.asyncio
+async def test_callers_that_gave_up_are_not_sent():
+    backend = BatchBackend()
+    service = MicroBatchingExtractionService(backend, max_items=8, max_delay_ms=20)
+
+    abandoned = asyncio.create_task(service.parse_snippet("Rotterdam"))
+    await asyncio.sleep(0)
+    abandoned.cancel()
+    events = await extract_all(service, ["Hamburg", "Antwerp"])
+
+    assert backend.batches == [["Hamburg", "Antwerp"]]
+    assert [e.target_port for e in events] == ["Hamburg", "Antwerp"]
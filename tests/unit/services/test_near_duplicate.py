@@ -0,0 +1,68 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.services.near_duplicate import MinHasher, NearDuplicateExtractionService, NearDuplicateIndex
+from app.services.extraction_trace import trace_extraction
+from app.schemas.assessment import DisruptionEvent
+
+ORIGINAL = "Dockworkers at the Port of Rotterdam begin a 48-hour strike over wages on Friday."
+REWORDED = "Port of Rotterdam dockworkers to begin 48-hour strike over wages Friday"
+
+@pytest.fixture
+def event():
+    return DisruptionEvent(
+        target_port="Rotterdam",
+        event_type="Strike",
+        is_disruption=True,
+        confidence_score=0.9
+    )
+
+def test_minhash_estimates_jaccard():
+    hasher = MinHasher()
+    same = (hasher.signature(ORIGINAL) == hasher.signature(REWORDED)).mean()
+    unrelated = (hasher.signature(ORIGINAL) == hasher.signature("Apple unveils a new phone with a better camera")).mean()
+
+    assert same > 0.9
+    assert unrelated < 0.1
+
+def test_find_reuses_reworded_snippet(event):
+    index = NearDuplicateIndex(capacity=8, threshold=0.7, ttl_seconds=60)
+    index.add(ORIGINAL, event)
+
+    match = index.find(REWORDED)
+
+    assert match is not None
+    assert match[0] == event
+    assert match[1] >= 0.7
+    assert index.find("Apple unveils a new phone with a better camera") is None
+
+def test_find_never_reuses_across_ports(event):
+    index = NearDuplicateIndex(capacity=8, threshold=0.5, ttl_seconds=60)
+    index.add(ORIGINAL, event)
+
+    assert index.find("Dockworkers at the Port of Hamburg begin a 48-hour strike over wages on Friday.") is None
+
+def test_find_ignores_expired_and_overwritten_entries(event):
+    expired = NearDuplicateIndex(capacity=8, threshold=0.7, ttl_seconds=0)
+    expired.add(ORIGINAL, event)
+    assert expired.find(REWORDED) is None
+
+    ring = NearDuplicateIndex(capacity=1, threshold=0.7, ttl_seconds=60)
+    ring.add(ORIGINAL, event)
+    ring.add("Typhoon closes Kaohsiung port terminals", event)
+    assert ring.find(REWORDED) is None
+
+@pytest.mark.asyncio
+async def test_service_reuses_extraction_and_records_similarity(event):
+    extractor = MagicMock()
+    extractor.parse_snippet = AsyncMock(return_value=event)
+    service = NearDuplicateExtractionService(extractor, NearDuplicateIndex(capacity=8, threshold=0.7, ttl_seconds=60))
+
+    with trace_extraction() as first:
+        await service.parse_snippet(ORIGINAL)
+    with trace_extraction() as second:
+        assert await service.parse_snippet(REWORDED) == event
+
+    extractor.parse_snippet.assert_awaited_once()
+    assert first.duplicate_similarity is None
+    assert second.duplicate_similarity >= 0.7
+    assert (first.path, second.path) == ("model", "near_duplicate")
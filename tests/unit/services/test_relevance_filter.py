@@ -0,0 +1,57 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.repositories.port_index import PortIndex
+from app.services.extraction_trace import trace_extraction
+from app.services.relevance_filter import RelevanceFilterExtractionService, RelevanceScorer, evaluate_filter
+from app.schemas.assessment import DisruptionEvent
+
+@pytest.fixture
+def scorer():
+    index = PortIndex()
+    index.add("Rotterdam")
+    return RelevanceScorer(index)
+
+def test_scorer_separates_shipping_news(scorer):
+    assert scorer.score("Dockworkers at the Port of Rotterdam begin a strike") >= 1.0
+    assert scorer.score("Typhoon forces container vessels to wait offshore") >= 1.0
+    assert scorer.score("Apple unveils a new phone with a better camera") == 0.0
+    assert scorer.score("") == 0.0
+
+def test_scorer_matches_multi_word_ports_and_learns_new_ones(scorer):
+    assert scorer.score("Delays reported at Ho Chi Minh City") >= 1.0
+    assert scorer.score("Gdansk expands") == 0.0
+
+    scorer.index.add("Gdańsk")
+
+    assert scorer.score("Gdansk expands") == 1.0
+
+@pytest.mark.asyncio
+async def test_filter_short_circuits_irrelevant_snippets(scorer):
+    event = DisruptionEvent(target_port="Rotterdam", event_type="Strike", is_disruption=True, confidence_score=0.9)
+    extractor = MagicMock()
+    extractor.parse_snippet = AsyncMock(return_value=event)
+    service = RelevanceFilterExtractionService(extractor, scorer, threshold=1.0)
+
+    with trace_extraction() as skipped:
+        result = await service.parse_snippet("Apple unveils a new phone with a better camera")
+    with trace_extraction() as passed:
+        assert await service.parse_snippet("Strike at the Port of Rotterdam") == event
+
+    assert result.is_disruption is False
+    assert result.target_port is None
+    assert skipped.path == "prefilter"
+    assert passed.path == "model"
+    extractor.parse_snippet.assert_awaited_once_with("Strike at the Port of Rotterdam")
+
+def test_evaluate_filter(scorer):
+    evaluation = evaluate_filter(scorer, 1.0, [
+        ("Strike at the Port of Rotterdam", True),
+        ("Rotterdam football club wins the cup", False),
+        ("Apple unveils a new phone", False),
+        ("Workers walk out at a car factory", True),
+    ])
+
+    assert evaluation.samples == 4
+    assert evaluation.precision == 0.5
+    assert evaluation.recall == 0.5
+    assert evaluation.filter_rate == 0.5
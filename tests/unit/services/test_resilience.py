@@ -0,0 +1,193 @@
+import asyncio
+import time
+import pytest
+from app.schemas.assessment import DisruptionEvent
+from app.services.extraction_service import ExtractionError, ExtractionTimeout, ExtractionUnavailable
+from app.services.fake_extraction_service import FakeExtractionService
+from app.services.resilience import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    AdaptiveConcurrencyLimit,
+    CircuitBreaker,
+    ResilientExtractionService,
+)
+
+EVENT = DisruptionEvent(target_port="Rotterdam", event_type="Strike", is_disruption=True, confidence_score=0.9)
+
+class ScriptedBackend:
+    """Answers call n after latencies[n] seconds, or raises errors[n]."""
+
+    def __init__(self, latencies=(), errors=()):
+        self.latencies = list(latencies)
+        self.errors = list(errors)
+        self.calls = 0
+        self.cancelled = 0
+
+    async def parse_snippet(self, text):
+        n = self.calls
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.latencies[n] if n < len(self.latencies) else 0)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if n < len(self.errors) and self.errors[n] is not None:
+            raise self.errors[n]
+        return EVENT
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def resilient(backend, **kwargs):
+    kwargs.setdefault("hedge_percentile", 0)
+    kwargs.setdefault("breaker", CircuitBreaker(failure_threshold=3, reset_seconds=10))
+    kwargs.setdefault("limiter", AdaptiveConcurrencyLimit(minimum=1, maximum=8, backoff=0.5))
+    return ResilientExtractionService(backend, **kwargs)
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged_and_the_first_answer_wins():
+    backend = ScriptedBackend(latencies=[5.0, 0.01])
+    service = resilient(backend, hedge_percentile=95, hedge_min_samples=10)
+    for _ in range(10):
+        service.latencies.observe(0.02)
+
+    started = time.monotonic()
+    assert await service.parse_snippet("Strike at Rotterdam") == EVENT
+
+    assert time.monotonic() - started < 1.0
+    assert backend.calls == 2
+    await asyncio.sleep(0)
+    assert backend.cancelled == 1
+    assert service.limiter.in_flight == 0
+
+@pytest.mark.asyncio
+async def test_no_hedge_until_enough_latencies_are_known():
+    backend = ScriptedBackend(latencies=[0.05])
+    service = resilient(backend, hedge_percentile=95, hedge_min_samples=10)
+
+    await service.parse_snippet("Strike at Rotterdam")
+
+    assert backend.calls == 1
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_the_call():
+    backend = ScriptedBackend(latencies=[5.0])
+    service = resilient(backend, deadline_seconds=0.05)
+
+    with pytest.raises(ExtractionTimeout):
+        await service.parse_snippet("Strike at Rotterdam")
+
+    assert backend.cancelled == 1
+    assert service.limiter.in_flight == 0
+    # A timeout is a congestion signal
+    assert service.limiter.limit == 4
+
+@pytest.mark.asyncio
+async def test_limit_backs_off_on_rate_limiting_and_recovers():
+    backend = FakeExtractionService(latency_median_ms=10, latency_sigma=0, error_rate=0, capacity=4)
+    limiter = AdaptiveConcurrencyLimit(minimum=1, maximum=32, backoff=0.5)
+    service = resilient(backend, limiter=limiter, breaker=CircuitBreaker(failure_threshold=1000))
+
+    results = await asyncio.gather(
+        *(service.parse_snippet(f"Strike number {i} at Hamburg") for i in range(200)), return_exceptions=True
+    )
+
+    rejected = [r for r in results if isinstance(r, ExtractionError)]
+    assert rejected and all(r.status_code == 429 for r in rejected)
+    # Overload drove the limit down toward the backend's real capacity
+    assert limiter.limit < 8
+    assert limiter.in_flight == 0
+
+    low = limiter.limit
+    for i in range(10):
+        await service.parse_snippet(f"Calm day {i} at Hamburg")
+    assert limiter.limit > low
+
+@pytest.mark.asyncio
+async def test_limiter_queues_callers_beyond_the_limit():
+    limiter = AdaptiveConcurrencyLimit(minimum=1, maximum=2, backoff=0.5)
+    await limiter.acquire()
+    await limiter.acquire()
+
+    waiting = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not waiting.done()
+    assert not limiter.try_acquire()
+
+    limiter.release(time.monotonic(), "success")
+    await asyncio.wait_for(waiting, timeout=1)
+    assert limiter.in_flight == 2
+
+@pytest.mark.asyncio
+async def test_circuit_opens_then_probes_before_closing():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=10, clock=clock)
+    failure = ExtractionError("boom", status_code=503)
+    backend = ScriptedBackend(errors=[failure, failure, failure, failure])
+    service = resilient(backend, breaker=breaker)
+
+    for _ in range(3):
+        with pytest.raises(ExtractionError):
+            await service.parse_snippet("Strike at Rotterdam")
+    assert breaker.state == CIRCUIT_OPEN
+
+    # Refused without touching the backend
+    with pytest.raises(ExtractionUnavailable) as refused:
+        await service.parse_snippet("Strike at Rotterdam")
+    assert backend.calls == 3
+    assert refused.value.retry_after == 10
+
+    # Half-open: a failed probe reopens the circuit for another full period
+    clock.now = 10
+    with pytest.raises(ExtractionError):
+        await service.parse_snippet("Strike at Rotterdam")
+    assert breaker.state == CIRCUIT_OPEN
+
+    clock.now = 20
+    assert await service.parse_snippet("Strike at Rotterdam") == EVENT
+    assert breaker.state == CIRCUIT_CLOSED
+    assert backend.calls == 5
+
+def test_half_open_circuit_admits_one_probe_at_a_time():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=clock)
+    breaker.record("failure")
+    clock.now = 10
+
+    assert breaker.before_call() is True
+    assert breaker.state == CIRCUIT_HALF_OPEN
+    with pytest.raises(ExtractionUnavailable):
+        breaker.before_call()
+    # A probe whose caller went away frees the slot without deciding anything
+    breaker.record("cancelled", probe=True)
+    assert breaker.before_call() is True
+
+@pytest.mark.asyncio
+async def test_rejected_requests_do_not_trip_the_circuit():
+    rejected = ExtractionError("bad request", status_code=400)
+    backend = ScriptedBackend(errors=[rejected] * 5)
+    service = resilient(backend)
+
+    for _ in range(5):
+        with pytest.raises(ExtractionError):
+            await service.parse_snippet("Strike at Rotterdam")
+
+    assert service.breaker.state == CIRCUIT_CLOSED
+    assert service.limiter.limit == 8
+
+@pytest.mark.asyncio
+async def test_a_packed_request_is_one_call_to_the_breaker_and_limiter():
+    backend = FakeExtractionService(latency_median_ms=1, latency_sigma=0, error_rate=1.0)
+    service = resilient(backend)
+
+    with pytest.raises(ExtractionError):
+        await service.parse_snippets([f"Strike number {i} at Hamburg" for i in range(8)])
+
+    assert service.breaker.failures == 1
+    assert service.breaker.state == CIRCUIT_CLOSED
+    assert service.limiter.in_flight == 0
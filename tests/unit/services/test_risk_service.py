@@ -1,18 +1,31 @@
 import pytest
+from uuid import uuid4
 from unittest.mock import AsyncMock, MagicMock
 from app.services.risk_service import RiskAssessmentService
 from app.schemas.assessment import DisruptionEvent
 from app.models.shipment import ShipmentModel
 from app.models.assessment import RiskAssessmentModel
+from app.repositories.shipment_repo import RegionImpact
 
 @pytest.fixture
 def mock_db():
     session = AsyncMock()
     session.add = MagicMock()
+    session.add_all = MagicMock()
     session.commit = AsyncMock()
     session.refresh = AsyncMock()
     return session
 
+@pytest.fixture(autouse=True)
+def mock_rollups(mocker):
+    rollups = mocker.patch("app.services.risk_service.RiskRollupRepository").return_value
+    rollups.record = AsyncMock()
+    return rollups
+
+@pytest.fixture(autouse=True)
+def mock_disruptions(mocker):
+    return mocker.patch("app.services.risk_service.disruption_registry")
+
 @pytest.fixture
 def mock_extractor():
     extractor = MagicMock()
@@ -22,7 +35,15 @@ def mock_extractor():
 @pytest.fixture
 def mock_repo():
     repo = MagicMock()
-    repo.get_by_destination = AsyncMock()
+    repo.count_by_destination = AsyncMock(return_value=0)
+    repo.get_page_by_destination = AsyncMock(return_value=[])
+    repo.link_destination = AsyncMock(return_value=0)
+    repo.add_links = AsyncMock()
+    repo.link_names = AsyncMock()
+    repo.get_impact_by_regions = AsyncMock(return_value={})
+    repo.get_page_by_assessment = AsyncMock(return_value=[])
+    repo.count_by_assessment = AsyncMock(return_value=0)
+    repo.resolve_destination = AsyncMock(return_value=frozenset())
     return repo
 
 @pytest.mark.asyncio
@@ -46,17 +67,24 @@ async def test_create_assessment_disruptive(mock_db, mock_extractor, mock_repo):
     
     # Mock Shipments
     shipment = ShipmentModel(id="S1", destination_port="Rotterdam", goods_description="Goods")
-    mock_repo.get_by_destination.return_value = [shipment]
+    mock_repo.count_by_destination.return_value = 1
+    mock_repo.get_page_by_destination.return_value = [shipment]
     
     assessment = await service.create_assessment("Strike in Rotterdam")
     
     assert assessment.detected_event["target_port"] == "Rotterdam"
     assert assessment.mitigation_strategy["action_required"] is True
     assert "Rotterdam" in assessment.mitigation_strategy["recommendation_text"]
-    assert assessment.affected_shipment_ids == ["S1"]
+    mock_repo.link_destination.assert_awaited_once_with(assessment.assessment_id, "Rotterdam", radius_km=0.0)
+    assert assessment.affected_shipments == [shipment]
+    assert assessment.affected_shipment_count == 1
+    assert assessment.next_cursor is None
     
     mock_db.add.assert_called_once()
     mock_db.commit.assert_awaited_once()
+    # Id and timestamp are generated client-side, so nothing is read back
+    mock_db.refresh.assert_not_called()
+    assert assessment.assessment_id is not None and assessment.created_at is not None
 
 @pytest.mark.asyncio
 async def test_create_assessment_non_disruptive(mock_db, mock_extractor, mock_repo):
@@ -73,9 +101,10 @@ async def test_create_assessment_non_disruptive(mock_db, mock_extractor, mock_re
     
     assessment = await service.create_assessment("Sunny weather")
     
-    mock_repo.get_by_destination.assert_not_called()
+    mock_repo.count_by_destination.assert_not_called()
+    mock_repo.link_destination.assert_not_called()
     assert assessment.mitigation_strategy["action_required"] is False
-    assert assessment.affected_shipment_ids == []
+    assert assessment.affected_shipment_count == 0
 
 @pytest.mark.asyncio
 async def test_create_assessment_disruptive_no_shipments(mock_db, mock_extractor, mock_repo):
@@ -90,16 +119,147 @@ async def test_create_assessment_disruptive_no_shipments(mock_db, mock_extractor
     )
     mock_extractor.parse_snippet.return_value = event
     
-    # Mock Shipments: Return empty list
-    mock_repo.get_by_destination.return_value = []
+    # Mock Shipments: none at the port
+    mock_repo.count_by_destination.return_value = 0
     
     assessment = await service.create_assessment("Strike in London")
     
-    # Verify interaction
-    mock_repo.get_by_destination.assert_awaited_once_with("London")
+    # Verify interaction: the count short-circuits the row queries
+    mock_repo.count_by_destination.assert_awaited_once_with("London", radius_km=0.0)
+    mock_repo.get_page_by_destination.assert_not_called()
+    mock_repo.link_destination.assert_not_called()
     
     # Verify assessment content
     assert assessment.detected_event["target_port"] == "London"
-    assert assessment.affected_shipment_ids == []
+    assert assessment.affected_shipments == []
     assert assessment.mitigation_strategy["action_required"] is False
     assert "no active shipments found" in assessment.mitigation_strategy["recommendation_text"]
+
+@pytest.mark.asyncio
+async def test_create_assessments_batch(mock_db, mock_extractor, mock_repo):
+    service = RiskAssessmentService(mock_db, mock_extractor, mock_repo)
+
+    async def parse(text):
+        if "fail" in text:
+            raise Exception("API Error")
+        port = "Rotterdam" if "Rotterdam" in text else "Hamburg"
+        return DisruptionEvent(target_port=port, event_type="Strike", is_disruption=True, confidence_score=0.9)
+
+    mock_extractor.parse_snippet.side_effect = parse
+    shipment = ShipmentModel(id="S1", destination_port="Rotterdam", goods_description="Goods")
+    mock_repo.get_impact_by_regions.return_value = {
+        ("Rotterdam", 0.0): RegionImpact(frozenset({"Rotterdam"}), 1, [shipment]),
+        ("Hamburg", 0.0): RegionImpact(frozenset(), 0, []),
+    }
+
+    results = await service.create_assessments_batch(
+        ["Strike in Rotterdam", "fail please", "Strike in Hamburg", "Strike in Rotterdam again"]
+    )
+
+    assert [type(r) for r in results] == [RiskAssessmentModel, Exception, RiskAssessmentModel, RiskAssessmentModel]
+    assert results[0].affected_shipments == [shipment]
+    assert results[0].affected_shipment_count == 1
+    assert results[2].affected_shipment_count == 0
+    assert results[0].assessment_id is not None and results[0].created_at is not None
+
+    # One impact lookup for all ports, one commit, no per-row refresh
+    mock_repo.get_impact_by_regions.assert_awaited_once_with({("Rotterdam", 0.0), ("Hamburg", 0.0)}, 100)
+    mock_db.add_all.assert_called_once()
+    assert len(mock_db.add_all.call_args.args[0]) == 3
+    mock_db.commit.assert_awaited_once()
+    mock_db.refresh.assert_not_called()
+    # Links for every assessment are selected on the database side in one executemany
+    mock_repo.link_names.assert_awaited_once_with([
+        (results[0].assessment_id, frozenset({"Rotterdam"})),
+        (results[3].assessment_id, frozenset({"Rotterdam"})),
+    ])
+
+@pytest.mark.asyncio
+async def test_create_assessment_records_duplicate_similarity(mock_db, mock_extractor, mock_repo):
+    from app.services.extraction_trace import current_trace
+    service = RiskAssessmentService(mock_db, mock_extractor, mock_repo)
+
+    async def parse(text):
+        current_trace().duplicate_similarity = 0.85
+        return DisruptionEvent(target_port=None, event_type="Weather", is_disruption=False, confidence_score=0.2)
+
+    mock_extractor.parse_snippet.side_effect = parse
+
+    assessment = await service.create_assessment("Sunny weather")
+
+    assert assessment.duplicate_similarity == 0.85
+
+@pytest.mark.asyncio
+async def test_create_assessment_returns_first_page_and_cursor(mock_db, mock_extractor, mock_repo, mocker):
+    from app.repositories.pagination import decode_cursor
+    mocker.patch("app.services.risk_service.settings.AFFECTED_SHIPMENTS_PAGE_SIZE", 2)
+    service = RiskAssessmentService(mock_db, mock_extractor, mock_repo)
+    mock_extractor.parse_snippet.return_value = DisruptionEvent(
+        target_port="Singapore", event_type="Strike", is_disruption=True, confidence_score=0.9
+    )
+    page = [ShipmentModel(id=f"S{i}", destination_port="Singapore", goods_description="Goods") for i in (1, 2)]
+    mock_repo.count_by_destination.return_value = 3
+    mock_repo.get_page_by_destination.return_value = page
+
+    assessment = await service.create_assessment("Strike in Singapore")
+
+    mock_repo.get_page_by_destination.assert_awaited_once_with("Singapore", 2, radius_km=0.0)
+    assert assessment.affected_shipments == page
+    assert assessment.affected_shipment_count == 3
+    assert decode_cursor(assessment.next_cursor) == "S2"
+    assert "Reroute 3 shipments" in assessment.mitigation_strategy["recommendation_text"]
+
+@pytest.mark.asyncio
+async def test_get_affected_shipments_pages_by_keyset(mock_db, mock_extractor, mock_repo):
+    from app.repositories.pagination import decode_cursor
+    service = RiskAssessmentService(mock_db, mock_extractor, mock_repo)
+    assessment_id = uuid4()
+    mock_db.get = AsyncMock(return_value=RiskAssessmentModel(assessment_id=assessment_id))
+    shipments = [ShipmentModel(id=f"S{i}", destination_port="Rotterdam", goods_description="Goods") for i in (1, 2, 3)]
+
+    mock_repo.get_page_by_assessment.return_value = shipments
+    page, cursor = await service.get_affected_shipments(assessment_id, limit=2)
+    mock_repo.get_page_by_assessment.assert_awaited_with(assessment_id, 3, None)
+    assert page == shipments[:2]
+    assert decode_cursor(cursor) == "S2"
+
+    mock_repo.get_page_by_assessment.return_value = shipments[2:]
+    page, cursor = await service.get_affected_shipments(assessment_id, limit=2, after="S2")
+    mock_repo.get_page_by_assessment.assert_awaited_with(assessment_id, 3, "S2")
+    assert page == shipments[2:]
+    assert cursor is None
+
+@pytest.mark.asyncio
+async def test_create_assessment_hands_the_write_to_the_coalescer(mock_db, mock_extractor, mock_repo):
+    writer = AsyncMock()
+    service = RiskAssessmentService(mock_db, mock_extractor, mock_repo, writer)
+    mock_extractor.parse_snippet.return_value = DisruptionEvent(
+        target_port="Rotterdam", event_type="Strike", is_disruption=True, confidence_score=0.9
+    )
+    mock_repo.count_by_destination.return_value = 2
+    mock_repo.get_page_by_destination.return_value = []
+    mock_repo.resolve_destination.return_value = frozenset({"Rotterdam"})
+
+    assessment = await service.create_assessment("Strike in Rotterdam")
+
+    writer.write.assert_awaited_once()
+    assert writer.write.call_args.args[:2] == (assessment, frozenset({"Rotterdam"}))
+    assert writer.write.call_args.args[2].shipments_at_risk == 2
+    mock_db.add.assert_not_called()
+    mock_repo.link_destination.assert_not_called()
+    # The read transaction ends before waiting on the group commit
+    mock_db.commit.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_create_assessment_updates_rollups_in_its_transaction(mock_db, mock_extractor, mock_repo, mock_rollups):
+    service = RiskAssessmentService(mock_db, mock_extractor, mock_repo)
+    mock_extractor.parse_snippet.return_value = DisruptionEvent(
+        target_port="Rotterdam", event_type="Strike", is_disruption=True, confidence_score=0.9
+    )
+    mock_repo.count_by_destination.return_value = 3
+
+    assessment = await service.create_assessment("Strike in Rotterdam")
+
+    (increment,) = mock_rollups.record.call_args.args[0]
+    assert (increment.port, increment.assessments, increment.disruptions, increment.shipments_at_risk) == ("rotterdam", 1, 1, 3)
+    assert increment.bucket_start == assessment.created_at.replace(minute=0, second=0, microsecond=0)
@@ -0,0 +1,60 @@
+import io
+import pytest
+from app.services.shipment_import import (
+    ShipmentImportError,
+    detect_format,
+    iter_csv_records,
+    iter_ndjson_records,
+    iter_yaml_records,
+)
+
+def test_detect_format():
+    assert detect_format("manifest.CSV") == "csv"
+    assert detect_format("feed.jsonl") == "ndjson"
+    assert detect_format("application/x-ndjson") == "ndjson"
+    assert detect_format("seed_data.yaml") == "yaml"
+    with pytest.raises(ShipmentImportError):
+        detect_format("manifest.xlsx")
+
+def test_iter_yaml_records_from_seed_file():
+    with open("seed_data.yaml") as f:
+        records = list(iter_yaml_records(f))
+
+    assert len(records) == 40
+    assert records[0] == {"id": "SHP-001", "destination_port": "Rotterdam", "goods_description": "Automotive Parts"}
+
+def test_iter_yaml_records_top_level_list_keeps_scalars_as_text():
+    doc = """
+- id: 007
+  destination_port: Hamburg
+  goods_description: Chemicals
+  tags: [hazmat, priority]
+- {id: S2, destination_port: Busan, goods_description: Steel}
+"""
+    records = list(iter_yaml_records(io.StringIO(doc)))
+
+    # Nested values are skipped and leading zeros survive because nothing is type-resolved
+    assert records == [
+        {"id": "007", "destination_port": "Hamburg", "goods_description": "Chemicals"},
+        {"id": "S2", "destination_port": "Busan", "goods_description": "Steel"},
+    ]
+
+def test_iter_yaml_records_ignores_other_sections():
+    doc = """
+ports:
+  - name: Rotterdam
+shipments:
+  - id: S1
+    destination_port: Rotterdam
+    goods_description: A
+"""
+    assert [r["id"] for r in iter_yaml_records(io.StringIO(doc))] == ["S1"]
+
+def test_iter_csv_and_ndjson_records():
+    csv_doc = "id,destination_port,goods_description\nS1,Rotterdam,A\nS2,Hamburg,\"B, boxed\"\n"
+    ndjson_doc = '{"id": "S1", "destination_port": "Rotterdam", "goods_description": "A"}\n\n'
+
+    assert list(iter_csv_records(io.StringIO(csv_doc)))[1]["goods_description"] == "B, boxed"
+    assert list(iter_ndjson_records(io.StringIO(ndjson_doc))) == [
+        {"id": "S1", "destination_port": "Rotterdam", "goods_description": "A"}
+    ]
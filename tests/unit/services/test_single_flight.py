@@ -0,0 +1,107 @@
+import asyncio
+import pytest
+from app.core.metrics import SINGLE_FLIGHT_CALLS_TOTAL
+from app.services.extraction_service import ExtractionError
+from app.services.extraction_trace import trace_extraction
+from app.services.single_flight import SingleFlightExtractionService
+from app.schemas.assessment import DisruptionEvent
+
+EVENT = DisruptionEvent(target_port="Rotterdam", event_type="Strike", is_disruption=True, confidence_score=0.9)
+
+class GatedExtractor:
+    """Blocks every call until released, counting the calls that reached it."""
+
+    def __init__(self, outcome=EVENT):
+        self.calls = 0
+        self.cancelled = 0
+        self.gate = asyncio.Event()
+        self.outcome = outcome
+
+    async def parse_snippet(self, text):
+        self.calls += 1
+        try:
+            await self.gate.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self.outcome
+
+async def settle():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_snippets_share_one_call():
+    extractor = GatedExtractor()
+    service = SingleFlightExtractionService(extractor)
+    followers_before = SINGLE_FLIGHT_CALLS_TOTAL.value(role="follower")
+
+    async def parse(text):
+        with trace_extraction() as trace:
+            return await service.parse_snippet(text), trace.path
+
+    # Normalization folds case and whitespace
+    tasks = [asyncio.create_task(parse(text)) for text in ["Strike in Rotterdam", "strike  in ROTTERDAM", "Strike in Rotterdam"]]
+    await settle()
+    extractor.gate.set()
+    results = await asyncio.gather(*tasks)
+
+    assert extractor.calls == 1
+    assert [event for event, _ in results] == [EVENT] * 3
+    assert [path for _, path in results] == ["model", "coalesced", "coalesced"]
+    assert SINGLE_FLIGHT_CALLS_TOTAL.value(role="follower") - followers_before == 2
+    assert len(service) == 0
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter_and_are_not_cached():
+    extractor = GatedExtractor(outcome=ExtractionError("quota exceeded"))
+    service = SingleFlightExtractionService(extractor)
+
+    tasks = [asyncio.create_task(service.parse_snippet("Strike in Rotterdam")) for _ in range(3)]
+    await settle()
+    extractor.gate.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert extractor.calls == 1
+    assert all(isinstance(result, ExtractionError) for result in results)
+
+    # The next call starts a fresh extraction
+    extractor.outcome = EVENT
+    assert await service.parse_snippet("Strike in Rotterdam") == EVENT
+    assert extractor.calls == 2
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_shared_call_running():
+    extractor = GatedExtractor()
+    service = SingleFlightExtractionService(extractor)
+
+    leader = asyncio.create_task(service.parse_snippet("Strike in Rotterdam"))
+    follower = asyncio.create_task(service.parse_snippet("Strike in Rotterdam"))
+    await settle()
+    leader.cancel()
+    await settle()
+    extractor.gate.set()
+
+    assert await follower == EVENT
+    assert leader.cancelled()
+    assert extractor.cancelled == 0
+
+@pytest.mark.asyncio
+async def test_call_is_cancelled_once_nobody_waits():
+    extractor = GatedExtractor()
+    service = SingleFlightExtractionService(extractor)
+
+    waiters = [asyncio.create_task(service.parse_snippet("Strike in Rotterdam")) for _ in range(2)]
+    await settle()
+    for waiter in waiters:
+        waiter.cancel()
+    await settle()
+
+    assert extractor.cancelled == 1
+    assert len(service) == 0
+    # A later caller is not handed the abandoned call
+    extractor.gate.set()
+    assert await service.parse_snippet("Strike in Rotterdam") == EVENT
+    assert extractor.calls == 2
@@ -0,0 +1,73 @@
+import pytest
+from app.repositories.port_index import PortIndex
+from app.schemas.assessment import DisruptionEvent
+from app.services.extraction_trace import trace_extraction
+from app.services.relevance_filter import RelevanceScorer
+from app.services.snippet_condenser import CondensingExtractionService, SnippetCondenser, estimate_tokens
+
+STRIKE = "Dock workers at Rotterdam begin an indefinite strike over pay, halting container operations."
+EVENT = DisruptionEvent(target_port="Rotterdam", event_type="Strike", is_disruption=True, confidence_score=0.9)
+FILLER = "The mayor also opened a new public garden with a sculpture by a local artist."
+
+ARTICLE = f"""
+<html><head><title>News</title><script>var tracking = "Rotterdam strike";</script><style>p {{ color: red; }}</style></head>
+<body>
+  <nav><a href="/">Home</a> | <a href="/world">World</a></nav>
+  <article>
+    <h1>Port news</h1>
+    <p>{STRIKE} Unions said talks had failed.</p>
+    <p>Subscribe to our newsletter for daily updates.</p>
+    <p>Cargo owners were told to expect delays of &amp; up to a week.</p>
+  </article>
+  <footer>Copyright 2026 Example Media. All rights reserved.</footer>
+</body></html>
+"""
+
+@pytest.fixture
+def condenser():
+    return SnippetCondenser(max_tokens=60, scorer=RelevanceScorer(PortIndex()))
+
+class RecordingBackend:
+    def __init__(self):
+        self.texts = []
+
+    async def parse_snippet(self, text):
+        self.texts.append(text)
+        return EVENT
+
+def test_short_snippets_pass_through_untouched(condenser):
+    condensed = condenser.condense(STRIKE)
+
+    assert condensed.text == STRIKE
+    assert condensed.source_tokens == condensed.condensed_tokens == estimate_tokens(STRIKE)
+
+def test_markup_and_boilerplate_are_stripped(condenser):
+    condensed = condenser.condense(ARTICLE)
+
+    assert STRIKE in condensed.text
+    assert "delays of & up to a week" in condensed.text
+    for furniture in ("tracking", "color", "Home", "Subscribe", "Copyright"):
+        assert furniture not in condensed.text
+    assert condensed.condensed_tokens < condensed.source_tokens
+
+def test_long_articles_keep_the_most_relevant_sentences_in_order(condenser):
+    text = " ".join(["Markets were calm on Monday."] + [FILLER] * 10 + [STRIKE] + [FILLER] * 10)
+
+    condensed = condenser.condense(text)
+
+    assert condensed.condensed_tokens <= 60
+    # The lede survives ahead of the strike sentence
+    assert condensed.text.startswith("Markets were calm on Monday.")
+    assert STRIKE in condensed.text
+
+@pytest.mark.asyncio
+async def test_extractor_sees_the_condensed_text_and_counts_are_traced(condenser):
+    backend = RecordingBackend()
+    service = CondensingExtractionService(backend, condenser)
+
+    with trace_extraction() as trace:
+        await service.parse_snippet(ARTICLE)
+
+    assert "<p>" not in backend.texts[0]
+    assert trace.source_tokens == estimate_tokens(ARTICLE)
+    assert trace.condensed_tokens == estimate_tokens(backend.texts[0])